@@ -1,25 +1,64 @@
-from flask import Flask
+import os
+from flask import Flask, jsonify, request
+from werkzeug.exceptions import RequestEntityTooLarge
 from flask_cors import CORS
 from config.config import Config
 from controllers.home_controller import home_bp
 from controllers.timesheet_controller import bp_timesheet
 from controllers.pdf_extraction_controller import pdf_extraction_bp
+from controllers.job_controller import job_bp
+from controllers.timesheet_record_controller import timesheet_record_bp
+from controllers.export_controller import export_bp
+from services import compression_service, metrics_service
+from services.json_provider import json_provider_class
+from services.upload_service import SpooledUploadRequest
+from services.warmup_service import start_background_warmup
 
-def create_app():
-    """Create Flask application"""
+def create_app(json_provider=None):
+    """
+    Create Flask application.
+    `json_provider` is a JSONProvider class; by default orjson is used when installed.
+    """
     app = Flask(__name__)
     app.config.from_object(Config)
     
-    # Enable CORS for frontend-backend communication
-    CORS(app)
+    # Encode/decode JSON with the fastest available provider
+    app.json = (json_provider or json_provider_class())(app)
+    
+    # Spool large file parts to disk; MAX_CONTENT_LENGTH (from Config) caps the request,
+    # unless the view sets its own upload_limit
+    app.request_class = SpooledUploadRequest
+    
+    @app.errorhandler(RequestEntityTooLarge)
+    def upload_too_large(e):
+        limit_mb = request.max_content_length // (1024 * 1024)
+        return jsonify({"error": f"File too large. Maximum upload size is {limit_mb} MB."}), 413
+    
+    # Enable CORS for frontend-backend communication; let the frontend read
+    # Retry-After on 429s from the extraction admission controller
+    CORS(app, expose_headers=["Retry-After"])
+
+    # Request latency and upload size metrics, served on /metrics
+    metrics_service.init_app(app)
+    
+    # gzip/deflate for large JSON and text bodies; registered last so it runs
+    # first among the after_request hooks and the latency timer includes it
+    compression_service.init_app(app)
     
     # Register blueprints
     app.register_blueprint(home_bp)
     app.register_blueprint(bp_timesheet)
     app.register_blueprint(pdf_extraction_bp)
+    app.register_blueprint(job_bp)
+    app.register_blueprint(timesheet_record_bp)
+    app.register_blueprint(export_bp)
     
     return app
 
 if __name__ == '__main__':
+    # Development server only; production runs gunicorn with wsgi.py
     app = create_app()
-    app.run(debug=True, host='0.0.0.0', port=5001)
+    # Skip the reloader's parent process; it only watches files
+    if not app.debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_background_warmup()
+    app.run(debug=app.config['DEBUG'], host='0.0.0.0', port=5001)
@@ -0,0 +1,223 @@
+"""
+Extraction benchmark over the test-data PDF corpus.
+
+Runs extract_timesheet_data, extractMeta, get_pdf_text and check_timesheet_rows
+over every PDF in test-data/ and reports per-stage wall time, peak RSS and
+end-to-end throughput at 1..N worker processes. Results can be saved as a JSON
+baseline and compared against one later to spot regressions.
+
+Run from backend/:
+
+    python -m benchmarks.bench_extraction                      # report only
+    python -m benchmarks.bench_extraction --save main          # write benchmarks/baselines/main.json
+    python -m benchmarks.bench_extraction --compare main       # compare with that baseline
+    python -m benchmarks.bench_extraction --workers 4 --repeat 5
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import resource
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_DIR = os.path.dirname(BACKEND_DIR)
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from services.pdf_extraction_service import PdfExtractionService, is_error  # noqa: E402
+from services.timesheet_check_service import check_timesheet_rows  # noqa: E402
+
+CORPUS_DIRS = ("normal", "issue-fraud", "issue-inject", "issue-name")
+BASELINE_DIR = os.path.join(BACKEND_DIR, "benchmarks", "baselines")
+STAGES = ("extract_timesheet_data", "extractMeta", "get_pdf_text", "check_timesheet_rows")
+DAY_KEYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
+def corpus_files() -> List[str]:
+    """Template PDF plus every PDF of the sample corpus, in a stable order"""
+    files = [os.path.join(REPO_DIR, "test-data", "Techlauncher timesheet template 1.pdf")]
+    for name in CORPUS_DIRS:
+        files.extend(sorted(glob.glob(os.path.join(REPO_DIR, "test-data", "timesheet-pdf", name, "*.pdf"))))
+    return [f for f in files if os.path.exists(f)]
+
+
+def check_payload_from_meta(meta_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a /timesheet/check payload from extractMeta output, expecting what was extracted"""
+    hours = {
+        day: f"{entry.get('total_daily_decimal', 0)}hrs"
+        for day, entry in zip(DAY_KEYS, meta_data.get("work_entries", []))
+    }
+    total = f"{meta_data.get('weekly_total', {}).get('total_decimal_hours', 0)}hrs"
+    week = meta_data.get("date", "")
+    return {
+        "extracted": {"week_worked": week, "hours": hours, "total_hours": total},
+        "expected": {"week_worked": week, "hours": hours, "total_hours": total},
+    }
+
+
+def _peak_rss_mb(who: int = resource.RUSAGE_SELF) -> float:
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(who).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _summary(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "total_s": round(sum(ordered), 4),
+        "mean_ms": round(statistics.mean(ordered) * 1000, 2),
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 2),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 2),
+    }
+
+
+def _time(fn: Callable[[], Any]):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def run_stages(files: List[str], repeat: int) -> Dict[str, Any]:
+    """Time each stage separately; every stage opens the PDF itself, with no cache"""
+    service = PdfExtractionService()
+    samples: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+
+    for _ in range(repeat):
+        for path in files:
+            _result, elapsed = _time(lambda: service.extract_timesheet_data(path))
+            samples["extract_timesheet_data"].append(elapsed)
+
+            meta_data, elapsed = _time(lambda: service.extractMeta(path))
+            samples["extractMeta"].append(elapsed)
+
+            _result, elapsed = _time(lambda: service.get_pdf_text(path))
+            samples["get_pdf_text"].append(elapsed)
+
+            payload = check_payload_from_meta(meta_data.to_dict() if not is_error(meta_data) else {})
+            _result, elapsed = _time(lambda: check_timesheet_rows(payload))
+            samples["check_timesheet_rows"].append(elapsed)
+
+    return {stage: _summary(values) for stage, values in samples.items()}
+
+
+def _pipeline(path: str) -> float:
+    """Full per-file pipeline, as run by one worker"""
+    service = PdfExtractionService()
+    start = time.perf_counter()
+    service.extract_timesheet_data(path)
+    meta_data = service.extractMeta(path)
+    service.get_pdf_text(path)
+    check_timesheet_rows(check_payload_from_meta(meta_data.to_dict() if not is_error(meta_data) else {}))
+    return time.perf_counter() - start
+
+
+def run_throughput(files: List[str], repeat: int, max_workers: int) -> Dict[str, Any]:
+    """Files per second for the full pipeline with 1..max_workers processes"""
+    results = {}
+    work = files * repeat
+    for workers in range(1, max_workers + 1):
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Warm the workers up so process start and imports are not measured
+            list(pool.map(_pipeline, files[:workers]))
+            start = time.perf_counter()
+            list(pool.map(_pipeline, work))
+            elapsed = time.perf_counter() - start
+        results[str(workers)] = {
+            "files": len(work),
+            "wall_s": round(elapsed, 3),
+            "files_per_s": round(len(work) / elapsed, 2),
+        }
+    results["peak_worker_rss_mb"] = _peak_rss_mb(resource.RUSAGE_CHILDREN)
+    return results
+
+
+def run(repeat: int, max_workers: int) -> Dict[str, Any]:
+    files = corpus_files()
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "corpus_files": len(files),
+        "repeat": repeat,
+        "stages": run_stages(files, repeat),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+    report["throughput"] = run_throughput(files, repeat, max_workers)
+    return report
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Print a comparison table; returns the list of regressions beyond threshold (percent)"""
+    regressions = []
+    rows = []
+
+    for stage in STAGES:
+        before = baseline.get("stages", {}).get(stage, {}).get("mean_ms")
+        after = current["stages"][stage]["mean_ms"]
+        rows.append((f"{stage} mean ms", before, after, True))
+    rows.append(("peak RSS MB", baseline.get("peak_rss_mb"), current["peak_rss_mb"], True))
+    for workers, result in current["throughput"].items():
+        if not isinstance(result, dict):
+            continue
+        before = baseline.get("throughput", {}).get(workers, {}).get("files_per_s")
+        rows.append((f"files/s @ {workers} workers", before, result["files_per_s"], False))
+
+    print(f"\n{'metric':<36}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, before, after, lower_is_better in rows:
+        if not before:
+            print(f"{name:<36}{'-':>12}{after:>12}{'':>10}")
+            continue
+        change = (after - before) / before * 100
+        worse = change > threshold if lower_is_better else change < -threshold
+        flag = "  REGRESSION" if worse else ""
+        print(f"{name:<36}{before:>12}{after:>12}{change:>+9.1f}%{flag}")
+        if worse:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="passes over the corpus (default 3)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="measure throughput at 1..N worker processes (default: CPU count)")
+    parser.add_argument("--save", metavar="NAME", help="save the report as benchmarks/baselines/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="compare with benchmarks/baselines/NAME.json")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="percent change reported as a regression (default 10)")
+    args = parser.parse_args(argv)
+
+    report = run(args.repeat, max(1, args.workers))
+    print(json.dumps(report, indent=2))
+
+    if args.save:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        path = os.path.join(BASELINE_DIR, f"{args.save}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline saved to {path}")
+
+    if args.compare:
+        path = os.path.join(BASELINE_DIR, f"{args.compare}.json")
+        with open(path, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold}%")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
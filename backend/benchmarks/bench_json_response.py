@@ -0,0 +1,127 @@
+"""
+JSON response benchmark.
+
+Builds response bodies the way the endpoints do, with Flask's stdlib provider
+and with OrjsonProvider, then compresses them with gzip and deflate. Payloads
+are shaped like the real responses:
+
+  extract-pdf        /api/extract-pdf for the template PDF
+  extract-pdf-max    the same, with a pdf_text preview at PREVIEW_MAX_CHARS
+  batch-check-N      /timesheet/check/batch results for N timesheets, cycling
+                     through the test-data corpus
+
+Run from backend/:
+
+    python -m benchmarks.bench_json_response
+    python -m benchmarks.bench_json_response --batch 100 1000 10000 --repeat 7
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+from typing import Any, Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_DIR = os.path.dirname(BACKEND_DIR)
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from flask import Flask  # noqa: E402
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+from benchmarks.bench_extraction import check_payload_from_meta, corpus_files  # noqa: E402
+from config.config import COMPRESS_LEVEL, PREVIEW_MAX_CHARS  # noqa: E402
+from services.compression_service import compress  # noqa: E402
+from services.json_provider import OrjsonProvider, orjson  # noqa: E402
+from services.pdf_extraction_service import PdfExtractionService, is_error  # noqa: E402
+from services.timesheet_batch_check_service import check_timesheet_rows_batch  # noqa: E402
+
+TEMPLATE_PDF = os.path.join(REPO_DIR, "test-data", "Techlauncher timesheet template 1.pdf")
+
+
+def build_payloads(batch_sizes: List[int]) -> Dict[str, Any]:
+    service = PdfExtractionService()
+    data = service.extract_timesheet_data(TEMPLATE_PDF)
+    preview = service.get_pdf_text_preview(TEMPLATE_PDF)
+    extract_pdf = {
+        "success": True,
+        "data": data,
+        "pdf_text": preview["text"],
+        "pdf_text_truncated": preview["truncated"],
+        "page_count": preview["page_count"],
+    }
+    text = preview["text"] or " "
+    full_text = (text * (PREVIEW_MAX_CHARS // len(text) + 1))[:PREVIEW_MAX_CHARS]
+
+    payloads = {
+        "extract-pdf": extract_pdf,
+        "extract-pdf-max": dict(extract_pdf, pdf_text=full_text, pdf_text_truncated=True),
+    }
+    metas = [service.extractMeta(path) for path in corpus_files()]
+    check_payloads = [check_payload_from_meta(meta.to_dict()) for meta in metas if not is_error(meta)]
+    for size in batch_sizes:
+        items = [check_payloads[i % len(check_payloads)] for i in range(size)]
+        payloads[f"batch-check-{size}"] = {"results": check_timesheet_rows_batch(items)}
+    return payloads
+
+
+def _best_ms(fn, repeat: int, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1000
+
+
+def measure(payloads: Dict[str, Any], repeat: int) -> List[Dict[str, Any]]:
+    stdlib_app, fast_app = Flask("stdlib"), Flask("fast")
+    stdlib_app.json = DefaultJSONProvider(stdlib_app)
+    fast_app.json = OrjsonProvider(fast_app)
+
+    rows = []
+    for name, payload in payloads.items():
+        body = stdlib_app.json.response(payload).get_data()
+        # Enough runs per sample that small payloads are not timer noise
+        number = max(1, 200000 // len(body))
+        with stdlib_app.app_context():
+            stdlib_ms = _best_ms(lambda: stdlib_app.json.response(payload), repeat, number)
+        with fast_app.app_context():
+            assert json.loads(fast_app.json.response(payload).get_data()) == json.loads(body)
+            fast_ms = _best_ms(lambda: fast_app.json.response(payload), repeat, number)
+
+        row = {
+            "payload": name,
+            "bytes": len(body),
+            "stdlib_ms": round(stdlib_ms, 3),
+            "orjson_ms": round(fast_ms, 3),
+            "speedup": round(stdlib_ms / fast_ms, 1),
+        }
+        for encoding in ("gzip", "deflate"):
+            row[f"{encoding}_bytes"] = len(compress(body, encoding))
+            row[f"{encoding}_ms"] = round(_best_ms(lambda: compress(body, encoding), repeat, number), 3)
+        rows.append(row)
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch", type=int, nargs="+", default=[100, 1000],
+                        help="timesheets per batch-check payload (default 100 1000)")
+    parser.add_argument("--repeat", type=int, default=5, help="timing runs, best is reported (default 5)")
+    args = parser.parse_args(argv)
+
+    if orjson is None:
+        print("orjson is not installed; nothing to compare with the stdlib encoder")
+        return 1
+
+    rows = measure(build_payloads(args.batch), args.repeat)
+    print(f"compression level {COMPRESS_LEVEL}")
+    print(f"{'payload':<18}{'bytes':>10}{'stdlib ms':>11}{'orjson ms':>11}{'speedup':>9}"
+          f"{'gzip bytes':>12}{'gzip ms':>9}{'deflate bytes':>15}{'deflate ms':>12}")
+    for row in rows:
+        print(f"{row['payload']:<18}{row['bytes']:>10}{row['stdlib_ms']:>11}{row['orjson_ms']:>11}"
+              f"{row['speedup']:>8}x{row['gzip_bytes']:>12}{row['gzip_ms']:>9}"
+              f"{row['deflate_bytes']:>15}{row['deflate_ms']:>12}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
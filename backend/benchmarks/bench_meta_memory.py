@@ -0,0 +1,97 @@
+"""
+Memory benchmark for extracted meta records.
+
+Holds N copies of one extractMeta result in memory, first as the nested plain
+dicts the pipeline used to produce (parsed fresh from JSON, so nothing is
+shared between copies), then as the frozen, slotted PdfExtractionMeta records
+it produces now, and reports the traced allocation of each. Also times the
+API boundary: to_dict() and json.dumps for the whole batch.
+
+Run from backend/:
+
+    python -m benchmarks.bench_meta_memory
+    python -m benchmarks.bench_meta_memory --records 50000 --pdf path/to/timesheet.pdf
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_DIR = os.path.dirname(BACKEND_DIR)
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from models.pdf_extraction_types import PdfExtractionMeta  # noqa: E402
+from services.pdf_extraction_service import PdfExtractionService, is_error  # noqa: E402
+
+DEFAULT_PDF = os.path.join(REPO_DIR, "test-data", "Techlauncher timesheet template 1.pdf")
+
+
+def _traced(build: Callable[[], List[Any]]):
+    """Build a batch; returns it with the bytes still allocated once it is built"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        batch = build()
+        gc.collect()
+        size, _peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return batch, size
+
+
+def measure(meta_json: str, count: int) -> Dict[str, Any]:
+    dicts, dict_bytes = _traced(lambda: [json.loads(meta_json) for _ in range(count)])
+    del dicts
+    records, record_bytes = _traced(
+        lambda: [PdfExtractionMeta.from_dict(json.loads(meta_json)) for _ in range(count)]
+    )
+
+    # Timed with the cyclic GC off, as timeit does: with this many live objects
+    # its collections would otherwise dominate
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        payload = [record.to_dict() for record in records]
+        to_dict_s = time.perf_counter() - start
+        start = time.perf_counter()
+        json.dumps(payload)
+        json_s = time.perf_counter() - start
+    finally:
+        gc.enable()
+
+    return {
+        "records": count,
+        "dict_mb": round(dict_bytes / (1024 * 1024), 1),
+        "slotted_mb": round(record_bytes / (1024 * 1024), 1),
+        "dict_bytes_per_record": dict_bytes // count,
+        "slotted_bytes_per_record": record_bytes // count,
+        "saved_pct": round((1 - record_bytes / dict_bytes) * 100, 1),
+        "to_dict_ms": round(to_dict_s * 1000, 1),
+        "json_dumps_ms": round(json_s * 1000, 1),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=10000, help="records held in memory (default 10000)")
+    parser.add_argument("--pdf", default=DEFAULT_PDF, help="timesheet PDF the record is extracted from")
+    args = parser.parse_args(argv)
+
+    meta = PdfExtractionService().extractMeta(args.pdf)
+    if is_error(meta):
+        print(f"Cannot extract {args.pdf}: {meta['error']}")
+        return 1
+
+    print(json.dumps(measure(json.dumps(meta.to_dict()), max(1, args.records)), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
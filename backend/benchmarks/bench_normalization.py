@@ -0,0 +1,174 @@
+"""
+Microbenchmarks for services.normalization.
+
+Times each shared conversion against the per-call implementation it replaced
+(kept below as the reference), on a workload shaped like real timesheets: a
+few H:MM values and dates repeated many times, plus some distinct ones.
+Results of both implementations are compared on the whole workload first.
+
+Run from backend/:
+
+    python -m benchmarks.bench_normalization
+    python -m benchmarks.bench_normalization --values 200000 --repeat 7
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import timeit
+from typing import Any, Callable, Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from services import normalization  # noqa: E402
+
+
+# --- Reference implementations, as they were before services.normalization
+
+def reference_time_to_decimal(time_str):
+    try:
+        if ':' in time_str:
+            hours, minutes = map(int, time_str.split(':'))
+            return hours + minutes / 60
+        else:
+            return float(time_str) if time_str else 0.0
+    except:  # noqa: E722
+        return 0.0
+
+
+def reference_time_to_hours_label(time_str):
+    try:
+        if ':' in time_str:
+            hours, minutes = map(int, time_str.split(':'))
+            decimal_hours = hours + minutes / 60
+            return f"{decimal_hours:.1f}hrs"
+        elif 'hrs' in time_str.lower():
+            return time_str
+        else:
+            return f"{time_str}hrs"
+    except:  # noqa: E722
+        return f"{time_str}hrs"
+
+
+def reference_date_to_iso(date_str):
+    try:
+        if '-' in date_str:
+            parts = date_str.split('-')
+            if len(parts) == 3:
+                day, month, year = parts
+                month_map = {
+                    'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04',
+                    'May': '05', 'Jun': '06', 'Jul': '07', 'Aug': '08',
+                    'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12'
+                }
+                month_num = month_map.get(month, '01')
+                if len(year) == 2:
+                    year = '20' + year
+                return f"{year}-{month_num}-{day.zfill(2)}"
+    except:  # noqa: E722
+        pass
+    return "Unknown"
+
+
+def reference_to_hours(v):
+    if v is None:
+        raise ValueError("Empty hour value")
+    if isinstance(v, (int, float)):
+        return float(v)
+    s = str(v).strip().lower()
+    m = re.match(r"^\s*([0-9]+(?:\.[0-9]+)?)", s)
+    if not m:
+        raise ValueError(f"Unparsable hour: {v}")
+    return float(m.group(1))
+
+
+# --- Workloads
+
+COMMON_TIMES = ["7:30", "0:00", "8:00", "7:45", "3:30", "4:00", "37:30", "40:00"]
+COMMON_DATES = ["11-Aug-25", "12-Aug-25", "13-Aug-25", "14-Aug-25", "15-Aug-25", "16-Aug-25", "17-Aug-25"]
+COMMON_HOURS = ["8hrs", "7.5hrs", "0hrs", "40hrs", "37.5hrs", "8", 7.5, 8]
+MALFORMED = ["", None, "n/a", "7:3:0", "abc", "-"]
+
+
+def build_workloads(count: int, distinct_share: float, seed: int = 1) -> Dict[str, List[Any]]:
+    rng = random.Random(seed)
+    months = list(normalization.MONTH_NUMBERS)
+
+    def pick(common, make_distinct):
+        roll = rng.random()
+        if roll < distinct_share:
+            return make_distinct()
+        if roll < distinct_share + 0.01:
+            return rng.choice(MALFORMED)
+        return rng.choice(common)
+
+    return {
+        "time_to_decimal": [pick(COMMON_TIMES, lambda: f"{rng.randint(0, 60)}:{rng.randint(0, 59):02d}")
+                            for _ in range(count)],
+        "time_to_hours_label": [pick(COMMON_TIMES, lambda: f"{rng.randint(0, 60)}:{rng.randint(0, 59):02d}")
+                                for _ in range(count)],
+        "date_to_iso": [pick(COMMON_DATES, lambda: f"{rng.randint(1, 28)}-{rng.choice(months)}-{rng.randint(20, 30)}")
+                        for _ in range(count)],
+        "to_hours": [pick(COMMON_HOURS, lambda: f"{rng.randint(0, 12)}.{rng.randint(0, 99)}hrs")
+                     for _ in range(count)],
+    }
+
+
+PAIRS: Dict[str, Any] = {
+    "time_to_decimal": (reference_time_to_decimal, normalization.time_to_decimal),
+    "time_to_hours_label": (reference_time_to_hours_label, normalization.time_to_hours_label),
+    "date_to_iso": (reference_date_to_iso, normalization.date_to_iso),
+    "to_hours": (reference_to_hours, normalization.to_hours),
+}
+
+
+def _outcome(fn: Callable[[Any], Any], value: Any):
+    try:
+        return fn(value)
+    except ValueError as e:
+        return ("ValueError", str(e))
+
+
+def _run_all(fn: Callable[[Any], Any], values: List[Any]) -> None:
+    for value in values:
+        try:
+            fn(value)
+        except ValueError:
+            pass
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--values", type=int, default=100000, help="values per conversion (default 100000)")
+    parser.add_argument("--distinct", type=float, default=0.05,
+                        help="share of values that are not one of the common ones (default 0.05)")
+    parser.add_argument("--repeat", type=int, default=5, help="timing runs, best is reported (default 5)")
+    args = parser.parse_args(argv)
+
+    workloads = build_workloads(args.values, args.distinct)
+    failures = 0
+
+    print(f"{'conversion':<22}{'reference ms':>14}{'shared ms':>12}{'speedup':>10}  cache")
+    for name, (reference, shared) in PAIRS.items():
+        values = workloads[name]
+        mismatches = sum(1 for v in values if _outcome(reference, v) != _outcome(shared, v))
+        if mismatches:
+            print(f"{name}: {mismatches} results differ from the reference")
+            failures += 1
+            continue
+
+        before = min(timeit.repeat(lambda: _run_all(reference, values), number=1, repeat=args.repeat))
+        after = min(timeit.repeat(lambda: _run_all(shared, values), number=1, repeat=args.repeat))
+        info = (shared.cache_info() if hasattr(shared, "cache_info")
+                else normalization._parse_hour_string.cache_info())
+        print(f"{name:<22}{before * 1000:>14.1f}{after * 1000:>12.1f}{before / after:>9.1f}x  "
+              f"{info.currsize} entries")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
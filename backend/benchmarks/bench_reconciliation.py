@@ -0,0 +1,106 @@
+"""
+Pay-period reconciliation benchmark.
+
+Builds N extractMeta results from test-data/testdata.json, spread over
+employees, POs and consecutive ISO weeks with varied daily hours, plus an
+expected schedule for each of those weeks. About 2% of timesheets are
+submitted twice, 1% start mid-week (overlapping the next week's), 1% have no
+schedule and 1% of employees have a schedule for a week after the period that
+nobody submitted. Then times `reconcile` over the whole period.
+
+Run from backend/:
+
+    python -m benchmarks.bench_reconciliation
+    python -m benchmarks.bench_reconciliation --timesheets 1000 10000 50000 --weeks 4
+"""
+
+import argparse
+import copy
+import json
+import os
+import random
+import sys
+import timeit
+from datetime import date, timedelta
+from typing import Any, Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_DIR = os.path.dirname(BACKEND_DIR)
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from services.reconciliation_service import DAY_KEYS, reconcile  # noqa: E402
+
+SAMPLE_META = os.path.join(REPO_DIR, "test-data", "testdata.json")
+FIRST_MONDAY = date(2025, 8, 4)
+
+
+def _meta(template: Dict[str, Any], employee: str, po_number: str, start: date,
+          hours: List[float]) -> Dict[str, Any]:
+    meta = copy.deepcopy(template)
+    meta["employee"]["name"] = employee
+    meta["base"]["po_number"] = po_number
+    for offset, (entry, day_hours) in enumerate(zip(meta["work_entries"], hours)):
+        entry["date_iso"] = (start + timedelta(days=offset)).isoformat()
+        entry["total_daily_decimal"] = day_hours
+    meta["weekly_total"]["total_decimal_hours"] = sum(hours)
+    return meta
+
+
+def _schedule(employee: str, po_number: str, monday: date) -> Dict[str, Any]:
+    return {
+        "employee_name": employee,
+        "po_number": po_number,
+        "week_start": monday.isoformat(),
+        "hours": {short_key: "8hrs" for short_key in DAY_KEYS[:5]},
+        "total_hours": "40hrs",
+    }
+
+
+def build_period(timesheets: int, weeks: int, seed: int = 7) -> Tuple[List[Tuple[Any, Dict]], List[Tuple[Any, Dict]]]:
+    with open(SAMPLE_META) as f:
+        template = json.load(f)
+    rng = random.Random(seed)
+    extracted, expected = [], []
+    for index in range(timesheets):
+        employee = f"Employee {index // weeks:05d}"
+        po_number = f"PO{index // weeks % 97:04d}"
+        monday = FIRST_MONDAY + timedelta(weeks=index % weeks)
+        hours = [rng.choice((7.5, 8.0, 8.5)) for _ in range(5)] + [0.0, 0.0]
+
+        start = monday + timedelta(days=2) if rng.random() < 0.01 else monday
+        meta = _meta(template, employee, po_number, start, hours)
+        extracted.append((index, meta))
+        if rng.random() < 0.02:
+            extracted.append((f"{index}-again", meta))
+        if rng.random() >= 0.01:
+            expected.append((len(expected), _schedule(employee, po_number, monday)))
+        if index % weeks == 0 and rng.random() < 0.01:
+            expected.append((len(expected), _schedule(employee, po_number, FIRST_MONDAY + timedelta(weeks=weeks))))
+    # Stored timesheets and schedules arrive in no particular order
+    rng.shuffle(extracted)
+    rng.shuffle(expected)
+    return extracted, expected
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--timesheets", type=int, nargs="+", default=[1000, 10000],
+                        help="timesheets in the pay period (default 1000 10000)")
+    parser.add_argument("--weeks", type=int, default=4, help="weeks per employee (default 4)")
+    parser.add_argument("--repeat", type=int, default=5, help="timing runs, best is reported (default 5)")
+    args = parser.parse_args(argv)
+
+    print(f"{'timesheets':>10}{'schedules':>11}{'ms':>9}  summary")
+    for count in args.timesheets:
+        extracted, expected = build_period(count, args.weeks)
+        seconds = min(timeit.repeat(lambda: reconcile(extracted, expected), number=1, repeat=args.repeat))
+        summary = reconcile(extracted, expected)["summary"]
+        counts = ", ".join(f"{name} {summary[name]}"
+                           for name in ("matched", "unexpected", "missing", "duplicates", "overlaps"))
+        print(f"{len(extracted):>10}{len(expected):>11}{seconds * 1000:>9.1f}  {counts}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""
+Start-up benchmark and import-time profile.
+
+Each run starts a fresh interpreter and times, from its first line:
+
+  app        `create_app()` returned (imports included)
+  health     the first GET /health answered
+  first      the first POST /api/extract-meta (template PDF) answered
+
+in three start-up modes:
+
+  lazy       the default: heavy modules load on the first request needing them
+  preload    the heavy modules imported before create_app(), as with
+             WARMUP_PRELOAD (and as wsgi.py did before imports were deferred)
+  warmed     lazy start, then warm_up() run to completion before the first
+             extraction, as the background warm-up does once a worker serves
+
+The profile lists the slowest imports of a lazy start, from
+`python -X importtime`, and which heavy modules it loaded (there should be
+none). Requests go through the Flask test client, against a throwaway SQLite
+database.
+
+Run from backend/:
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --runs 5 --top 25
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+START = time.perf_counter()
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_DIR = os.path.dirname(BACKEND_DIR)
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+TEMPLATE_PDF = os.path.join(REPO_DIR, "test-data", "Techlauncher timesheet template 1.pdf")
+MODES = ("lazy", "preload", "warmed")
+# Top-level packages whose presence after create_app() means an eager import
+HEAVY_PACKAGES = ("pdfplumber", "pdfminer", "pypdfium2", "numpy", "sqlalchemy", "PIL")
+
+
+def _elapsed_ms() -> float:
+    return round((time.perf_counter() - START) * 1000, 1)
+
+
+def run_child(mode: str) -> Dict[str, Any]:
+    """Body of one measured interpreter; timings are from its start"""
+    row: Dict[str, Any] = {"mode": mode}
+    if mode == "preload":
+        from services.warmup_service import import_heavy_modules
+        import_heavy_modules()
+
+    from app import create_app
+    app = create_app()
+    row["app_ms"] = _elapsed_ms()
+    row["loaded"] = sorted(name for name in HEAVY_PACKAGES if name in sys.modules)
+
+    client = app.test_client()
+    assert client.get("/health").status_code == 200
+    row["health_ms"] = _elapsed_ms()
+
+    if mode == "warmed":
+        from services.warmup_service import warm_up
+        row["warmup_ms"] = round(warm_up() * 1000, 1)
+
+    started = time.perf_counter()
+    with open(TEMPLATE_PDF, "rb") as f:
+        response = client.post("/api/extract-meta", data={"pdf_file": (f, "template.pdf")})
+    assert response.status_code == 200, response.get_data(as_text=True)
+    row["first_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return row
+
+
+def _child_env(database_dir: str) -> Dict[str, str]:
+    env = dict(os.environ)
+    env["DATABASE_URL"] = f"sqlite:///{os.path.join(database_dir, 'startup.db')}"
+    env["WARMUP_ENABLED"] = "1"
+    return env
+
+
+def measure(runs: int) -> List[Dict[str, Any]]:
+    rows = []
+    for mode in MODES:
+        samples = []
+        for _ in range(runs):
+            with tempfile.TemporaryDirectory() as database_dir:
+                out = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.bench_startup", "--child", mode],
+                    cwd=BACKEND_DIR, env=_child_env(database_dir),
+                    capture_output=True, text=True, check=True,
+                ).stdout
+            samples.append(json.loads(out.strip().splitlines()[-1]))
+        row = {"mode": mode, "loaded": samples[0]["loaded"]}
+        for key in ("app_ms", "health_ms", "warmup_ms", "first_ms"):
+            if key in samples[0]:
+                row[key] = round(statistics.median(s[key] for s in samples), 1)
+        rows.append(row)
+    return rows
+
+
+def import_profile(top: int) -> List[Dict[str, Any]]:
+    """Slowest imports (cumulative) of a lazy create_app(), from -X importtime"""
+    err = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "from app import create_app; create_app()"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    ).stderr
+    entries = []
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        entries.append({"module": name.rstrip(), "self_ms": int(self_us) / 1000,
+                        "cumulative_ms": int(cumulative_us) / 1000})
+    entries.sort(key=lambda e: e["cumulative_ms"], reverse=True)
+    return entries[:top]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="interpreters per mode, median is reported (default 3)")
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to list (default 15)")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_child(args.child)))
+        return 0
+
+    print(f"{'mode':<10}{'app ms':>9}{'health ms':>11}{'warm-up ms':>12}{'first extract ms':>18}  heavy modules at start")
+    for row in measure(args.runs):
+        print(f"{row['mode']:<10}{row['app_ms']:>9}{row['health_ms']:>11}{row.get('warmup_ms', '-'):>12}"
+              f"{row['first_ms']:>18}  {', '.join(row['loaded']) or '-'}")
+
+    print(f"\nslowest imports of a lazy start ({'cumulative':>10} / {'self':>6} ms)")
+    for entry in import_profile(args.top):
+        print(f"  {entry['module']:<48}{entry['cumulative_ms']:>10.1f} / {entry['self_ms']:>6.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""
+Xero export benchmark.
+
+Seeds a throwaway SQLite database with a pay period of extractMeta results
+(test-data/testdata.json with varied employees, POs, dates and hours, about 1%
+re-submitted, names cased and spaced differently from week to week), checks
+that every employee's week is exported as exactly one Xero timesheet, then
+exports it three ways and reports time, output size and peak traced memory:
+
+- list:   meta_in_period into a list, every Xero timesheet built, one json.dumps
+- json:   the streamed JSON export (TimesheetRepository.iter_meta_in_period
+          into xero_export_service.iter_json), chunks discarded as a response would
+- csv:    the streamed CSV export
+
+The streamed exports should stay flat as --employees grows; the list grows with
+it. With --push, the timesheets are also posted through XeroClient to the Xero
+stub (benchmarks/xero_stub_server.py), started on a free port.
+
+Run from backend/:
+
+    python -m benchmarks.bench_xero_export
+    python -m benchmarks.bench_xero_export --employees 1000 5000 --weeks 2 --push
+"""
+
+import argparse
+import copy
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Iterable
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_DIR = os.path.dirname(BACKEND_DIR)
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from config.config import Config  # noqa: E402
+
+SAMPLE_META = os.path.join(REPO_DIR, "test-data", "testdata.json")
+FIRST_MONDAY = date(2025, 8, 4)
+EARNINGS_RATE_ID = "ab874dfb-ab09-4c91-954e-43acf6fc23b4"
+
+
+def _employee(index: int) -> str:
+    return f"Employee {index:05d}"
+
+
+def _spelling(name: str, rng: random.Random) -> str:
+    """The name as a PDF might print it: another case, or extra spaces"""
+    return rng.choice((name, name.upper(), name.lower(), name.replace(" ", "  "), f" {name} "))
+
+
+def seed(employees: int, weeks: int, seed: int = 7) -> Dict[str, str]:
+    """Store the pay period; returns the employee ids for the export, keyed by employee_key"""
+    from models.database import session_scope
+    from models.timesheet import Timesheet
+    from services.timesheet_repository import lookup_columns
+    from services.xero_export_service import normalize_employee_ids
+
+    with open(SAMPLE_META) as f:
+        template = json.load(f)
+    rng = random.Random(seed)
+    rows = []
+    for index in range(employees):
+        for week in range(weeks):
+            monday = FIRST_MONDAY + timedelta(weeks=week)
+            meta = copy.deepcopy(template)
+            meta["employee"]["name"] = _spelling(_employee(index), rng)
+            meta["base"]["po_number"] = f"PO{index % 97:04d}"
+            hours = [rng.choice((7.5, 8.0, 8.5)) for _ in range(5)] + [0.0, 0.0]
+            for offset, (entry, day_hours) in enumerate(zip(meta["work_entries"], hours)):
+                entry["date_iso"] = (monday + timedelta(days=offset)).isoformat()
+                entry["total_daily_decimal"] = day_hours
+            meta["weekly_total"]["total_decimal_hours"] = sum(hours)
+            for _copy in range(2 if rng.random() < 0.01 else 1):
+                rows.append(Timesheet(
+                    meta_data=meta, content_hash=f"{len(rows):064x}", status="in-progress",
+                    **lookup_columns(meta),
+                ))
+    with session_scope() as session:
+        session.add_all(rows)
+    return normalize_employee_ids({
+        _employee(index): f"{index:08d}-0000-0000-0000-000000000000" for index in range(employees)
+    })
+
+
+def _measured(run: Callable[[], int]) -> Dict[str, Any]:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        size = run()
+        seconds = time.perf_counter() - start
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": seconds, "bytes": size, "peak": peak}
+
+
+def _drain(chunks: Iterable[bytes]) -> int:
+    return sum(len(chunk) for chunk in chunks)
+
+
+def export_variants(repository, start: date, end: date, employee_ids: Dict[str, str]) -> Dict[str, Dict]:
+    from services.xero_export_service import iter_csv, iter_export_items, iter_json, iter_xero_timesheets
+
+    def listed():
+        items = list(iter_export_items(repository.meta_in_period(start, end), employee_ids))
+        skipped = []
+        timesheets = [timesheet for _item, timesheet in iter_xero_timesheets(items, EARNINGS_RATE_ID, skipped)]
+        return len(json.dumps({"Timesheets": timesheets, "Skipped": skipped}).encode())
+
+    def streamed(writer):
+        return lambda: _drain(writer(
+            iter_export_items(repository.iter_meta_in_period(start, end), employee_ids), EARNINGS_RATE_ID,
+        ))
+
+    return {
+        "list": _measured(listed),
+        "json": _measured(streamed(iter_json)),
+        "csv": _measured(streamed(iter_csv)),
+    }
+
+
+def check_merged(repository, start: date, end: date, employee_ids: Dict[str, str], weeks: int) -> None:
+    """Every employee's week exported as exactly one Xero timesheet, whatever the name's spelling"""
+    from services.xero_export_service import iter_export_items, iter_xero_timesheets
+
+    skipped = []
+    periods = [(timesheet["EmployeeID"], timesheet["StartDate"]) for _item, timesheet in iter_xero_timesheets(
+        iter_export_items(repository.iter_meta_in_period(start, end), employee_ids), EARNINGS_RATE_ID, skipped,
+    )]
+    expected = len(employee_ids) * weeks
+    if len(periods) != expected or len(set(periods)) != len(periods):
+        raise SystemExit(f"expected {expected} Xero timesheets, one per employee and week; "
+                         f"got {len(periods)} for {len(set(periods))} employee weeks")
+
+
+def push(repository, start: date, end: date, employee_ids: Dict[str, str], batch_size: int) -> str:
+    from benchmarks.xero_stub_server import XeroStub
+    from services.xero_client import XeroClient
+    from services.xero_export_service import iter_export_items, iter_xero_timesheets
+
+    stub = XeroStub()
+    server = stub.start()
+    try:
+        client = XeroClient(f"http://127.0.0.1:{server.server_address[1]}", "token", "tenant")
+        items = iter_export_items(repository.iter_meta_in_period(start, end), employee_ids)
+        skipped = []
+        timesheets = (timesheet for _item, timesheet in iter_xero_timesheets(items, EARNINGS_RATE_ID, skipped))
+        began = time.perf_counter()
+        results = list(client.push(timesheets, batch_size))
+        seconds = time.perf_counter() - began
+    finally:
+        server.shutdown()
+    failed = sum(1 for result in results if "error" in result)
+    return (f"push: {len(stub.timesheets)} accepted in {len(results)} batches of {batch_size} "
+            f"({failed} refused, {len(skipped)} skipped) in {seconds * 1000:.0f} ms")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, nargs="+", default=[1000, 5000],
+                        help="employees in the pay period (default 1000 5000)")
+    parser.add_argument("--weeks", type=int, default=2, help="weeks per employee (default 2)")
+    parser.add_argument("--push", action="store_true", help="also post the export to the Xero stub")
+    parser.add_argument("--batch-size", type=int, default=50, help="timesheets per pushed request (default 50)")
+    args = parser.parse_args(argv)
+
+    from models.database import dispose_engine
+    from services.timesheet_repository import TimesheetRepository
+
+    repository = TimesheetRepository()
+    start, end = FIRST_MONDAY, FIRST_MONDAY + timedelta(weeks=args.weeks) - timedelta(days=1)
+    print(f"{'employees':>9}{'timesheets':>11}  {'export':<6}{'ms':>9}{'MB out':>9}{'peak MB':>9}")
+    for employees in args.employees:
+        with tempfile.TemporaryDirectory() as directory:
+            Config.DATABASE_URL = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+            dispose_engine()
+            employee_ids = seed(employees, args.weeks)
+            stored = len(repository.meta_in_period(start, end))
+            check_merged(repository, start, end, employee_ids, args.weeks)
+            for name, result in export_variants(repository, start, end, employee_ids).items():
+                print(f"{employees:>9}{stored:>11}  {name:<6}{result['seconds'] * 1000:>9.0f}"
+                      f"{result['bytes'] / 2**20:>9.2f}{result['peak'] / 2**20:>9.2f}")
+            if args.push:
+                print(" " * 22 + push(repository, start, end, employee_ids, args.batch_size))
+            dispose_engine()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
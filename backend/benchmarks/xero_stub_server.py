@@ -0,0 +1,166 @@
+"""
+Stand-in for the Xero Payroll (AU) Timesheets endpoint.
+
+Accepts POST /payroll.xro/1.0/Timesheets the way Xero does: a bearer token
+and a Xero-tenant-id header are required (401 / 403 otherwise), and every
+timesheet needs an EmployeeID, /Date(ms+0000)/ StartDate and EndDate, and
+TimesheetLines whose NumberOfUnits has one entry per day of the range;
+anything else is answered 400 with Xero's ValidationException body. Accepted
+timesheets get a TimesheetID and are kept in memory. With --rate-limit N,
+every Nth request is answered 429 with Retry-After, to exercise the client's
+retries.
+
+Point the app at it with XERO_API_URL=http://127.0.0.1:8765 (any token and
+tenant id). Run from backend/:
+
+    python -m benchmarks.xero_stub_server --port 8765
+    python -m benchmarks.xero_stub_server --rate-limit 5
+"""
+
+import argparse
+import json
+import re
+import sys
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+TIMESHEETS_PATH = "/payroll.xro/1.0/Timesheets"
+_XERO_DATE = re.compile(r"^/Date\((-?\d+)([+-]\d{4})?\)/$")
+_DAY_MS = 86400 * 1000
+
+
+def _date_ms(value: Any) -> Optional[int]:
+    match = _XERO_DATE.match(value) if isinstance(value, str) else None
+    return int(match.group(1)) if match else None
+
+
+def validate_timesheet(timesheet: Any) -> List[str]:
+    """Xero's validation messages for one timesheet; empty if it is accepted"""
+    if not isinstance(timesheet, dict):
+        return ["Timesheet must be an object"]
+    errors = []
+    if not timesheet.get("EmployeeID"):
+        errors.append("Employee is required")
+    start, end = _date_ms(timesheet.get("StartDate")), _date_ms(timesheet.get("EndDate"))
+    if start is None:
+        errors.append("Start Date is required")
+    if end is None:
+        errors.append("End Date is required")
+    days = (end - start) // _DAY_MS + 1 if start is not None and end is not None else None
+    if days is not None and days < 1:
+        errors.append("End Date must be after Start Date")
+    lines = timesheet.get("TimesheetLines")
+    if not isinstance(lines, list) or not lines:
+        errors.append("Timesheet Lines are required")
+        return errors
+    for line in lines:
+        if not isinstance(line, dict) or not line.get("EarningsRateID"):
+            errors.append("Earnings Rate is required")
+            continue
+        units = line.get("NumberOfUnits")
+        if not isinstance(units, list) or any(not isinstance(unit, (int, float)) or unit < 0 for unit in units):
+            errors.append("Number of Units must be a list of non-negative numbers")
+        elif days is not None and len(units) != days:
+            errors.append(f"Number of Units must have {days} entries, one for each day of the timesheet")
+    return errors
+
+
+class XeroStub:
+    """Accepted timesheets and request counters, shared by the handler threads"""
+
+    def __init__(self, rate_limit_every: int = 0):
+        self.rate_limit_every = rate_limit_every
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.timesheets: List[Dict[str, Any]] = []
+
+    def handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: Dict[str, Any], headers: Dict[str, str] = None) -> None:
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                if self.path.split("?")[0] != TIMESHEETS_PATH:
+                    return self._send(404, {"Title": "Not Found"})
+                if not (self.headers.get("Authorization") or "").startswith("Bearer "):
+                    return self._send(401, {"Title": "Unauthorized", "Detail": "AuthenticationUnsuccessful"})
+                if not self.headers.get("Xero-tenant-id"):
+                    return self._send(403, {"Title": "Forbidden", "Detail": "Xero-tenant-id header is required"})
+                with stub.lock:
+                    stub.requests += 1
+                    limited = stub.rate_limit_every and stub.requests % stub.rate_limit_every == 0
+                if limited:
+                    return self._send(429, {"Title": "Too Many Requests"}, {"Retry-After": "0"})
+
+                try:
+                    payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)))
+                except ValueError:
+                    return self._send(400, {"Type": "PostDataInvalidException", "Message": "Invalid JSON"})
+                timesheets = payload if isinstance(payload, list) else [payload]
+
+                results, invalid = [], False
+                for timesheet in timesheets:
+                    errors = validate_timesheet(timesheet)
+                    result = dict(timesheet) if isinstance(timesheet, dict) else {}
+                    if errors:
+                        invalid = True
+                        result["ValidationErrors"] = [{"Message": message} for message in errors]
+                    else:
+                        result["TimesheetID"] = str(uuid.uuid4())
+                    results.append(result)
+                if invalid:
+                    return self._send(400, {
+                        "ErrorNumber": 10,
+                        "Type": "ValidationException",
+                        "Message": "A validation exception occurred",
+                        "Timesheets": results,
+                    })
+                with stub.lock:
+                    stub.timesheets.extend(results)
+                self._send(200, {"Status": "OK", "Timesheets": results})
+
+        return Handler
+
+    def serve(self, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+        """A server bound to (host, port); port 0 picks a free one (server.server_address)"""
+        return ThreadingHTTPServer((host, port), self.handler())
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+        """Serve in a daemon thread; stop with server.shutdown()"""
+        server = self.serve(host, port)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rate-limit", type=int, default=0, help="answer every Nth request with 429 (default off)")
+    args = parser.parse_args(argv)
+
+    server = XeroStub(args.rate_limit).serve(args.host, args.port)
+    print(f"Xero stub on http://{args.host}:{server.server_address[1]}{TIMESHEETS_PATH}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,15 +4,120 @@ import os
 MAX_DAILY_HOURS_DEFAULT = 12.0
 HOUR_TOLERANCE = 0.01
 
+# Extraction cache configuration
+# Bump EXTRACTOR_VERSION whenever extraction output changes so stale entries are ignored
+EXTRACTOR_VERSION = '3'
+EXTRACTION_CACHE_MAX_ENTRIES = int(os.environ.get('EXTRACTION_CACHE_MAX_ENTRIES', 256))
+# On-disk tier is optional; leave EXTRACTION_CACHE_DIR empty to keep the cache in memory only
+EXTRACTION_CACHE_DIR = os.environ.get('EXTRACTION_CACHE_DIR', '')
+EXTRACTION_CACHE_MAX_DISK_MB = int(os.environ.get('EXTRACTION_CACHE_MAX_DISK_MB', 100))
+
+# Template layout mode: crop to the known table regions before falling back to a full-page scan
+TEMPLATE_LAYOUT_MODE = os.environ.get('TEMPLATE_LAYOUT_MODE', '1').lower() in ('1', 'true', 'yes')
+# Timesheet formats besides the built-in one: a JSON list of template declarations
+# (see services/template_registry.py), compiled at start-up and matched before the built-in template.
+# Clear the extraction cache after changing it; cached results are keyed by PDF, not by template
+TEMPLATE_DEFINITIONS_FILE = os.environ.get('TEMPLATE_DEFINITIONS_FILE', '')
+
+# Text preview budget for /api/extract-pdf (the full text is streamed by /api/extract-pdf/text)
+PREVIEW_MAX_PAGES = int(os.environ.get('PREVIEW_MAX_PAGES', 5))
+PREVIEW_MAX_CHARS = int(os.environ.get('PREVIEW_MAX_CHARS', 20000))
+
+# Batch extraction configuration
+BATCH_POOL_SIZE = int(os.environ.get('BATCH_POOL_SIZE', os.cpu_count() or 1))
+# Upper bounds on a single zip archive: member count, uncompressed size of one PDF
+# and of all its PDFs together, checked before anything is decompressed
+BATCH_MAX_ARCHIVE_FILES = int(os.environ.get('BATCH_MAX_ARCHIVE_FILES', 1000))
+BATCH_MAX_ARCHIVE_FILE_MB = int(os.environ.get('BATCH_MAX_ARCHIVE_FILE_MB', 25))
+BATCH_MAX_ARCHIVE_TOTAL_MB = int(os.environ.get('BATCH_MAX_ARCHIVE_TOTAL_MB', 200))
+
+# Runtime data (default SQLite database, job queue and its uploads); relative paths here are
+# taken from the backend directory, not the working directory, so the app and worker.py share them
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BACKEND_DIR, os.environ.get('DATA_DIR', 'data'))
+
+# Job queue configuration (SQLite-backed, drained by worker.py)
+JOB_QUEUE_PATH = os.path.join(BACKEND_DIR, os.environ.get('JOB_QUEUE_PATH', os.path.join(DATA_DIR, 'jobs.sqlite3')))
+JOB_UPLOAD_DIR = os.path.join(BACKEND_DIR, os.environ.get('JOB_UPLOAD_DIR', os.path.join(DATA_DIR, 'uploads')))
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', 3))
+# A running job whose worker has not renewed its lease in time is assumed crashed and retried;
+# workers renew the lease every JOB_HEARTBEAT_SECONDS while they process a job
+JOB_LEASE_SECONDS = int(os.environ.get('JOB_LEASE_SECONDS', 300))
+JOB_HEARTBEAT_SECONDS = float(os.environ.get('JOB_HEARTBEAT_SECONDS', 60))
+JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', 1.0))
+
+# Database pool configuration (DATABASE_URL lives in Config; SQLite ignores the pool sizes)
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 5))
+DB_POOL_RECYCLE_SECONDS = int(os.environ.get('DB_POOL_RECYCLE_SECONDS', 1800))
+# Store every successful extractMeta result in the timesheet table
+PERSIST_EXTRACTIONS = os.environ.get('PERSIST_EXTRACTIONS', '1').lower() in ('1', 'true', 'yes')
+# Duplicate uploads: stored timesheets are indexed by exact, layout and content fingerprint
+# (needs PERSIST_EXTRACTIONS); with DUPLICATE_REUSE_EXTRACTIONS an upload with the same bytes
+# or layout as a stored timesheet reuses its extraction instead of parsing the PDF again
+DUPLICATE_INDEX_ENABLED = os.environ.get('DUPLICATE_INDEX_ENABLED', '1').lower() in ('1', 'true', 'yes')
+DUPLICATE_REUSE_EXTRACTIONS = os.environ.get('DUPLICATE_REUSE_EXTRACTIONS', '1').lower() in ('1', 'true', 'yes')
+
+# Metrics: stage/endpoint timers served on /metrics; off makes every timer a no-op
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1').lower() in ('1', 'true', 'yes')
+
+# Upload limits: requests over MAX_UPLOAD_MB (BATCH_MAX_UPLOAD_MB for /api/extract-meta/batch)
+# are refused with 413 before the body is read; file parts over UPLOAD_SPOOL_THRESHOLD_KB are
+# spooled to a temp file instead of RAM
+MAX_UPLOAD_MB = int(os.environ.get('MAX_UPLOAD_MB', 25))
+BATCH_MAX_UPLOAD_MB = int(os.environ.get('BATCH_MAX_UPLOAD_MB', 100))
+UPLOAD_SPOOL_THRESHOLD_KB = int(os.environ.get('UPLOAD_SPOOL_THRESHOLD_KB', 512))
+
+# Pre-flight checks: reject non-timesheet uploads (header, page count, size, keywords) before extraction
+PREFLIGHT_ENABLED = os.environ.get('PREFLIGHT_ENABLED', '1').lower() in ('1', 'true', 'yes')
+PREFLIGHT_MAX_PAGES = int(os.environ.get('PREFLIGHT_MAX_PAGES', 100))
+# Pages probed for the template keywords in multi-timesheet mode (pages=all)
+PREFLIGHT_PROBE_PAGES = int(os.environ.get('PREFLIGHT_PROBE_PAGES', 5))
+
+# Admission control for the extraction endpoints (per process): at most EXTRACTION_MAX_CONCURRENT
+# parses at once, up to EXTRACTION_QUEUE_SIZE requests waiting at most EXTRACTION_QUEUE_TIMEOUT
+# seconds for a slot; anything beyond is answered 429 with Retry-After
+EXTRACTION_MAX_CONCURRENT = int(os.environ.get('EXTRACTION_MAX_CONCURRENT', 1))
+EXTRACTION_QUEUE_SIZE = int(os.environ.get('EXTRACTION_QUEUE_SIZE', 4))
+EXTRACTION_QUEUE_TIMEOUT = float(os.environ.get('EXTRACTION_QUEUE_TIMEOUT', 30))
+
+# API responses: orjson encodes JSON when installed (stdlib json otherwise);
+# bodies of at least COMPRESS_MIN_BYTES are gzip/deflate compressed when the client accepts it
+JSON_FAST_ENCODER = os.environ.get('JSON_FAST_ENCODER', '1').lower() in ('1', 'true', 'yes')
+COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', '1').lower() in ('1', 'true', 'yes')
+COMPRESS_MIN_BYTES = int(os.environ.get('COMPRESS_MIN_BYTES', 1024))
+COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', 6))
+
+# Start-up: heavy modules (pdfplumber, pypdfium2, NumPy, SQLAlchemy) load on first use.
+# WARMUP_ENABLED loads them in a background thread once a worker is serving;
+# WARMUP_PRELOAD imports them in the gunicorn master before forking instead
+WARMUP_ENABLED = os.environ.get('WARMUP_ENABLED', '1').lower() in ('1', 'true', 'yes')
+WARMUP_PRELOAD = os.environ.get('WARMUP_PRELOAD', '0').lower() in ('1', 'true', 'yes')
+
+# Xero export (/api/export/xero): stored timesheets of a pay period written as Xero Payroll (AU)
+# timesheets, streamed in EXPORT_CHUNK_BYTES chunks. XERO_EMPLOYEE_IDS_FILE is a JSON object
+# {"employee name": "Xero EmployeeID"}; pushes go to XERO_API_URL in batches of XERO_BATCH_SIZE
+EXPORT_CHUNK_BYTES = int(os.environ.get('EXPORT_CHUNK_BYTES', 65536))
+XERO_API_URL = os.environ.get('XERO_API_URL', 'https://api.xero.com')
+XERO_ACCESS_TOKEN = os.environ.get('XERO_ACCESS_TOKEN', '')
+XERO_TENANT_ID = os.environ.get('XERO_TENANT_ID', '')
+XERO_EARNINGS_RATE_ID = os.environ.get('XERO_EARNINGS_RATE_ID', '')
+XERO_EMPLOYEE_IDS_FILE = os.environ.get('XERO_EMPLOYEE_IDS_FILE', '')
+XERO_BATCH_SIZE = int(os.environ.get('XERO_BATCH_SIZE', 50))
+XERO_TIMEOUT = float(os.environ.get('XERO_TIMEOUT', 30))
+XERO_MAX_RETRIES = int(os.environ.get('XERO_MAX_RETRIES', 3))
+
 class Config:
     """Application configuration"""
     
     # Flask configuration
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key'
-    DEBUG = os.environ.get('FLASK_DEBUG') or True
+    DEBUG = os.environ.get('FLASK_DEBUG', '0').lower() in ('1', 'true', 'yes')
+    MAX_CONTENT_LENGTH = MAX_UPLOAD_MB * 1024 * 1024
     
     # Database configuration
-    DATABASE_URL = os.environ.get('DATABASE_URL') or 'sqlite:///easyx.db'
+    # Default: SQLite in DATA_DIR (an absolute path, so four slashes)
+    DATABASE_URL = os.environ.get('DATABASE_URL') or 'sqlite:///' + os.path.join(DATA_DIR, 'easyx.db')
     
     # API configuration
     API_VERSION = 'v1'
\ No newline at end of file
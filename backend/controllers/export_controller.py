@@ -0,0 +1,119 @@
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from functools import lru_cache
+from itertools import chain
+import json
+from config.config import XERO_BATCH_SIZE, XERO_EARNINGS_RATE_ID, XERO_EMPLOYEE_IDS_FILE
+from services.normalization import parse_iso_date
+from services.xero_client import XeroClient
+from services.xero_export_service import (
+    iter_csv, iter_export_items, iter_json, iter_xero_timesheets, load_employee_ids, normalize_employee_ids,
+)
+
+export_bp = Blueprint("export", __name__)
+
+@lru_cache(maxsize=None)
+def _timesheet_repository():
+    """Created on first use, so SQLAlchemy is not imported before /health can answer"""
+    from services.timesheet_repository import TimesheetRepository
+    return TimesheetRepository()
+
+@lru_cache(maxsize=None)
+def _configured_employee_ids():
+    return load_employee_ids(XERO_EMPLOYEE_IDS_FILE)
+
+def _export_request():
+    """
+    ((period start, period end, employee ids, earnings rate id, body), None)
+    from the JSON body, or (None, error response)
+    """
+    payload = request.get_json(force=True, silent=True)
+    if not isinstance(payload, dict):
+        return None, (jsonify({"error": "Expected a JSON object"}), 400)
+    period = payload.get("period") if isinstance(payload.get("period"), dict) else {}
+    start, end = parse_iso_date(period.get("start")), parse_iso_date(period.get("end"))
+    if start is None or end is None or start > end:
+        return None, (jsonify({"error": "period needs start <= end as ISO dates (YYYY-MM-DD)"}), 400)
+
+    employee_ids = payload.get("employee_ids")
+    if employee_ids is None:
+        try:
+            employee_ids = _configured_employee_ids()
+        except (OSError, ValueError) as e:
+            print(f"Error loading Xero employee ids: {e}")
+            return None, (jsonify({"error": "Could not load the Xero employee ids"}), 500)
+    elif isinstance(employee_ids, dict):
+        employee_ids = normalize_employee_ids(employee_ids)
+    else:
+        return None, (jsonify({"error": "employee_ids must map employee names to Xero EmployeeIDs"}), 400)
+
+    earnings_rate_id = payload.get("earnings_rate_id") or XERO_EARNINGS_RATE_ID
+    if not isinstance(earnings_rate_id, str) or not earnings_rate_id:
+        return None, (jsonify({"error": "earnings_rate_id is required (or set XERO_EARNINGS_RATE_ID)"}), 400)
+    return (start, end, employee_ids, earnings_rate_id, payload), None
+
+def _stream(chunks, mimetype, headers=None):
+    """
+    Stream `chunks`, fetching the first one now: database errors are answered
+    with a 500 instead of breaking off a response already sent.
+    """
+    try:
+        first = next(chunks, b"")
+    except Exception as e:
+        print(f"Error exporting timesheets: {e}")
+        return jsonify({"error": "Could not load the stored timesheets"}), 500
+    return Response(stream_with_context(chain([first], chunks)), mimetype=mimetype, headers=headers)
+
+@export_bp.post("/api/export/xero")
+def export_xero():
+    """
+    Export the stored timesheets of a pay period as Xero Payroll timesheets.
+    Body: {"period": {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"},
+           "format": "json" (default) or "csv",
+           "employee_ids": {"employee name": "Xero EmployeeID", ...} (default: XERO_EMPLOYEE_IDS_FILE),
+           "earnings_rate_id": "..." (default: XERO_EARNINGS_RATE_ID)}
+    JSON is {"Timesheets": [...], "Skipped": [...]}; CSV has a row per timesheet day.
+    Either is streamed as it is written, in constant memory.
+    """
+    parsed, error = _export_request()
+    if error:
+        return error
+    start, end, employee_ids, earnings_rate_id, payload = parsed
+    export_format = payload.get("format", "json")
+    if export_format not in ("json", "csv"):
+        return jsonify({"error": "format must be json or csv"}), 400
+
+    items = iter_export_items(_timesheet_repository().iter_meta_in_period(start, end), employee_ids)
+    filename = f"xero-timesheets-{start.isoformat()}-{end.isoformat()}.{export_format}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if export_format == "csv":
+        return _stream(iter_csv(items, earnings_rate_id), "text/csv", headers)
+    return _stream(iter_json(items, earnings_rate_id), "application/json", headers)
+
+@export_bp.post("/api/export/xero/push")
+def push_xero():
+    """
+    Post the stored timesheets of a pay period to Xero, XERO_BATCH_SIZE per request.
+    Body as /api/export/xero (without "format"), plus optional "batch_size".
+    Streams NDJSON: a line per batch ({"batch", "sent", "timesheet_ids"} or
+    {"batch", "sent", "error", "status", "details"}), then {"done": true, "skipped": [...]}.
+    """
+    parsed, error = _export_request()
+    if error:
+        return error
+    start, end, employee_ids, earnings_rate_id, payload = parsed
+    batch_size = payload.get("batch_size", XERO_BATCH_SIZE)
+    if isinstance(batch_size, bool) or not isinstance(batch_size, int) or not 1 <= batch_size <= 100:
+        return jsonify({"error": "batch_size must be an integer from 1 to 100"}), 400
+    client = XeroClient()
+    if not client.configured:
+        return jsonify({"error": "Xero is not configured (XERO_ACCESS_TOKEN, XERO_TENANT_ID)"}), 503
+
+    def generate():
+        skipped = []
+        items = iter_export_items(_timesheet_repository().iter_meta_in_period(start, end), employee_ids)
+        timesheets = (timesheet for _item, timesheet in iter_xero_timesheets(items, earnings_rate_id, skipped))
+        for result in client.push(timesheets, batch_size):
+            yield json.dumps(result) + "\n"
+        yield json.dumps({"done": True, "skipped": skipped}) + "\n"
+
+    return _stream(generate(), "application/x-ndjson")
@@ -1,5 +1,7 @@
-from flask import Blueprint
+from flask import Blueprint, Response, jsonify
+from config.config import METRICS_ENABLED
 from services.home_service import HomeService
+from services.metrics_service import registry
 
 home_bp = Blueprint('home', __name__)
 home_service = HomeService()
@@ -13,3 +15,10 @@ def get_welcome():
 def health_check():
     """Health check endpoint"""
     return home_service.health_check()
+
+@home_bp.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus scrape endpoint: stage timings, request latency and upload sizes"""
+    if not METRICS_ENABLED:
+        return jsonify({"error": "Metrics are disabled"}), 404
+    return Response(registry.render(), mimetype='text/plain; version=0.0.4')
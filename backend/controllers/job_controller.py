@@ -0,0 +1,64 @@
+from flask import Blueprint, request, jsonify
+from config.config import JOB_UPLOAD_DIR
+from services.job_queue_service import JobQueue, JOB_KINDS
+from services.preflight_service import preflight_pdf
+import os
+import uuid
+
+job_bp = Blueprint('jobs', __name__, url_prefix='/api')
+job_queue = JobQueue()
+
+@job_bp.route('/jobs', methods=['POST'])
+def create_job():
+    """
+    Queue a PDF for extraction and return its job id right away.
+    Form field `type` selects the extraction: "meta" (default) or "pdf".
+    """
+    if 'pdf_file' not in request.files:
+        return jsonify({"error": "No pdf_file part in the request"}), 400
+
+    pdf_file = request.files['pdf_file']
+    if pdf_file.filename == '':
+        return jsonify({"error": "No selected file"}), 400
+
+    kind = request.form.get('type', 'meta')
+    if kind not in JOB_KINDS:
+        return jsonify({"error": f"Invalid job type. Expected one of: {', '.join(JOB_KINDS)}"}), 400
+
+    if pdf_file and pdf_file.filename.lower().endswith('.pdf'):
+        try:
+            # Junk uploads never reach the queue or tie up a worker
+            rejection = preflight_pdf(pdf_file.stream)
+            if rejection:
+                return jsonify(rejection), 400
+            
+            os.makedirs(JOB_UPLOAD_DIR, exist_ok=True)
+            # Absolute, so a worker started from any directory finds the upload
+            file_path = os.path.abspath(os.path.join(JOB_UPLOAD_DIR, f"{uuid.uuid4().hex}.pdf"))
+            pdf_file.save(file_path)
+
+            job_id = job_queue.enqueue(kind, pdf_file.filename, file_path)
+
+            return jsonify({
+                "success": True,
+                "job_id": job_id,
+                "status": "queued"
+            }), 202
+
+        except Exception as e:
+            return jsonify({"error": f"Error queuing PDF: {str(e)}"}), 500
+    else:
+        return jsonify({"error": "Invalid file type. Only PDF files are allowed."}), 400
+
+@job_bp.route('/jobs/stats', methods=['GET'])
+def job_stats():
+    """Queue depth by status, for capacity planning"""
+    return jsonify(job_queue.stats()), 200
+
+@job_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Status of a job, with its result once done"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job), 200
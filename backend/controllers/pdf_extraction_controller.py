@@ -1,11 +1,55 @@
-from flask import Blueprint, request, jsonify
-from services.pdf_extraction_service import PdfExtractionService
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from services.pdf_extraction_service import PdfExtractionService, is_error
+from services.parsed_document import ParsedDocument
+from services.extraction_cache import ExtractionCache
+from services.batch_extraction_service import BatchExtractionService, archive_pdfs
+from services.upload_service import open_upload, upload_limit
+from services.preflight_service import preflight_pdf
+from services.fingerprint_service import KIND_EXACT
+from services.admission_service import AdmissionRejected, extraction_admission
+from config.config import BATCH_MAX_UPLOAD_MB, PERSIST_EXTRACTIONS, PREFLIGHT_PROBE_PAGES
+from functools import lru_cache
+import hashlib
+import json
+import zipfile
 import os
 import uuid
 import io
 
 pdf_extraction_bp = Blueprint('pdf_extraction', __name__, url_prefix='/api')
-pdf_extraction_service = PdfExtractionService()
+extraction_cache = ExtractionCache()
+pdf_extraction_service = PdfExtractionService(cache=extraction_cache)
+batch_extraction_service = BatchExtractionService(cache=extraction_cache)
+
+@lru_cache(maxsize=None)
+def _timesheet_repository():
+    """Created on first use, so SQLAlchemy is not imported before /health can answer"""
+    from services.timesheet_repository import TimesheetRepository
+    return TimesheetRepository()
+
+@lru_cache(maxsize=None)
+def _duplicate_index():
+    """Created on first use, so SQLAlchemy is not imported before /health can answer"""
+    from services.duplicate_index_service import DuplicateIndex
+    return DuplicateIndex()
+
+def _persist_meta(content_hash, meta_data):
+    """Store an extraction result; returns the timesheet id, or None if not stored"""
+    if not PERSIST_EXTRACTIONS:
+        return None
+    try:
+        return _timesheet_repository().save_meta(content_hash, meta_data)["tid"]
+    except Exception as e:
+        # Persistence is best effort: the caller still gets its extraction result
+        print(f"Error persisting timesheet: {e}")
+        return None
+
+def _busy_response(rejection):
+    """429 for a request the admission controller turned away"""
+    response = jsonify({"error": "Server busy, too many PDFs are being processed. Retry later.",
+                        "reason": rejection.reason})
+    response.headers['Retry-After'] = str(rejection.retry_after)
+    return response, 429
 
 @pdf_extraction_bp.route('/extract-pdf', methods=['POST'])
 def extract_pdf():
@@ -19,34 +63,85 @@ def extract_pdf():
     
     if pdf_file and pdf_file.filename.lower().endswith('.pdf'):
         try:
-            # Read the file into memory
-            pdf_content = pdf_file.read()
-            pdf_stream = io.BytesIO(pdf_content)
-            
-            # Extract data from PDF
-            extracted_data = pdf_extraction_service.extract_timesheet_data(pdf_stream)
+            # Parse the PDF once, straight from the (possibly disk-spooled) upload,
+            # and share it between the extractors
+            with open_upload(pdf_file) as pdf_stream, ParsedDocument(pdf_stream) as doc:
+                # Turn away non-timesheets before any pdfplumber work
+                rejection = preflight_pdf(pdf_stream)
+                if rejection:
+                    return jsonify(rejection), 400
+                
+                # At most EXTRACTION_MAX_CONCURRENT parses at a time, others queue or get 429
+                with extraction_admission.admit():
+                    # Extract data from PDF
+                    extracted_data = pdf_extraction_service.extract_timesheet_data(doc)
+                    
+                    if "error" in extracted_data:
+                        return jsonify({"error": extracted_data["error"]}), 500
+                    
+                    # Get a bounded text preview (reuses the page text laid out above);
+                    # the full text is available from /api/extract-pdf/text
+                    preview = pdf_extraction_service.get_pdf_text_preview(doc)
             
-            if "error" in extracted_data:
-                return jsonify({"error": extracted_data["error"]}), 500
-            
-            # Get PDF text for preview
-            pdf_stream.seek(0)  # Reset stream position
-            pdf_text = pdf_extraction_service.get_pdf_text(pdf_stream)
+            if "error" in preview:
+                return jsonify({"error": preview["error"]}), 500
             
             return jsonify({
                 "success": True,
                 "data": extracted_data,
-                "pdf_text": pdf_text
+                "pdf_text": preview["text"],
+                "pdf_text_truncated": preview["truncated"],
+                "page_count": preview["page_count"]
             }), 200
             
+        except AdmissionRejected as e:
+            return _busy_response(e)
         except Exception as e:
             return jsonify({"error": f"Error processing PDF: {str(e)}"}), 500
     else:
         return jsonify({"error": "Invalid file type. Only PDF files are allowed."}), 400
 
+def _page_hash(content_hash, page_index):
+    """Storage key of one timesheet page; page 0 keeps the hash of the whole PDF"""
+    if page_index == 0:
+        return content_hash
+    return hashlib.sha256(f"{content_hash}:page{page_index}".encode()).hexdigest()
+
+def _extract_meta_pages(pdf_content):
+    """Multi-timesheet mode of /extract-meta: one record per timesheet page"""
+    rejection = preflight_pdf(pdf_content, probe_pages=PREFLIGHT_PROBE_PAGES)
+    if rejection:
+        return jsonify(rejection), 400
+    
+    # The pages fan out over the pool, one slot per pool worker
+    with extraction_admission.admit(batch_extraction_service.pool_size):
+        result = batch_extraction_service.extract_meta_pages(pdf_content)
+    if "error" in result:
+        return jsonify({"error": result["error"]}), 500
+    if not result["timesheets"]:
+        return jsonify({"error": "No timesheet pages found"}), 500
+    
+    content_hash = hashlib.sha256(pdf_content).hexdigest()
+    for record in result["timesheets"]:
+        if record["success"]:
+            record["meta_data"] = record["meta_data"].to_dict()
+            record["timesheet_id"] = _persist_meta(_page_hash(content_hash, record["page_index"]), record["meta_data"])
+    
+    return jsonify({
+        "success": True,
+        "page_count": result["page_count"],
+        "timesheets": result["timesheets"]
+    }), 200
+
 @pdf_extraction_bp.route('/extract-meta', methods=['POST'])
 def extract_meta():
-    """Handle PDF file upload and extract structured meta data"""
+    """
+    Handle PDF file upload and extract structured meta data.
+    With form field `pages=all`, every page carrying a timesheet is extracted
+    (pages in parallel) and a list of records with their page_index is returned.
+    A single timesheet also reports the stored timesheets it `duplicates`; one with
+    the same bytes or layout as a stored one reuses its extraction (`reused_extraction`).
+    """
     if 'pdf_file' not in request.files:
         return jsonify({"error": "No pdf_file part in the request"}), 400
     
@@ -54,24 +149,147 @@ def extract_meta():
     if pdf_file.filename == '':
         return jsonify({"error": "No selected file"}), 400
     
+    pages = request.form.get('pages', 'first')
+    if pages not in ('first', 'all'):
+        return jsonify({"error": "Invalid pages value. Expected one of: first, all"}), 400
+    
     if pdf_file and pdf_file.filename.lower().endswith('.pdf'):
         try:
-            # Read the file into memory
-            pdf_content = pdf_file.read()
-            pdf_stream = io.BytesIO(pdf_content)
-            
-            # Extract meta data from PDF
-            meta_data = pdf_extraction_service.extractMeta(pdf_stream)
+            if pages == 'all':
+                # Pages are sent to the pool workers as bytes
+                return _extract_meta_pages(pdf_file.read())
             
-            if "error" in meta_data:
-                return jsonify({"error": meta_data["error"]}), 500
+            # Extract meta data straight from the (possibly disk-spooled) upload
+            with open_upload(pdf_file) as pdf_stream, ParsedDocument(pdf_stream) as doc:
+                # Turn away non-timesheets before any pdfplumber work
+                rejection = preflight_pdf(pdf_stream)
+                if rejection:
+                    return jsonify(rejection), 400
+                
+                # A stored timesheet with the same bytes or layout needs no parse
+                stored, fingerprints = _duplicate_index().find_stored(doc.content_hash, pdf_stream)
+                meta_data = _duplicate_index().reusable(stored)
+                reused = meta_data is not None
+                
+                if not reused:
+                    with extraction_admission.admit():
+                        meta_data = pdf_extraction_service.extractMeta(doc)
+                    
+                    if is_error(meta_data):
+                        return jsonify({"error": meta_data["error"]}), 500
+                    
+                    meta_data = meta_data.to_dict()
+                
+                if reused and stored["match"] == KIND_EXACT:
+                    # Already stored under this content hash
+                    timesheet_id = stored["timesheet"]["tid"]
+                else:
+                    timesheet_id = _persist_meta(doc.content_hash, meta_data)
+                duplicates = _duplicate_index().record(timesheet_id, fingerprints, pdf_stream, meta_data, stored)
             
             return jsonify({
                 "success": True,
-                "meta_data": meta_data
+                "meta_data": meta_data,
+                "timesheet_id": timesheet_id,
+                "duplicates": duplicates,
+                "reused_extraction": reused
             }), 200
             
+        except AdmissionRejected as e:
+            return _busy_response(e)
         except Exception as e:
             return jsonify({"error": f"Error processing PDF: {str(e)}"}), 500
     else:
         return jsonify({"error": "Invalid file type. Only PDF files are allowed."}), 400
+
+@pdf_extraction_bp.route('/extract-pdf/text', methods=['POST'])
+def extract_pdf_text():
+    """Stream the full text of a PDF page by page as chunked plain text"""
+    if 'pdf_file' not in request.files:
+        return jsonify({"error": "No pdf_file part in the request"}), 400
+    
+    pdf_file = request.files['pdf_file']
+    if pdf_file.filename == '':
+        return jsonify({"error": "No selected file"}), 400
+    
+    if pdf_file and pdf_file.filename.lower().endswith('.pdf'):
+        def generate():
+            try:
+                # The request context, and with it the upload, lives until the stream ends
+                with open_upload(pdf_file) as pdf_stream:
+                    yield from pdf_extraction_service.iter_pdf_text(pdf_stream)
+            except Exception as e:
+                # Headers are already sent, so report the failure in-band
+                yield f"\nError extracting text: {e}\n"
+        
+        # The slot is held until the stream is closed, even if it is never read
+        try:
+            ticket = extraction_admission.acquire()
+        except AdmissionRejected as e:
+            return _busy_response(e)
+        response = Response(stream_with_context(generate()), mimetype='text/plain')
+        response.call_on_close(ticket.release)
+        return response
+    else:
+        return jsonify({"error": "Invalid file type. Only PDF files are allowed."}), 400
+
+def _upload_reader(upload):
+    """Reads an uploaded PDF from its (possibly disk-spooled) stream when called"""
+    def read():
+        upload.stream.seek(0)
+        return upload.stream.read()
+    return read
+
+def _collect_batch_files(uploads):
+    """Flatten uploaded PDFs and zip archives into (filename, reader) pairs"""
+    files = []
+    for upload in uploads:
+        filename = upload.filename or ''
+        if filename.lower().endswith('.zip'):
+            files.extend(archive_pdfs(upload.stream))
+        elif filename.lower().endswith('.pdf'):
+            files.append((filename, _upload_reader(upload)))
+        else:
+            files.append((filename, None))
+    return files
+
+@pdf_extraction_bp.route('/extract-meta/batch', methods=['POST'])
+@upload_limit(BATCH_MAX_UPLOAD_MB)
+def extract_meta_batch():
+    """
+    Extract meta data from many PDFs at once.
+    Accepts any number of `pdf_files` parts (PDFs or zip archives of PDFs), up
+    to BATCH_MAX_UPLOAD_MB in all, and streams one NDJSON line per file as soon
+    as that file is done. Answered 429 when the extraction slots are taken.
+    """
+    uploads = [f for f in request.files.getlist('pdf_files') if f.filename]
+    if not uploads:
+        return jsonify({"error": "No pdf_files part in the request"}), 400
+    
+    try:
+        files = _collect_batch_files(uploads)
+    except (zipfile.BadZipFile, ValueError) as e:
+        return jsonify({"error": f"Invalid archive: {str(e)}"}), 400
+    
+    # One slot per pool worker, held until the stream is closed, even if it is never read
+    try:
+        ticket = extraction_admission.acquire(batch_extraction_service.pool_size)
+    except AdmissionRejected as e:
+        return _busy_response(e)
+    
+    def generate():
+        for result in batch_extraction_service.iter_extract_meta(files):
+            if result["success"]:
+                content_hash = result.pop("content_hash")
+                result["meta_data"] = result["meta_data"].to_dict()
+                result["timesheet_id"] = _persist_meta(content_hash, result["meta_data"])
+            yield json.dumps(result) + "\n"
+    
+    response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    response.call_on_close(ticket.release)
+    return response
+
+@pdf_extraction_bp.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    """Hit/miss counters and sizes of the extraction result cache"""
+    return jsonify(extraction_cache.stats()), 200
@@ -1,10 +1,119 @@
 from flask import Blueprint, request, jsonify
+from functools import lru_cache
 from services.timesheet_check_service import check_timesheet_rows
+from services.timesheet_batch_check_service import check_timesheet_rows_batch
+from services.reconciliation_service import reconcile
+from services.normalization import parse_iso_date
 
 bp_timesheet = Blueprint("timesheet", __name__)
 
+@lru_cache(maxsize=None)
+def _revalidation_service():
+    """Created on first use, so SQLAlchemy is not imported before /health can answer"""
+    from services.timesheet_revalidation_service import TimesheetRevalidationService
+    return TimesheetRevalidationService()
+
+@lru_cache(maxsize=None)
+def _timesheet_repository():
+    """Created on first use, so SQLAlchemy is not imported before /health can answer"""
+    from services.timesheet_repository import TimesheetRepository
+    return TimesheetRepository()
+
 @bp_timesheet.post("/timesheet/check")
 def check_timesheet():
     payload = request.get_json(force=True, silent=True) or {}
-    print("RESULT FROM SERVICE:", check_timesheet_rows(payload))  # 加这一行
     return jsonify(check_timesheet_rows(payload)), 200
+
+@bp_timesheet.post("/timesheet/check/batch")
+def check_timesheet_batch():
+    """
+    Validate many extracted/expected pairs in one call.
+    Body: {"items": [<check payload>, ...]} (or a bare list of payloads).
+    Returns {"results": [...]} in input order, each as /timesheet/check would return it.
+    """
+    payload = request.get_json(force=True, silent=True)
+    items = payload.get("items") if isinstance(payload, dict) else payload
+    if not isinstance(items, list):
+        return jsonify({"error": "Expected a list of items"}), 400
+
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            return jsonify({"error": f"Item {index} is not an object"}), 400
+
+    try:
+        results = check_timesheet_rows_batch(items)
+    except (AttributeError, TypeError) as e:
+        return jsonify({"error": f"Invalid timesheet payload: {str(e)}"}), 400
+    return jsonify({"results": results}), 200
+
+@bp_timesheet.post("/timesheet/check/incremental")
+def check_timesheet_incremental():
+    """
+    Re-check timesheets against their last stored check, re-evaluating only the
+    rows whose inputs changed (e.g. after the expected schedule was edited).
+    Body: {"items": [{"timesheet_id": "42", "extracted": {...}, "expected": {...}}, ...]}
+    (or a bare list of items).
+    Returns {"results": [...]} in input order, each with all `rows`, the rows whose
+    pass/fail `changed` ({"before", "after"}) and the rows `reevaluated`.
+    """
+    payload = request.get_json(force=True, silent=True)
+    items = payload.get("items") if isinstance(payload, dict) else payload
+    if not isinstance(items, list):
+        return jsonify({"error": "Expected a list of items"}), 400
+
+    pairs = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            return jsonify({"error": f"Item {index} is not an object"}), 400
+        timesheet_id = item.get("timesheet_id")
+        if isinstance(timesheet_id, bool) or not isinstance(timesheet_id, (str, int)) \
+                or not str(timesheet_id).strip() or len(str(timesheet_id)) > 128:
+            return jsonify({"error": f"Item {index} needs a timesheet_id (string or integer, at most 128 characters)"}), 400
+        pairs.append((str(timesheet_id), item))
+
+    try:
+        results = _revalidation_service().revalidate(pairs)
+    except (AttributeError, TypeError) as e:
+        return jsonify({"error": f"Invalid timesheet payload: {str(e)}"}), 400
+    return jsonify({"results": results}), 200
+
+@bp_timesheet.post("/timesheet/reconcile")
+def reconcile_pay_period():
+    """
+    Reconcile a pay period of extracted timesheets with the expected schedules.
+    Body: {"expected": [{"employee_name", "po_number", "week_start" or "week_worked",
+                         "hours": {"Mon": "8hrs", ...}, "total_hours"}, ...],
+           "extracted": [{"timesheet_id": "42", "meta": <extractMeta result>}, ...]}
+    or, instead of "extracted", "period": {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"}
+    to use the stored timesheets whose week starts in that range.
+    Returns per-week deltas against the schedule and the previous week, plus
+    missing weeks, duplicate submissions, overlapping date ranges and invalid items.
+    """
+    payload = request.get_json(force=True, silent=True)
+    if not isinstance(payload, dict):
+        return jsonify({"error": "Expected a JSON object"}), 400
+    schedules = payload.get("expected", [])
+    if not isinstance(schedules, list):
+        return jsonify({"error": "expected must be a list of schedules"}), 400
+
+    if "period" in payload:
+        period = payload["period"] if isinstance(payload["period"], dict) else {}
+        start, end = parse_iso_date(period.get("start")), parse_iso_date(period.get("end"))
+        if start is None or end is None or start > end:
+            return jsonify({"error": "period needs start <= end as ISO dates (YYYY-MM-DD)"}), 400
+        try:
+            extracted = _timesheet_repository().meta_in_period(start, end)
+        except Exception as e:
+            print(f"Error loading stored timesheets: {e}")
+            return jsonify({"error": "Could not load the stored timesheets"}), 500
+    else:
+        items = payload.get("extracted")
+        if not isinstance(items, list):
+            return jsonify({"error": "Expected extracted (a list) or period"}), 400
+        extracted = []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict) or not isinstance(item.get("meta"), dict):
+                return jsonify({"error": f"Extracted item {index} needs a meta object"}), 400
+            extracted.append((item.get("timesheet_id", index), item["meta"]))
+
+    return jsonify(reconcile(extracted, list(enumerate(schedules)))), 200
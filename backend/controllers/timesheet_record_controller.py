@@ -0,0 +1,49 @@
+from flask import Blueprint, request, jsonify
+from functools import lru_cache
+from services.normalization import parse_iso_date
+
+timesheet_record_bp = Blueprint('timesheet_records', __name__, url_prefix='/api')
+
+@lru_cache(maxsize=None)
+def _timesheet_repository():
+    """Created on first use, so SQLAlchemy is not imported before /health can answer"""
+    from services.timesheet_repository import TimesheetRepository
+    return TimesheetRepository()
+
+@timesheet_record_bp.route('/timesheets', methods=['GET'])
+def find_timesheets():
+    """
+    Find stored timesheets by indexed fields.
+    Query parameters (all optional): employee_name, po_number, week_start (YYYY-MM-DD,
+    the first worked date on the timesheet), content_hash, limit.
+    """
+    content_hash = request.args.get('content_hash')
+    if content_hash:
+        timesheet = _timesheet_repository().find_by_hash(content_hash)
+        return jsonify({"timesheets": [timesheet] if timesheet else []}), 200
+
+    week_start = request.args.get('week_start')
+    if week_start is not None:
+        week_start = parse_iso_date(week_start)
+        if week_start is None:
+            return jsonify({"error": "week_start must be an ISO date (YYYY-MM-DD)"}), 400
+
+    try:
+        limit = min(int(request.args.get('limit', 100)), 1000)
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+
+    timesheets = _timesheet_repository().find(
+        employee_name=request.args.get('employee_name'),
+        po_number=request.args.get('po_number'),
+        week_start=week_start,
+        limit=limit,
+    )
+    return jsonify({"timesheets": timesheets}), 200
+
+@timesheet_record_bp.route('/timesheets/<int:tid>', methods=['GET'])
+def get_timesheet(tid):
+    timesheet = _timesheet_repository().get(tid)
+    if timesheet is None:
+        return jsonify({"error": "Timesheet not found"}), 404
+    return jsonify(timesheet), 200
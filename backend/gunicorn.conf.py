@@ -0,0 +1,48 @@
+"""
+Gunicorn configuration for the production profile.
+
+Defaults are sized for the Raspberry Pi compose profile (1 CPU, 512M):
+extraction is CPU-bound, so a second worker only keeps /health and small
+requests responsive while the other one is busy parsing. Threads let each
+worker overlap upload I/O and streaming responses. Every value can be
+overridden through the environment.
+"""
+
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5001')
+
+# Pre-forked workers and threads per worker
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 2))
+# PDF parses per worker are capped separately by EXTRACTION_MAX_CONCURRENT;
+# threads beyond it queue (EXTRACTION_QUEUE_SIZE) or answer 429
+worker_class = 'gthread'
+
+# Import create_app() once in the master, before forking (and the pdfplumber
+# stack too with WARMUP_PRELOAD; see wsgi.py)
+preload_app = True
+
+# Recycle workers after N requests (with jitter so they don't restart together)
+# to give back memory that pdfminer's parse structures leave fragmented
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 200))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 20))
+
+# Large PDFs on the Pi can take a while; give in-flight requests time to finish on restart
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+
+# Heartbeat files in memory instead of on the SD card
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def post_worker_init(worker):
+    # The worker is about to accept requests; load the extraction stack
+    # alongside, so /health answers at once and the first upload is not cold
+    from services.warmup_service import start_background_warmup
+    start_background_warmup()
@@ -1 +1,3 @@
 # Models package
+# The ORM base lives in models.orm, so importing the plain record types
+# (pdf_extraction_types, template_layouts) does not load SQLAlchemy
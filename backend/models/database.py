@@ -0,0 +1,78 @@
+"""
+Database engine and sessions
+SQLite by default, Postgres (or anything SQLAlchemy supports) via DATABASE_URL
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import Session, sessionmaker
+
+from config.config import Config, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_RECYCLE_SECONDS
+from .orm import Base
+
+_engine: Optional[Engine] = None
+_session_factory: Optional[sessionmaker] = None
+_lock = threading.Lock()
+
+
+def _create_engine(url: str) -> Engine:
+    if url.startswith("sqlite"):
+        # SQLite creates the file but not its directory (DATA_DIR on a fresh checkout)
+        database = make_url(url).database
+        if database and database != ":memory:" and os.path.dirname(database):
+            os.makedirs(os.path.dirname(database), exist_ok=True)
+        # Flask serves requests from several threads; SQLite needs to allow that
+        return create_engine(url, connect_args={"check_same_thread": False}, future=True)
+    return create_engine(
+        url,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_recycle=DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=True,
+        future=True,
+    )
+
+
+def get_engine() -> Engine:
+    """Process-wide pooled engine, created and initialised on first use"""
+    global _engine, _session_factory
+    with _lock:
+        if _engine is None:
+            # Register the models on Base before creating tables
+            from models import timesheet, timesheet_check, timesheet_fingerprint  # noqa: F401
+            engine = _create_engine(Config.DATABASE_URL)
+            # Only publish the engine once its tables exist, so a failure is retried next call
+            Base.metadata.create_all(engine)
+            _session_factory = sessionmaker(bind=engine, expire_on_commit=False, future=True)
+            _engine = engine
+    return _engine
+
+
+def dispose_engine() -> None:
+    """Drop pooled connections, e.g. in a freshly forked worker"""
+    global _engine, _session_factory
+    with _lock:
+        if _engine is not None:
+            _engine.dispose()
+        _engine = None
+        _session_factory = None
+
+
+@contextmanager
+def session_scope():
+    """Session that commits on success and rolls back on error"""
+    get_engine()
+    session: Session = _session_factory()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
@@ -0,0 +1,5 @@
+# backend/models/orm.py
+from sqlalchemy.orm import declarative_base
+
+# Declarative base shared by all ORM models
+Base = declarative_base()
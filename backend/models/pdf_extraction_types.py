@@ -3,36 +3,68 @@ PDF Extraction Types
 Define JSON format structure for PDF extraction
 """
 
-from typing import Dict, List, Optional
+from typing import Any, Dict, Optional, Tuple
 from dataclasses import dataclass
 
-@dataclass
+# Records are frozen and slotted: a batch of thousands stays compact in memory
+# and can be shared between callers without defensive copies. `to_dict` gives
+# the JSON shape of META_JSON_EXAMPLE at the API boundary; `from_dict` reads it back.
+
+@dataclass(frozen=True, slots=True)
 class BaseInfo:
     """Basic information"""
     po_number: str
     client: str
     supervisor: str
 
-@dataclass
+    def to_dict(self) -> Dict[str, Any]:
+        return {"po_number": self.po_number, "client": self.client, "supervisor": self.supervisor}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BaseInfo":
+        return cls(data["po_number"], data["client"], data["supervisor"])
+
+@dataclass(frozen=True, slots=True)
 class EmployeeInfo:
     """Employee information"""
     name: str
     company: str
 
-@dataclass
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "company": self.company}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EmployeeInfo":
+        return cls(data["name"], data["company"])
+
+@dataclass(frozen=True, slots=True)
 class TimePeriod:
     """Time period information"""
     start: str
     finish: str
     time: str
 
-@dataclass
+    def to_dict(self) -> Dict[str, Any]:
+        return {"start": self.start, "finish": self.finish, "time": self.time}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TimePeriod":
+        return cls(data["start"], data["finish"], data["time"])
+
+@dataclass(frozen=True, slots=True)
 class ExtraInOut:
     """Extra in/out time"""
     morning: str
     afternoon: str
 
-@dataclass
+    def to_dict(self) -> Dict[str, Any]:
+        return {"morning": self.morning, "afternoon": self.afternoon}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ExtraInOut":
+        return cls(data["morning"], data["afternoon"])
+
+@dataclass(frozen=True, slots=True)
 class WorkEntry:
     """Work entry"""
     weekday: str
@@ -44,13 +76,42 @@ class WorkEntry:
     total_daily_hours: str
     total_daily_decimal: float
 
-@dataclass
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "weekday": self.weekday,
+            "date_original": self.date_original,
+            "date_iso": self.date_iso,
+            "morning": self.morning.to_dict(),
+            "afternoon": self.afternoon.to_dict(),
+            "extra_in_out": self.extra_in_out.to_dict(),
+            "total_daily_hours": self.total_daily_hours,
+            "total_daily_decimal": self.total_daily_decimal,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WorkEntry":
+        return cls(
+            data["weekday"], data["date_original"], data["date_iso"],
+            TimePeriod.from_dict(data["morning"]),
+            TimePeriod.from_dict(data["afternoon"]),
+            ExtraInOut.from_dict(data["extra_in_out"]),
+            data["total_daily_hours"], data["total_daily_decimal"],
+        )
+
+@dataclass(frozen=True, slots=True)
 class WeeklyTotal:
     """Weekly total"""
     total_hours: str
     total_decimal_hours: float
 
-@dataclass
+    def to_dict(self) -> Dict[str, Any]:
+        return {"total_hours": self.total_hours, "total_decimal_hours": self.total_decimal_hours}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WeeklyTotal":
+        return cls(data["total_hours"], data["total_decimal_hours"])
+
+@dataclass(frozen=True, slots=True)
 class TaskPerDay:
     """Task per day time"""
     Mon: str
@@ -58,9 +119,19 @@ class TaskPerDay:
     Wed: str
     Thur: str
     Fri: str
-    Sat_Sun: str
+    Sat_Sun: str  # "Sat/Sun" in JSON
 
-@dataclass
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "Mon": self.Mon, "Tues": self.Tues, "Wed": self.Wed,
+            "Thur": self.Thur, "Fri": self.Fri, "Sat/Sun": self.Sat_Sun,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TaskPerDay":
+        return cls(data["Mon"], data["Tues"], data["Wed"], data["Thur"], data["Fri"], data["Sat/Sun"])
+
+@dataclass(frozen=True, slots=True)
 class Task:
     """Task information"""
     task_name: str
@@ -68,24 +139,131 @@ class Task:
     total_hours: str
     decimal_hours: float
 
-@dataclass
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "task_name": self.task_name,
+            "per_day": self.per_day.to_dict(),
+            "total_hours": self.total_hours,
+            "decimal_hours": self.decimal_hours,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Task":
+        return cls(data["task_name"], TaskPerDay.from_dict(data["per_day"]),
+                   data["total_hours"], data["decimal_hours"])
+
+@dataclass(frozen=True, slots=True)
 class TotalsRow:
     """Totals row"""
     label: str
-    by_day: Dict[str, str]
+    by_day: Dict[str, str]  # Mon .. Sun as printed; empty when the row is missing
     total_hours: str
     total_decimal_hours: float
 
-@dataclass
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "label": self.label,
+            "by_day": dict(self.by_day),
+            "total_hours": self.total_hours,
+            "total_decimal_hours": self.total_decimal_hours,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TotalsRow":
+        return cls(data["label"], dict(data["by_day"]), data["total_hours"], data["total_decimal_hours"])
+
+@dataclass(frozen=True, slots=True)
+class HiddenRun:
+    """Consecutive glyphs a reader cannot see"""
+    text: str
+    bbox: Tuple[float, float, float, float]
+    reasons: Tuple[str, ...]
+    cell: Optional[Tuple[int, int, int]]  # (table, row, column), None outside the tables
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "text": self.text,
+            "bbox": list(self.bbox),
+            "reasons": list(self.reasons),
+            "cell": list(self.cell) if self.cell is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HiddenRun":
+        cell = data["cell"]
+        return cls(data["text"], tuple(data["bbox"]), tuple(data["reasons"]),
+                   tuple(cell) if cell is not None else None)
+
+@dataclass(frozen=True, slots=True)
+class CellVisibility:
+    """Visibility of one table cell"""
+    cell: Tuple[int, int, int]  # (table, row, column)
+    visible: bool
+    confidence: float  # share of the cell's glyphs that are visible
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"cell": list(self.cell), "visible": self.visible, "confidence": self.confidence}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CellVisibility":
+        return cls(tuple(data["cell"]), data["visible"], data["confidence"])
+
+@dataclass(frozen=True, slots=True)
+class TextVisibility:
+    """Hidden-text findings for the page"""
+    visible: bool
+    hidden_runs: Tuple[HiddenRun, ...]
+    cells: Tuple[CellVisibility, ...]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "visible": self.visible,
+            "hidden_runs": [run.to_dict() for run in self.hidden_runs],
+            "cells": [cell.to_dict() for cell in self.cells],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TextVisibility":
+        return cls(data["visible"],
+                   tuple(HiddenRun.from_dict(run) for run in data["hidden_runs"]),
+                   tuple(CellVisibility.from_dict(cell) for cell in data["cells"]))
+
+@dataclass(frozen=True, slots=True)
 class PdfExtractionMeta:
     """PDF extraction metadata"""
     base: BaseInfo
     employee: EmployeeInfo
-    work_entries: List[WorkEntry]
+    work_entries: Tuple[WorkEntry, ...]
     weekly_total: WeeklyTotal
-    tasks: List[Task]
+    tasks: Tuple[Task, ...]
     totals_row: TotalsRow
     date: str
+    text_visibility: TextVisibility
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "base": self.base.to_dict(),
+            "employee": self.employee.to_dict(),
+            "work_entries": [entry.to_dict() for entry in self.work_entries],
+            "weekly_total": self.weekly_total.to_dict(),
+            "tasks": [task.to_dict() for task in self.tasks],
+            "totals_row": self.totals_row.to_dict(),
+            "date": self.date,
+            "text_visibility": self.text_visibility.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PdfExtractionMeta":
+        return cls(
+            BaseInfo.from_dict(data["base"]),
+            EmployeeInfo.from_dict(data["employee"]),
+            tuple(WorkEntry.from_dict(entry) for entry in data["work_entries"]),
+            WeeklyTotal.from_dict(data["weekly_total"]),
+            tuple(Task.from_dict(task) for task in data["tasks"]),
+            TotalsRow.from_dict(data["totals_row"]),
+            data["date"],
+            TextVisibility.from_dict(data["text_visibility"]),
+        )
 
 # JSON format example
 META_JSON_EXAMPLE = {
@@ -0,0 +1,163 @@
+"""
+Template Layouts
+Bounding boxes of the four timesheet tables for known page layouts, and the
+declarative description of what each table holds (label -> field maps,
+column roles), compiled into extractors by services/template_registry.py
+"""
+
+from typing import Tuple
+from dataclasses import dataclass
+
+# (x0, top, x1, bottom) in PDF points, pdfplumber coordinates
+BBox = Tuple[float, float, float, float]
+
+# Slack added around each region so small export differences still crop cleanly
+REGION_PADDING = 6.0
+
+# Page sizes may differ by rounding between exporters
+PAGE_SIZE_TOLERANCE = 2.0
+
+@dataclass(frozen=True)
+class TableRegion:
+    """One table of the template, in the order extractMeta reads them"""
+    name: str
+    bbox: BBox
+
+    def padded_bbox(self, page_width: float, page_height: float) -> BBox:
+        """Region grown by REGION_PADDING and clamped to the page"""
+        x0, top, x1, bottom = self.bbox
+        return (
+            max(0.0, x0 - REGION_PADDING),
+            max(0.0, top - REGION_PADDING),
+            min(page_width, x1 + REGION_PADDING),
+            min(page_height, bottom + REGION_PADDING),
+        )
+
+@dataclass(frozen=True)
+class TemplateLayout:
+    """Page size and table regions of one timesheet layout"""
+    name: str
+    page_width: float
+    page_height: float
+    regions: Tuple[TableRegion, ...]
+
+    def matches_page(self, width: float, height: float) -> bool:
+        return (abs(width - self.page_width) <= PAGE_SIZE_TOLERANCE
+                and abs(height - self.page_height) <= PAGE_SIZE_TOLERANCE)
+
+# Layout of the timesheets exported from the Techlauncher template (A4)
+TECHLAUNCHER_EXPORT_LAYOUT = TemplateLayout(
+    name="techlauncher-export",
+    page_width=595.0,
+    page_height=842.0,
+    regions=(
+        TableRegion("base", (341.0, 150.0, 543.0, 187.0)),
+        TableRegion("employee", (79.0, 162.0, 284.0, 187.0)),
+        TableRegion("work_periods", (79.0, 199.0, 543.0, 392.0)),
+        TableRegion("task_summary", (52.0, 404.0, 543.0, 522.0)),
+    ),
+)
+
+# Layout of the original "Techlauncher timesheet template 1.pdf"
+TECHLAUNCHER_TEMPLATE_LAYOUT = TemplateLayout(
+    name="techlauncher-template",
+    page_width=595.32,
+    page_height=841.92,
+    regions=(
+        TableRegion("base", (343.0, 178.0, 560.0, 218.0)),
+        TableRegion("employee", (63.0, 192.0, 283.0, 218.0)),
+        TableRegion("work_periods", (63.0, 232.0, 560.0, 443.0)),
+        TableRegion("task_summary", (34.0, 456.0, 560.0, 585.0)),
+    ),
+)
+
+# Tried in order; the most common layout goes first
+TEMPLATE_LAYOUTS = (TECHLAUNCHER_EXPORT_LAYOUT, TECHLAUNCHER_TEMPLATE_LAYOUT)
+
+@dataclass(frozen=True)
+class LabelField:
+    """A label/value row: the label cell contains `label` (case-insensitive); its value is `field`"""
+    label: str
+    field: str
+
+@dataclass(frozen=True)
+class KeyValueTable:
+    """A table of label/value rows; the first field whose label matches a row takes its value"""
+    fields: Tuple[LabelField, ...]
+    key_column: int = 0
+    value_column: int = 1
+    # Value of a field no row matches
+    missing: str = "Unknown"
+
+@dataclass(frozen=True)
+class WorkPeriodColumns:
+    """Column of each value in a day row of the work periods table"""
+    weekday: int = 0
+    date: int = 1
+    morning_start: int = 2
+    morning_finish: int = 3
+    morning_time: int = 4
+    afternoon_start: int = 5
+    afternoon_finish: int = 6
+    afternoon_time: int = 7
+    total_daily: int = 8
+
+@dataclass(frozen=True)
+class WorkPeriodTable:
+    """One row per day, recognised by its weekday cell (case-insensitive); weekdays run Monday first"""
+    columns: WorkPeriodColumns = WorkPeriodColumns()
+    weekdays: Tuple[str, ...] = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+
+@dataclass(frozen=True)
+class TaskSummaryTable:
+    """
+    Task and totals rows, recognised by their label cell: equal to `task_label`,
+    or containing `totals_label`. Day columns are (key, column) pairs.
+    """
+    task_label: str = "Task1"
+    totals_label: str = "Total Hours"
+    label_column: int = 0
+    # The template has one Sat/Sun column, reported for both days
+    totals_day_columns: Tuple[Tuple[str, int], ...] = (
+        ("Mon", 1), ("Tues", 2), ("Wed", 3), ("Thur", 4), ("Fri", 5), ("Sat", 6), ("Sun", 6),
+    )
+    task_day_columns: Tuple[Tuple[str, int], ...] = (
+        ("Mon", 1), ("Tues", 2), ("Wed", 3), ("Thur", 4), ("Fri", 5), ("Sat_Sun", 6),
+    )
+    total_column: int = 7
+    # Value of a day or total cell missing from a short row
+    empty_time: str = "0:00"
+
+@dataclass(frozen=True)
+class TimesheetTemplate:
+    """
+    One timesheet format: its four tables, in extractMeta order, and the page
+    layouts whose regions hold them (none: tables come from the full-page scan)
+    """
+    name: str
+    base: KeyValueTable
+    employee: KeyValueTable
+    work_periods: WorkPeriodTable
+    task_summary: TaskSummaryTable
+    layouts: Tuple[TemplateLayout, ...] = ()
+
+# The Techlauncher timesheet, in both its exported and original page layouts
+TECHLAUNCHER_TEMPLATE = TimesheetTemplate(
+    name="techlauncher",
+    base=KeyValueTable(fields=(
+        LabelField("PO Number", "po_number"),
+        LabelField("Client", "client"),
+        LabelField("Supervisor", "supervisor"),
+    )),
+    employee=KeyValueTable(fields=(
+        LabelField("Name", "name"),
+        LabelField("Company", "company"),
+    )),
+    work_periods=WorkPeriodTable(),
+    task_summary=TaskSummaryTable(),
+    layouts=TEMPLATE_LAYOUTS,
+)
+
+# Built-in templates, matched in order after those of TEMPLATE_DEFINITIONS_FILE;
+# the first also reads pages no template matches
+TIMESHEET_TEMPLATES = (TECHLAUNCHER_TEMPLATE,)
@@ -2,18 +2,52 @@
 
 from dataclasses import dataclass
 from typing import Dict
-from sqlalchemy import BigInteger, Column, DateTime, String, func
+from sqlalchemy import JSON, BigInteger, Column, Date, DateTime, Index, Integer, String, Text, func
 from sqlalchemy.dialects.postgresql import JSONB
-from . import Base
+from .orm import Base
 
 class Timesheet(Base):
     __tablename__ = "timesheet"
 
-    tid = Column(BigInteger, primary_key=True, autoincrement=True)
-    meta_data = Column(JSONB, nullable=False)
+    # SQLite only autoincrements INTEGER primary keys
+    tid = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    meta_data = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     status = Column(String(32), nullable=False, default="in-progress")
 
+    # Lookup columns copied out of meta_data so queries hit an index, not a JSON scan.
+    # Text: the values are read from uploaded PDFs, so no length can be assumed
+    po_number = Column(Text, index=True)
+    employee_name = Column(Text)
+    # The earliest worked date on the timesheet, which is not necessarily a Monday
+    week_start = Column(Date, index=True)
+    # Grouping columns for the Xero export: services.normalization.employee_key of the
+    # name, and the Monday of week_start's ISO week
+    employee_key = Column(Text)
+    week_monday = Column(Date)
+    # SHA-256 of the PDF bytes; one row per distinct upload
+    content_hash = Column(String(64), unique=True, index=True)
+
+    __table_args__ = (
+        # "this employee's timesheet for week X"; also serves lookups by employee alone
+        Index("idx_timesheet_employee_week", "employee_name", "week_start"),
+        # an employee's weeks in order, however the name was cased or spaced
+        Index("idx_timesheet_employee_key_week", "employee_key", "week_monday"),
+    )
+
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            "tid": self.tid,
+            "status": self.status,
+            "po_number": self.po_number,
+            "employee_name": self.employee_name,
+            "week_start": self.week_start.isoformat() if self.week_start else None,
+            "content_hash": self.content_hash,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "meta_data": self.meta_data,
+        }
+
 @dataclass
 class TimesheetExtracted:
     week_worked: str
@@ -0,0 +1,26 @@
+# backend/models/timesheet_check.py
+
+from sqlalchemy import JSON, Column, DateTime, String, func
+from sqlalchemy.dialects.postgresql import JSONB
+from .orm import Base
+
+class TimesheetCheck(Base):
+    """Last check result of a timesheet, with the fingerprints of the inputs each row used"""
+    __tablename__ = "timesheet_check"
+
+    # The stored timesheet's tid, or any stable key the client checks it under
+    timesheet_key = Column(String(128), primary_key=True)
+    # Over every row fingerprint: equal means nothing needs re-evaluating
+    fingerprint = Column(String(64), nullable=False)
+    # {label: {"fingerprint": "...", "pass": bool}} in UI row order
+    rows = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            "timesheet_key": self.timesheet_key,
+            "fingerprint": self.fingerprint,
+            "rows": self.rows,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
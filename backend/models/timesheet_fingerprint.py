@@ -0,0 +1,33 @@
+# backend/models/timesheet_fingerprint.py
+
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer, String, UniqueConstraint, func
+from .orm import Base
+
+class TimesheetFingerprint(Base):
+    """One fingerprint (exact, layout or content) of a stored timesheet"""
+    __tablename__ = "timesheet_fingerprint"
+
+    # SQLite only autoincrements INTEGER primary keys
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    tid = Column(BigInteger().with_variant(Integer, "sqlite"), ForeignKey("timesheet.tid"), nullable=False)
+    kind = Column(String(16), nullable=False)
+    fingerprint = Column(String(64), nullable=False)
+    # Stored extractions are only reused for the extractor version that made them
+    extractor_version = Column(String(32), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        # "stored timesheets with this fingerprint"
+        Index("idx_timesheet_fingerprint_lookup", "kind", "fingerprint"),
+        UniqueConstraint("tid", "kind", name="uq_timesheet_fingerprint_tid_kind"),
+    )
+
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            "tid": self.tid,
+            "kind": self.kind,
+            "fingerprint": self.fingerprint,
+            "extractor_version": self.extractor_version,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
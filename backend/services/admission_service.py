@@ -0,0 +1,139 @@
+# backend/services/admission_service.py
+"""
+Admission control
+-----------------
+
+Bounds how many PDF parses a process runs at once. A request takes one of
+`max_concurrent` slots; if none is free it waits in a short queue (at most
+`max_queue` requests, each for at most `queue_timeout` seconds), and beyond
+that it is turned away with AdmissionRejected, answered as 429 with a
+Retry-After estimated from how long parses currently take.
+
+A burst of uploads then queues briefly or is told to come back later, instead
+of oversubscribing the CPU and running the worker out of memory. Work fanned
+out over the batch process pool takes one slot per pool worker it can keep
+busy (up to all of them), so a batch counts for what it really runs.
+
+Gauges easyx_extraction_active / easyx_extraction_queued and the
+easyx_admission_wait_seconds histogram on /metrics show how busy the slots
+are, for sizing EXTRACTION_MAX_CONCURRENT and the gunicorn workers. Limits
+and metrics are per process.
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+from config.config import EXTRACTION_MAX_CONCURRENT, EXTRACTION_QUEUE_SIZE, EXTRACTION_QUEUE_TIMEOUT
+from services.metrics_service import (
+    ADMISSION_REJECTIONS, ADMISSION_WAIT_SECONDS, EXTRACTION_ACTIVE, EXTRACTION_QUEUED,
+)
+
+REASON_QUEUE_FULL = "queue_full"
+REASON_TIMEOUT = "timeout"
+
+# Weight of the latest parse in the running average used for Retry-After
+_HOLD_SMOOTHING = 0.2
+
+
+class AdmissionRejected(Exception):
+    """No parse slot is free and the wait queue is full (or the wait timed out)"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"Server busy ({reason}), retry in {retry_after}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _Ticket:
+    """Held slots; release() is idempotent so it can be tied to a streamed response"""
+
+    def __init__(self, controller: "AdmissionController", slots: int):
+        self._controller = controller
+        self._slots = slots
+        self._start = time.monotonic()
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._controller._release(time.monotonic() - self._start, self._slots)
+
+
+class AdmissionController:
+    """Semaphore with a bounded, time-limited wait queue"""
+
+    def __init__(self, max_concurrent: int = EXTRACTION_MAX_CONCURRENT,
+                 max_queue: int = EXTRACTION_QUEUE_SIZE,
+                 queue_timeout: float = EXTRACTION_QUEUE_TIMEOUT):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self._condition = threading.Condition()
+        self._active = 0
+        self._waiting = 0
+        self._average_hold = None
+
+    def acquire(self, slots: int = 1) -> _Ticket:
+        """
+        Take `slots` slots (at most all of them), waiting in the queue if needed;
+        raises AdmissionRejected
+        """
+        slots = min(max(1, slots), self.max_concurrent)
+        start = time.monotonic()
+        with self._condition:
+            if self._active + slots > self.max_concurrent:
+                if self._waiting >= self.max_queue:
+                    raise self._reject(REASON_QUEUE_FULL)
+                self._waiting += 1
+                EXTRACTION_QUEUED.set(self._waiting)
+                try:
+                    deadline = start + self.queue_timeout
+                    while self._active + slots > self.max_concurrent:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise self._reject(REASON_TIMEOUT)
+                        self._condition.wait(remaining)
+                finally:
+                    self._waiting -= 1
+                    EXTRACTION_QUEUED.set(self._waiting)
+            self._active += slots
+            EXTRACTION_ACTIVE.set(self._active)
+        ADMISSION_WAIT_SECONDS.observe(time.monotonic() - start)
+        return _Ticket(self, slots)
+
+    @contextmanager
+    def admit(self, slots: int = 1):
+        """Hold `slots` slots for the duration of the block"""
+        ticket = self.acquire(slots)
+        try:
+            yield
+        finally:
+            ticket.release()
+
+    def _release(self, held: float, slots: int) -> None:
+        with self._condition:
+            self._active -= slots
+            EXTRACTION_ACTIVE.set(self._active)
+            if self._average_hold is None:
+                self._average_hold = held
+            else:
+                self._average_hold += _HOLD_SMOOTHING * (held - self._average_hold)
+            # A waiter for several slots may be first in line but not fit yet
+            self._condition.notify_all()
+
+    def _reject(self, reason: str) -> AdmissionRejected:
+        """Called with the condition held"""
+        ADMISSION_REJECTIONS.inc(reason=reason)
+        # Time for the running and queued parses to drain through the slots
+        average = self._average_hold if self._average_hold is not None else 1.0
+        backlog = (self._active + self._waiting) / self.max_concurrent
+        return AdmissionRejected(reason, max(1, math.ceil(average * backlog)))
+
+
+# Shared by every extraction endpoint of the process
+extraction_admission = AdmissionController()
+
+
+__all__ = ["AdmissionController", "AdmissionRejected", "extraction_admission"]
@@ -0,0 +1,275 @@
+# backend/services/batch_extraction_service.py
+"""
+Batch extraction service
+------------------------
+
+Fans many PDFs out to a process pool running PdfExtractionService.extractMeta
+and yields one result per file in completion order, so a slow or malformed PDF
+does not hold up the rest of the batch.
+
+A single multi-page PDF (a month of weekly timesheets, say) is split the same
+way: its pages go to the pool in contiguous chunks, one chunk per worker, and
+each worker opens the file once for its whole chunk.
+
+Cache hits, and files failing the pre-flight checks, are answered in the
+parent process and never reach the pool.
+
+Files are read only when their turn comes (each is given as a reader, zip
+archive members included: see `archive_pdfs`), and at
+most 2 x pool size are submitted to the pool at a time, so a batch holds a few
+PDFs in memory however many it contains.
+"""
+
+import hashlib
+import io
+import multiprocessing
+import threading
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from config.config import (
+    BATCH_POOL_SIZE, BATCH_MAX_ARCHIVE_FILES, BATCH_MAX_ARCHIVE_FILE_MB, BATCH_MAX_ARCHIVE_TOTAL_MB,
+)
+from services.extraction_cache import ExtractionCache
+from services.parsed_document import ParsedDocument
+from models.pdf_extraction_types import PdfExtractionMeta
+from services.pdf_extraction_service import PdfExtractionService, is_error
+from services.preflight_service import preflight_pdf
+
+# Returns the bytes of one PDF of a batch, read when called
+PdfReader = Callable[[], bytes]
+
+_worker_service: Optional[PdfExtractionService] = None
+
+
+def _extract_meta_worker(pdf_bytes: bytes) -> Union[PdfExtractionMeta, Dict[str, Any]]:
+    """Runs inside a pool process; one service instance per process"""
+    global _worker_service
+    if _worker_service is None:
+        _worker_service = PdfExtractionService()
+    return _worker_service.extractMeta(io.BytesIO(pdf_bytes))
+
+
+def _extract_pages_worker(pdf_bytes: bytes, page_indexes: List[int]) -> List[Dict[str, Any]]:
+    """Runs inside a pool process: meta records for the timesheet pages of one chunk"""
+    global _worker_service
+    if _worker_service is None:
+        _worker_service = PdfExtractionService()
+    return _worker_service.extract_meta_pages(io.BytesIO(pdf_bytes), page_indexes)
+
+
+def _page_chunks(page_count: int, chunks: int) -> List[List[int]]:
+    """Split 0..page_count-1 into at most `chunks` contiguous, near-equal runs"""
+    chunks = max(1, min(chunks, page_count))
+    size, extra = divmod(page_count, chunks)
+    result, start = [], 0
+    for i in range(chunks):
+        end = start + size + (1 if i < extra else 0)
+        result.append(list(range(start, end)))
+        start = end
+    return result
+
+
+def archive_pdfs(archive_stream) -> List[Tuple[str, Optional[PdfReader]]]:
+    """
+    (filename, reader) for each PDF inside a zip archive; a reader decompresses
+    its member when called, so only the member being extracted is in memory.
+    Non-PDF members are listed with None so callers can report them.
+    Raises ValueError, before decompressing anything, for an archive over the
+    BATCH_MAX_ARCHIVE_* limits. The sizes checked are the ones the archive
+    declares; zipfile stops decompressing a member at its declared size.
+    The archive stays open while the readers are referenced.
+    """
+    archive = zipfile.ZipFile(archive_stream)
+    members = [m for m in archive.infolist() if not m.is_dir()]
+    pdfs = [m for m in members if m.filename.lower().endswith('.pdf')]
+    try:
+        if len(members) > BATCH_MAX_ARCHIVE_FILES:
+            raise ValueError(f"Archive contains more than {BATCH_MAX_ARCHIVE_FILES} files")
+        for member in pdfs:
+            if member.file_size > BATCH_MAX_ARCHIVE_FILE_MB * 1024 * 1024:
+                raise ValueError(f"{member.filename} is larger than {BATCH_MAX_ARCHIVE_FILE_MB} MB uncompressed")
+        if sum(m.file_size for m in pdfs) > BATCH_MAX_ARCHIVE_TOTAL_MB * 1024 * 1024:
+            raise ValueError(f"Archive holds more than {BATCH_MAX_ARCHIVE_TOTAL_MB} MB of PDFs uncompressed")
+    except ValueError:
+        archive.close()
+        raise
+    return [(member.filename, partial(archive.read, member) if member.filename.lower().endswith('.pdf') else None)
+            for member in members]
+
+
+def _encode_pages(result: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON form of an extract_meta_pages result, for the cache"""
+    records = [dict(record, meta_data=record["meta_data"].to_dict()) if record["success"] else record
+               for record in result["timesheets"]]
+    return {"page_count": result["page_count"], "timesheets": records}
+
+
+def _decode_pages(cached: Dict[str, Any]) -> Dict[str, Any]:
+    records = [dict(record, meta_data=PdfExtractionMeta.from_dict(record["meta_data"])) if record["success"] else record
+               for record in cached["timesheets"]]
+    return {"page_count": cached["page_count"], "timesheets": records}
+
+
+class BatchExtractionService:
+    """Extract meta data for many PDFs in parallel"""
+
+    def __init__(self, pool_size: int = BATCH_POOL_SIZE, cache: Optional[ExtractionCache] = None):
+        self.pool_size = max(1, pool_size)
+        self.cache = cache
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Create the pool on first use and reuse it across batches"""
+        with self._lock:
+            if self._executor is None:
+                # spawn: the parent is a threaded web server, forking it is not safe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.pool_size,
+                    mp_context=multiprocessing.get_context('spawn'),
+                )
+            return self._executor
+
+    def _reset_executor(self, broken: ProcessPoolExecutor) -> None:
+        """Drop a pool whose worker died so the next batch gets a fresh one"""
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def iter_extract_meta(self, files: Iterable[Tuple[str, Optional[PdfReader]]]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield one result dict per input file, in completion order:
+          {"index": 0, "filename": "...", "success": true, "meta_data": PdfExtractionMeta, "content_hash": "..."}
+          {"index": 1, "filename": "...", "success": false, "error": "..."}
+        Files are (filename, reader) pairs; a file given with a None reader is
+        reported as an invalid file type. Each file is read when it is reached,
+        and at most 2 x pool size files are in the pool at once.
+        """
+        window = 2 * self.pool_size
+        executor: Optional[ProcessPoolExecutor] = None
+        futures: Dict[Future, Tuple[int, str, str, Optional[str]]] = {}
+
+        def finished() -> Iterator[Dict[str, Any]]:
+            """Results of the futures done so far, waiting for at least one"""
+            nonlocal executor
+            done, _pending = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, filename, content_hash, key = futures.pop(future)
+                try:
+                    meta_data = future.result()
+                except BrokenProcessPool:
+                    if executor is not None:
+                        self._reset_executor(executor)
+                        executor = None
+                    meta_data = {"error": "Extraction worker crashed"}
+                except Exception as e:
+                    meta_data = {"error": f"Error processing PDF: {str(e)}"}
+
+                if key is not None and not is_error(meta_data):
+                    self.cache.put(key, meta_data.to_dict())
+                yield self._result(index, filename, meta_data, content_hash)
+
+        try:
+            for index, (filename, read) in enumerate(files):
+                if read is None:
+                    yield self._result(index, filename, {"error": "Invalid file type. Only PDF files are allowed."})
+                    continue
+
+                pdf_bytes = read()
+                content_hash = hashlib.sha256(pdf_bytes).hexdigest()
+                key = None
+                if self.cache is not None:
+                    key = self.cache.make_key(content_hash, "meta")
+                    cached = self.cache.get(key)
+                    if cached is not None:
+                        yield self._result(index, filename, PdfExtractionMeta.from_dict(cached), content_hash)
+                        continue
+
+                # Junk uploads are answered here and never occupy a pool worker
+                rejection = preflight_pdf(pdf_bytes)
+                if rejection:
+                    yield self._result(index, filename, rejection)
+                    continue
+
+                if executor is None:
+                    executor = self._get_executor()
+                try:
+                    futures[executor.submit(_extract_meta_worker, pdf_bytes)] = (index, filename, content_hash, key)
+                except BrokenProcessPool:
+                    self._reset_executor(executor)
+                    executor = None
+                    yield self._result(index, filename, {"error": "Extraction worker crashed"})
+                del pdf_bytes
+                while len(futures) >= window:
+                    yield from finished()
+
+            while futures:
+                yield from finished()
+        finally:
+            # Client went away mid-stream: don't keep parsing files nobody will read
+            for future in futures:
+                future.cancel()
+
+    def extract_meta_pages(self, pdf_bytes: bytes) -> Dict[str, Any]:
+        """
+        Extract every timesheet page of one PDF, pages spread over the pool.
+        Returns {"page_count": n, "timesheets": [record, ...]} with the records of
+        PdfExtractionService.extract_meta_pages in page order, or {"error": ...}.
+        """
+        key = None
+        if self.cache is not None:
+            key = self.cache.make_key(hashlib.sha256(pdf_bytes).hexdigest(), "meta_pages")
+            cached = self.cache.get(key)
+            if cached is not None:
+                return _decode_pages(cached)
+
+        with ParsedDocument(io.BytesIO(pdf_bytes)) as doc:
+            page_count = doc.page_count
+            if page_count <= 1 or self.pool_size == 1:
+                # Nothing to spread out; skip the round trip through the pool
+                records = PdfExtractionService().extract_meta_pages(doc)
+                return self._pages_result(key, page_count, records)
+
+        executor = self._get_executor()
+        futures = [executor.submit(_extract_pages_worker, pdf_bytes, chunk)
+                   for chunk in _page_chunks(page_count, self.pool_size)]
+        records = []
+        try:
+            for future in futures:
+                records.extend(future.result())
+        except BrokenProcessPool:
+            self._reset_executor(executor)
+            return {"error": "Extraction worker crashed"}
+        except Exception as e:
+            return {"error": f"Error processing PDF: {str(e)}"}
+        finally:
+            for future in futures:
+                future.cancel()
+        return self._pages_result(key, page_count, records)
+
+    def _pages_result(self, key: Optional[str], page_count: int, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        result = {"page_count": page_count, "timesheets": records}
+        if key is not None and all(record["success"] for record in records):
+            self.cache.put(key, _encode_pages(result))
+        return result
+
+    def _result(self, index: int, filename: str, meta_data: Union[PdfExtractionMeta, Dict[str, Any]],
+                content_hash: Optional[str] = None) -> Dict[str, Any]:
+        if is_error(meta_data):
+            result = {"index": index, "filename": filename, "success": False, "error": meta_data["error"]}
+            if "reason" in meta_data:
+                result["reason"] = meta_data["reason"]
+            return result
+        return {"index": index, "filename": filename, "success": True, "meta_data": meta_data,
+                "content_hash": content_hash}
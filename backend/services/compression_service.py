@@ -0,0 +1,77 @@
+# backend/services/compression_service.py
+"""
+Response compression
+--------------------
+
+Compresses JSON and text responses of at least COMPRESS_MIN_BYTES with gzip
+or deflate, whichever the client's Accept-Encoding prefers (gzip on a tie).
+Extraction payloads are mostly repeated keys, times and page text, and shrink
+several times over.
+
+Streamed responses (NDJSON batches, the full-text stream) are sent as they
+are, so each line still reaches the client as soon as it is produced.
+"""
+
+import gzip
+import zlib
+from typing import Optional
+
+from config.config import COMPRESS_ENABLED, COMPRESS_LEVEL, COMPRESS_MIN_BYTES
+
+COMPRESSIBLE_MIMETYPES = ("application/json", "text/plain", "text/html", "text/csv")
+
+# Preference on equal quality values
+ENCODINGS = ("gzip", "deflate")
+
+
+def negotiate_encoding(accept_encodings) -> Optional[str]:
+    """The encoding to use for a werkzeug Accept-Encoding header, or None for identity"""
+    best, best_quality = None, 0
+    for encoding in ENCODINGS:
+        quality = accept_encodings[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(data: bytes, encoding: str, level: int = COMPRESS_LEVEL) -> bytes:
+    if encoding == "gzip":
+        # mtime=0 keeps the output stable for identical bodies
+        return gzip.compress(data, compresslevel=level, mtime=0)
+    # HTTP "deflate" is the zlib format (RFC 1950), not a raw deflate stream
+    return zlib.compress(data, level)
+
+
+def compress_response(response, accept_encodings, min_bytes: int = COMPRESS_MIN_BYTES):
+    """Compress a buffered response in place when it is worth it and the client accepts it"""
+    if (response.direct_passthrough or response.is_streamed
+            or response.status_code < 200 or response.status_code in (204, 304)
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    # The body depends on Accept-Encoding whether or not this one is compressed
+    response.vary.add("Accept-Encoding")
+
+    encoding = negotiate_encoding(accept_encodings)
+    if encoding is None or (response.content_length or 0) < min_bytes:
+        return response
+
+    response.set_data(compress(response.get_data(), encoding))
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def init_app(app) -> None:
+    """Compress eligible responses of every endpoint"""
+    if not COMPRESS_ENABLED:
+        return
+
+    from flask import request
+
+    @app.after_request
+    def _compress_response(response):
+        return compress_response(response, request.accept_encodings)
+
+
+__all__ = ["compress", "compress_response", "init_app", "negotiate_encoding"]
@@ -0,0 +1,182 @@
+# backend/services/duplicate_index_service.py
+"""
+Duplicate upload index
+----------------------
+
+The same timesheet is often uploaded twice, sometimes re-exported so the bytes
+differ. Every stored timesheet is indexed (`timesheet_fingerprint` table) by
+the fingerprints of fingerprint_service: exact, layout and content.
+
+Before extraction, an upload whose exact or layout fingerprint matches a
+timesheet stored by the current EXTRACTOR_VERSION reuses that extraction: the
+PDF is never opened by pdfplumber. After storing, the upload is indexed and
+the stored timesheets it duplicates are reported, strongest match first, so
+that content duplicates (same employee, PO, dates and hours in a different
+PDF) are caught as well.
+
+The index is best effort: if the database is unavailable, uploads are
+extracted and reported as having no duplicates.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from config.config import (
+    DUPLICATE_INDEX_ENABLED, DUPLICATE_REUSE_EXTRACTIONS, EXTRACTOR_VERSION, PERSIST_EXTRACTIONS,
+)
+from models.database import session_scope
+from models.timesheet import Timesheet
+from models.timesheet_fingerprint import TimesheetFingerprint
+from services.fingerprint_service import (
+    KIND_CONTENT, KIND_EXACT, KIND_LAYOUT, content_fingerprint, layout_fingerprint,
+)
+from services.metrics_service import DUPLICATE_UPLOADS
+
+# Strongest first
+KINDS = (KIND_EXACT, KIND_LAYOUT, KIND_CONTENT)
+# Duplicates reported per upload
+MAX_REPORTED = 20
+
+
+class FingerprintRepository:
+    """Stores the fingerprints of stored timesheets"""
+
+    def find(self, kind: str, fingerprint: str, extractor_version: Optional[str] = None,
+             limit: int = MAX_REPORTED) -> List[int]:
+        """tids of the timesheets with this fingerprint, oldest first"""
+        query = select(TimesheetFingerprint.tid).where(
+            TimesheetFingerprint.kind == kind, TimesheetFingerprint.fingerprint == fingerprint,
+        )
+        if extractor_version is not None:
+            query = query.where(TimesheetFingerprint.extractor_version == extractor_version)
+        query = query.order_by(TimesheetFingerprint.tid).limit(limit)
+        with session_scope() as session:
+            return list(session.scalars(query))
+
+    def fingerprints(self, tid: int) -> Dict[str, str]:
+        """{kind: fingerprint} stored for this timesheet"""
+        query = select(TimesheetFingerprint.kind, TimesheetFingerprint.fingerprint).where(
+            TimesheetFingerprint.tid == tid,
+        )
+        with session_scope() as session:
+            return dict(session.execute(query).all())
+
+    def get_timesheet(self, tid: int) -> Optional[Dict[str, Any]]:
+        with session_scope() as session:
+            timesheet = session.get(Timesheet, tid)
+            return timesheet.to_dict() if timesheet else None
+
+    def save(self, tid: int, fingerprints: Dict[str, str], extractor_version: str) -> None:
+        """Insert or replace the fingerprints of this timesheet"""
+        try:
+            self._upsert(tid, fingerprints, extractor_version)
+        except IntegrityError:
+            # Another request indexed this timesheet concurrently; update its rows instead
+            self._upsert(tid, fingerprints, extractor_version)
+
+    def _upsert(self, tid: int, fingerprints: Dict[str, str], extractor_version: str) -> None:
+        with session_scope() as session:
+            existing = {
+                row.kind: row
+                for row in session.scalars(select(TimesheetFingerprint).where(TimesheetFingerprint.tid == tid))
+            }
+            for kind, fingerprint in fingerprints.items():
+                row = existing.get(kind)
+                if row is None:
+                    row = TimesheetFingerprint(tid=tid, kind=kind)
+                    session.add(row)
+                row.fingerprint = fingerprint
+                row.extractor_version = extractor_version
+
+
+class DuplicateIndex:
+    """Finds stored timesheets an upload duplicates"""
+
+    def __init__(self, repository: FingerprintRepository = None,
+                 enabled: bool = DUPLICATE_INDEX_ENABLED and PERSIST_EXTRACTIONS,
+                 reuse: bool = DUPLICATE_REUSE_EXTRACTIONS,
+                 extractor_version: str = EXTRACTOR_VERSION):
+        self.repository = repository or FingerprintRepository()
+        self.enabled = enabled
+        self.reuse = reuse
+        self.extractor_version = extractor_version
+
+    def find_stored(self, content_hash: str, source) -> Tuple[Optional[Dict[str, Any]], Dict[str, str]]:
+        """
+        Before extraction: a timesheet stored by the current extractor with the
+        same bytes, else the same layout. `source` is the upload, read by PDFium
+        only when the bytes match nothing.
+        Returns ({"match": kind, "timesheet": stored timesheet dict} or None,
+                 the fingerprints computed, to pass on to `record`).
+        """
+        fingerprints = {KIND_EXACT: content_hash}
+        if not self.enabled:
+            return None, fingerprints
+        try:
+            for kind in (KIND_EXACT, KIND_LAYOUT):
+                if kind == KIND_LAYOUT:
+                    fingerprint = layout_fingerprint(source)
+                    if fingerprint is None:
+                        break
+                    fingerprints[KIND_LAYOUT] = fingerprint
+                for tid in self.repository.find(kind, fingerprints[kind], self.extractor_version, limit=1):
+                    timesheet = self.repository.get_timesheet(tid)
+                    if timesheet and timesheet["meta_data"]:
+                        return {"match": kind, "timesheet": timesheet}, fingerprints
+        except Exception as e:
+            # Without the index the upload is simply extracted
+            print(f"Error looking up duplicate timesheets: {e}")
+        return None, fingerprints
+
+    def reusable(self, stored: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """The extraction to reuse for an upload `find_stored` matched, if reuse is on"""
+        return stored["timesheet"]["meta_data"] if stored and self.reuse else None
+
+    def record(self, tid: Optional[int], fingerprints: Dict[str, str], source, meta_data: Dict[str, Any],
+               stored: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        After storing the upload as timesheet `tid`: index its fingerprints (the
+        layout one is computed from `source` if find_stored did not need it) and
+        return the stored timesheets it duplicates, strongest match first,
+        starting with `stored` (what find_stored matched):
+          [{"timesheet_id": 7, "match": "layout"}, {"timesheet_id": 9, "match": "content"}]
+        """
+        if not self.enabled or tid is None:
+            return []
+        duplicates, seen = [], {tid}
+        if stored:
+            # An exact match is the very row the upload was stored in
+            duplicates.append({"timesheet_id": stored["timesheet"]["tid"], "match": stored["match"]})
+            seen.add(stored["timesheet"]["tid"])
+        try:
+            fingerprints = dict(fingerprints)
+            if stored and stored["match"] == KIND_EXACT:
+                # Indexed when first stored; no need to read the PDF again
+                fingerprints = dict(self.repository.fingerprints(tid), **fingerprints)
+            if KIND_LAYOUT not in fingerprints:
+                layout = layout_fingerprint(source)
+                if layout is not None:
+                    fingerprints[KIND_LAYOUT] = layout
+            content = content_fingerprint(meta_data)
+            if content is not None:
+                fingerprints[KIND_CONTENT] = content
+
+            for kind in KINDS:
+                if kind not in fingerprints:
+                    continue
+                for other in self.repository.find(kind, fingerprints[kind]):
+                    if other not in seen and len(duplicates) < MAX_REPORTED:
+                        seen.add(other)
+                        duplicates.append({"timesheet_id": other, "match": kind})
+            self.repository.save(tid, fingerprints, self.extractor_version)
+        except Exception as e:
+            print(f"Error indexing timesheet {tid}: {e}")
+
+        if duplicates:
+            DUPLICATE_UPLOADS.inc(match=duplicates[0]["match"])
+        return duplicates
+
+
+__all__ = ["DuplicateIndex", "FingerprintRepository"]
@@ -0,0 +1,181 @@
+# backend/services/extraction_cache.py
+"""
+Extraction result cache
+-----------------------
+
+Content-addressed cache for PdfExtractionService outputs. Entries are keyed by
+the SHA-256 of the PDF bytes, the extractor version and the operation name, so
+re-uploading the same file skips pdfplumber entirely.
+
+Two tiers:
+- memory: bounded LRU (EXTRACTION_CACHE_MAX_ENTRIES entries)
+- disk:   optional JSON files under EXTRACTION_CACHE_DIR, evicted least recently
+          used first once EXTRACTION_CACHE_MAX_DISK_MB is exceeded
+"""
+
+import copy
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from config.config import (
+    EXTRACTOR_VERSION,
+    EXTRACTION_CACHE_MAX_ENTRIES,
+    EXTRACTION_CACHE_DIR,
+    EXTRACTION_CACHE_MAX_DISK_MB,
+)
+
+
+class ExtractionCache:
+    """Bounded LRU cache of extraction results with an optional disk tier"""
+
+    def __init__(self, max_entries: int = EXTRACTION_CACHE_MAX_ENTRIES,
+                 disk_dir: str = EXTRACTION_CACHE_DIR,
+                 max_disk_mb: int = EXTRACTION_CACHE_MAX_DISK_MB,
+                 version: str = EXTRACTOR_VERSION):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir or None
+        self.max_disk_bytes = max_disk_mb * 1024 * 1024
+        self.version = version
+
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    def make_key(self, content_hash: str, operation: str) -> str:
+        """Cache key for one operation over one PDF"""
+        return f"{content_hash}-{operation}-v{self.version}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a copy of the cached value, or None on a miss"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                return copy.deepcopy(self._memory[key])
+
+        value = self._disk_get(key)
+        with self._lock:
+            if value is None:
+                self._counters["misses"] += 1
+                return None
+            self._counters["disk_hits"] += 1
+            self._memory_put(key, value)
+        return copy.deepcopy(value)
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value in both tiers"""
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._memory_put(key, value)
+        self._disk_put(key, value)
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+        if self.disk_dir:
+            for name in os.listdir(self.disk_dir):
+                if name.endswith('.json'):
+                    os.remove(os.path.join(self.disk_dir, name))
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current tier sizes"""
+        with self._lock:
+            counters = dict(self._counters)
+            memory_entries = len(self._memory)
+
+        lookups = counters["memory_hits"] + counters["disk_hits"] + counters["misses"]
+        hits = counters["memory_hits"] + counters["disk_hits"]
+        stats = {
+            **counters,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": memory_entries,
+            "memory_max_entries": self.max_entries,
+            "disk_enabled": bool(self.disk_dir),
+            "extractor_version": self.version,
+        }
+        if self.disk_dir:
+            files = self._disk_files()
+            stats["disk_entries"] = len(files)
+            stats["disk_bytes"] = sum(size for _path, size, _mtime in files)
+            stats["disk_max_bytes"] = self.max_disk_bytes
+        return stats
+
+    # ---- memory tier (caller holds the lock)
+
+    def _memory_put(self, key: str, value: Any) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    # ---- disk tier
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _disk_get(self, key: str) -> Optional[Any]:
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+            # Touch the file so disk eviction is least-recently-used
+            os.utime(path, None)
+            return value
+        except (OSError, ValueError):
+            return None
+
+    def _disk_put(self, key: str, value: Any) -> None:
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Error writing extraction cache entry: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self._disk_evict()
+
+    def _disk_files(self):
+        files = []
+        for name in os.listdir(self.disk_dir):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.disk_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            files.append((path, st.st_size, st.st_mtime))
+        return files
+
+    def _disk_evict(self) -> None:
+        """Remove least recently used files until the disk tier fits its budget"""
+        files = self._disk_files()
+        total = sum(size for _path, size, _mtime in files)
+        if total <= self.max_disk_bytes:
+            return
+        for path, size, _mtime in sorted(files, key=lambda f: f[2]):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            with self._lock:
+                self._counters["evictions"] += 1
+            if total <= self.max_disk_bytes:
+                break
@@ -0,0 +1,126 @@
+# backend/services/fingerprint_service.py
+"""
+Timesheet fingerprints
+----------------------
+
+Ways two uploads can be the same timesheet, cheapest first:
+
+- exact:   SHA-256 of the PDF bytes (ParsedDocument.content_hash).
+- layout:  SHA-256 of what the extractors read from each page, taken with
+           PDFium in a few milliseconds: the page size, every glyph with its
+           box and fill colour, and every drawn shape with its box and
+           colours, in drawing order, coordinates rounded to 0.1pt. A
+           re-export that only changes the producer, timestamps, metadata or
+           compression keeps it, so its stored extraction can be reused
+           without pdfplumber. Glyph colours, boxes and the shapes beneath
+           are exactly what the hidden text check reads, so a re-export that
+           hides or reveals text gets a new fingerprint.
+- content: SHA-256 of the extraction itself: employee, PO number, ISO dates
+           with their daily hours, and the weekly total. It also matches the
+           same timesheet retyped or laid out differently, but it is only known
+           after extraction.
+"""
+
+import ctypes
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from services.preflight_service import pdfium_source
+
+KIND_EXACT = "exact"
+KIND_LAYOUT = "layout"
+KIND_CONTENT = "content"
+
+# What extractMeta reports for a field it could not read
+_UNKNOWN = "Unknown"
+
+
+def _points(*values: float) -> tuple:
+    """Coordinates in tenths of a point; re-exports can differ in float noise"""
+    return tuple(round(value * 10) for value in values)
+
+
+def _glyphs(textpage, pdfium_c) -> list:
+    red, green, blue, alpha = (ctypes.c_uint() for _ in range(4))
+    glyphs = []
+    for index in range(textpage.count_chars()):
+        pdfium_c.FPDFText_GetFillColor(textpage.raw, index, ctypes.byref(red), ctypes.byref(green),
+                                       ctypes.byref(blue), ctypes.byref(alpha))
+        glyphs.append((
+            pdfium_c.FPDFText_GetUnicode(textpage.raw, index),
+            _points(*textpage.get_charbox(index)),
+            (red.value, green.value, blue.value, alpha.value),
+        ))
+    return glyphs
+
+
+def _shapes(page, pdfium_c) -> list:
+    red, green, blue, alpha = (ctypes.c_uint() for _ in range(4))
+    shapes = []
+    for obj in page.get_objects():
+        if obj.type == pdfium_c.FPDF_PAGEOBJ_TEXT:
+            continue  # read glyph by glyph from the text page
+        colours = []
+        for get_colour in (pdfium_c.FPDFPageObj_GetFillColor, pdfium_c.FPDFPageObj_GetStrokeColor):
+            if get_colour(obj.raw, ctypes.byref(red), ctypes.byref(green), ctypes.byref(blue), ctypes.byref(alpha)):
+                colours.append((red.value, green.value, blue.value, alpha.value))
+            else:
+                colours.append(None)
+        shapes.append((obj.type, _points(*obj.get_bounds()), colours))
+    return shapes
+
+
+def layout_fingerprint(source) -> Optional[str]:
+    """Layout fingerprint of a PDF (path, bytes, memory map or seekable stream); None if PDFium cannot read it"""
+    # Imported on first use rather than at app start
+    import pypdfium2 as pdfium
+    import pypdfium2.raw as pdfium_c
+
+    digest = hashlib.sha256()
+    with pdfium_source(source) as pdfium_input:
+        try:
+            pdf = pdfium.PdfDocument(pdfium_input)
+        except pdfium.PdfiumError:
+            return None
+        try:
+            for page_index in range(len(pdf)):
+                page = pdf[page_index]
+                try:
+                    textpage = page.get_textpage()
+                    try:
+                        glyphs = _glyphs(textpage, pdfium_c)
+                    finally:
+                        textpage.close()
+                    digest.update(repr((_points(*page.get_size()), glyphs, _shapes(page, pdfium_c))).encode())
+                finally:
+                    page.close()
+        except pdfium.PdfiumError:
+            return None
+        finally:
+            pdf.close()
+    return digest.hexdigest()
+
+
+def _text(value: Any) -> str:
+    text = " ".join(str(value).split()) if value is not None else ""
+    return "" if text == _UNKNOWN else text
+
+
+def content_fingerprint(meta_data: Dict[str, Any]) -> Optional[str]:
+    """Content fingerprint of an extractMeta result; None without an employee, PO or dated entries"""
+    employee = _text((meta_data.get("employee") or {}).get("name")).casefold()
+    po_number = _text((meta_data.get("base") or {}).get("po_number"))
+    days = sorted(
+        (entry["date_iso"], round(float(entry.get("total_daily_decimal") or 0), 2))
+        for entry in meta_data.get("work_entries") or ()
+        if isinstance(entry, dict) and entry.get("date_iso") not in (None, "", _UNKNOWN)
+    )
+    if not employee or not po_number or not days:
+        return None
+    total = (meta_data.get("weekly_total") or {}).get("total_decimal_hours")
+    payload = json.dumps([employee, po_number, days, total], separators=(",", ":"), default=repr)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+__all__ = ["KIND_CONTENT", "KIND_EXACT", "KIND_LAYOUT", "content_fingerprint", "layout_fingerprint"]
@@ -0,0 +1,224 @@
+# backend/services/hidden_text_detector.py
+"""
+Hidden text detection
+---------------------
+
+Finds glyphs that `extract_text()` and `extract_tables()` read like any other
+but a person looking at the page cannot see: tiny glyphs, glyphs whose fill
+colour matches what lies beneath them (white on white, grey on a grey cell),
+glyphs outside the page, and glyphs printed over other glyphs.
+
+Works from the char list pdfplumber already parsed, in a single pass: the
+cells of the timesheet tables are bucketed on a coarse grid by bbox, so each
+char finds its cell with one dict lookup and a handful of containment tests.
+Nothing is rendered.
+
+The result is attached to extractMeta output as `text_visibility`, with a
+confidence and visibility flag for every non-empty cell.
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from models.pdf_extraction_types import CellVisibility, HiddenRun, TextVisibility
+
+# Glyphs smaller than this (pt) are unreadable at normal zoom
+MIN_VISIBLE_FONT_SIZE = 2.0
+# Minimum luminance difference between a glyph and its background
+MIN_CONTRAST = 0.1
+# Two glyphs sharing more than this fraction of the smaller one's box overprint each other
+MAX_GLYPH_OVERLAP = 0.5
+# A gap wider than this fraction of the font size separates two words of a hidden run
+WORD_GAP = 0.2
+# Grid size (pt) for bucketing cells by bbox
+BUCKET_SIZE = 24.0
+
+PAGE_BACKGROUND = 1.0  # white paper
+
+REASON_TINY = "tiny"
+REASON_LOW_CONTRAST = "low_contrast"
+REASON_OFF_PAGE = "off_page"
+REASON_OVERLAPPING = "overlapping"
+
+Cell = Tuple[int, int, int]  # (table, row, column), in extractMeta table order
+BBox = Tuple[float, float, float, float]
+
+
+def _luminance(color: Any) -> Optional[float]:
+    """Relative luminance 0 (black) .. 1 (white) of a pdfplumber colour, None if unknown"""
+    if color is None:
+        return 0.0  # PDF default fill is black
+    if isinstance(color, (int, float)):
+        color = (color,)
+    if not isinstance(color, (tuple, list)) or not all(isinstance(c, (int, float)) for c in color):
+        return None  # pattern or named colour space
+    if len(color) == 1:
+        return float(color[0])
+    if len(color) == 3:
+        r, g, b = color
+        return 0.2126 * r + 0.7152 * g + 0.0722 * b
+    if len(color) == 4:
+        c, m, y, k = color
+        return _luminance(((1 - c) * (1 - k), (1 - m) * (1 - k), (1 - y) * (1 - k)))
+    return None
+
+
+def _contains(bbox: BBox, x: float, y: float) -> bool:
+    x0, top, x1, bottom = bbox
+    return x0 <= x <= x1 and top <= y <= bottom
+
+
+def _overlap_ratio(a: Dict[str, Any], b: Dict[str, Any]) -> float:
+    """Shared area of two glyph boxes over the smaller box"""
+    width = min(a["x1"], b["x1"]) - max(a["x0"], b["x0"])
+    height = min(a["bottom"], b["bottom"]) - max(a["top"], b["top"])
+    if width <= 0 or height <= 0:
+        return 0.0
+    smaller = min((a["x1"] - a["x0"]) * (a["bottom"] - a["top"]),
+                  (b["x1"] - b["x0"]) * (b["bottom"] - b["top"]))
+    return width * height / smaller if smaller > 0 else 0.0
+
+
+def _buckets(bbox: BBox):
+    x0, top, x1, bottom = bbox
+    for bx in range(int(x0 // BUCKET_SIZE), int(x1 // BUCKET_SIZE) + 1):
+        for by in range(int(top // BUCKET_SIZE), int(bottom // BUCKET_SIZE) + 1):
+            yield bx, by
+
+
+def _background(rects: Sequence[Dict[str, Any]], x: float, y: float) -> float:
+    """Luminance of the topmost filled rect under a point, else the paper"""
+    for rect in reversed(rects):
+        if _contains((rect["x0"], rect["top"], rect["x1"], rect["bottom"]), x, y):
+            luminance = _luminance(rect.get("non_stroking_color"))
+            if luminance is not None:
+                return luminance
+    return PAGE_BACKGROUND
+
+
+class _CellIndex:
+    """Cell bboxes of the timesheet tables, bucketed on a grid"""
+
+    def __init__(self, tables: Sequence[Any]):
+        self.bboxes: Dict[Cell, BBox] = {}
+        self._grid: Dict[Tuple[int, int], List[Cell]] = defaultdict(list)
+        for t, table in enumerate(tables):
+            for r, row in enumerate(table.rows):
+                for c, bbox in enumerate(row.cells):
+                    if bbox is None:
+                        continue
+                    self.bboxes[(t, r, c)] = bbox
+                    for key in _buckets(bbox):
+                        self._grid[key].append((t, r, c))
+
+    def find(self, x: float, y: float) -> Optional[Cell]:
+        for cell in self._grid.get((int(x // BUCKET_SIZE), int(y // BUCKET_SIZE)), ()):
+            if _contains(self.bboxes[cell], x, y):
+                return cell
+        return None
+
+
+def _hidden_runs(flagged: List[Tuple[Dict[str, Any], Optional[Cell], List[str]]]) -> Tuple[HiddenRun, ...]:
+    """Group consecutive hidden chars on the same line and in the same cell into runs"""
+    runs: List[Dict[str, Any]] = []
+    for char, cell, reasons in flagged:
+        last = runs[-1] if runs else None
+        gap = char["x0"] - last["bbox"][2] if last is not None else 0.0
+        if (last is not None and last["_cell"] == cell
+                and abs(last["_top"] - char["top"]) < 1.0
+                and -char["size"] / 2 <= gap < char["size"]):
+            # Spaces are not checked, so put back the ones between words
+            last["text"] += (" " if gap > char["size"] * WORD_GAP else "") + char["text"]
+            last["bbox"][2] = char["x1"]
+            last["bbox"][3] = max(last["bbox"][3], char["bottom"])
+            last["reasons"] = sorted(set(last["reasons"]) | set(reasons))
+            continue
+        runs.append({
+            "text": char["text"],
+            "bbox": [char["x0"], char["top"], char["x1"], char["bottom"]],
+            "reasons": sorted(reasons),
+            "_cell": cell,
+            "_top": char["top"],
+        })
+
+    return tuple(
+        HiddenRun(run["text"], tuple(round(v, 2) for v in run["bbox"]), tuple(run["reasons"]), run["_cell"])
+        for run in runs
+    )
+
+
+def detect_hidden_text(page, tables: Sequence[Any]) -> TextVisibility:
+    """
+    Check every glyph of the page for visibility.
+
+    `tables` are the pdfplumber Table objects extractMeta reads, in its order;
+    cells are reported as (table, row, column) indexes into them.
+    Returns a TextVisibility:
+        visible: True if no hidden glyph was found anywhere on the page
+        hidden_runs: hidden text grouped into runs, with bbox, reasons and cell
+        cells: per non-empty cell, a visibility flag and the fraction of its
+               glyphs that are visible (confidence)
+    """
+    index = _CellIndex(tables)
+    filled_rects = [rect for rect in page.rects if rect.get("fill")]
+    cell_backgrounds: Dict[Cell, float] = {}
+    cell_chars: Dict[Cell, List[Dict[str, Any]]] = defaultdict(list)
+    reasons_by_char: Dict[int, List[str]] = {}
+    page_bbox = page.bbox
+
+    for i, char in enumerate(page.chars):
+        if not char["text"].strip():
+            continue
+        reasons = []
+        x = (char["x0"] + char["x1"]) / 2
+        y = (char["top"] + char["bottom"]) / 2
+
+        if char["size"] < MIN_VISIBLE_FONT_SIZE:
+            reasons.append(REASON_TINY)
+        if not _contains(page_bbox, x, y):
+            reasons.append(REASON_OFF_PAGE)
+
+        cell = index.find(x, y)
+        if cell is not None:
+            background = cell_backgrounds.get(cell)
+            if background is None:
+                x0, top, x1, bottom = index.bboxes[cell]
+                background = cell_backgrounds[cell] = _background(filled_rects, (x0 + x1) / 2, (top + bottom) / 2)
+            char = dict(char, _index=i)
+            cell_chars[cell].append(char)
+        else:
+            background = _background(filled_rects, x, y)
+
+        luminance = _luminance(char.get("non_stroking_color"))
+        if luminance is not None and abs(luminance - background) < MIN_CONTRAST:
+            reasons.append(REASON_LOW_CONTRAST)
+        if reasons:
+            reasons_by_char[i] = reasons
+
+    # Overprinting only matters between glyphs of the same cell
+    for chars in cell_chars.values():
+        chars.sort(key=lambda ch: ch["x0"])
+        for j, a in enumerate(chars):
+            # Sweep: only glyphs starting before this one ends can overlap it
+            for b in chars[j + 1:]:
+                if b["x0"] >= a["x1"]:
+                    break
+                if _overlap_ratio(a, b) > MAX_GLYPH_OVERLAP:
+                    for ch in (a, b):
+                        reasons = reasons_by_char.setdefault(ch["_index"], [])
+                        if REASON_OVERLAPPING not in reasons:
+                            reasons.append(REASON_OVERLAPPING)
+
+    char_cells = {ch["_index"]: cell for cell, chars in cell_chars.items() for ch in chars}
+    flagged = [(page.chars[i], char_cells.get(i), reasons_by_char[i]) for i in sorted(reasons_by_char)]
+
+    cells = []
+    for cell in sorted(cell_chars):
+        chars = cell_chars[cell]
+        hidden = sum(1 for ch in chars if ch["_index"] in reasons_by_char)
+        cells.append(CellVisibility(cell, hidden == 0, round(1 - hidden / len(chars), 3)))
+
+    return TextVisibility(not reasons_by_char, _hidden_runs(flagged), tuple(cells))
+
+
+__all__ = ["detect_hidden_text"]
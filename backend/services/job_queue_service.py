@@ -0,0 +1,201 @@
+# backend/services/job_queue_service.py
+"""
+Extraction job queue
+--------------------
+
+A small SQLite-backed queue so extraction can run outside the request cycle:
+the API enqueues an uploaded PDF and returns a job id, and worker.py claims
+jobs, runs PdfExtractionService and stores the result.
+
+Job lifecycle: queued -> running -> done | failed
+
+Crash recovery: claiming a job gives the worker a lease of JOB_LEASE_SECONDS,
+which it renews while it works on the job. A running job whose lease has
+expired (the worker died or was OOM-killed) is put back in the queue, up to
+JOB_MAX_ATTEMPTS attempts, then marked failed. Renewing, completing and
+failing a job only succeed for the worker holding its lease, so a worker that
+lost its lease cannot overwrite the outcome of the one that took over.
+"""
+
+import json
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from config.config import JOB_QUEUE_PATH, JOB_MAX_ATTEMPTS, JOB_LEASE_SECONDS
+
+JOB_KINDS = ("meta", "pdf")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id            TEXT PRIMARY KEY,
+    kind          TEXT NOT NULL,
+    status        TEXT NOT NULL,
+    filename      TEXT NOT NULL,
+    file_path     TEXT NOT NULL,
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    worker_id     TEXT,
+    lease_expires REAL,
+    result        TEXT,
+    error         TEXT,
+    created_at    REAL NOT NULL,
+    started_at    REAL,
+    finished_at   REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at);
+"""
+
+
+class JobQueue:
+    """SQLite-backed extraction job queue shared by the API and the workers"""
+
+    def __init__(self, path: str = JOB_QUEUE_PATH, max_attempts: int = JOB_MAX_ATTEMPTS,
+                 lease_seconds: int = JOB_LEASE_SECONDS):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # One short-lived connection per operation: safe across threads and processes
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def enqueue(self, kind: str, filename: str, file_path: str) -> str:
+        """Add a job for an uploaded PDF already saved at file_path"""
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job type: {kind}")
+        job_id = uuid.uuid4().hex
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, filename, file_path, created_at) "
+                "VALUES (?, ?, 'queued', ?, ?, ?)",
+                (job_id, kind, filename, file_path, time.time()),
+            )
+        return job_id
+
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Take the oldest queued job and lease it to worker_id.
+        Expired leases are recovered first. Returns None when the queue is empty.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._recover_expired(conn, now)
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, worker_id = ?, "
+                    "lease_expires = ?, started_at = ? WHERE id = ?",
+                    (worker_id, now + self.lease_seconds, now, row["id"]),
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        job = dict(row)
+        job["attempts"] += 1
+        return job
+
+    def _recover_expired(self, conn, now: float) -> None:
+        """Requeue running jobs whose worker stopped renewing the lease"""
+        conn.execute(
+            "UPDATE jobs SET status = 'failed', error = 'Worker crashed too many times', "
+            "finished_at = ?, worker_id = NULL, lease_expires = NULL "
+            "WHERE status = 'running' AND lease_expires < ? AND attempts >= ?",
+            (now, now, self.max_attempts),
+        )
+        conn.execute(
+            "UPDATE jobs SET status = 'queued', worker_id = NULL, lease_expires = NULL "
+            "WHERE status = 'running' AND lease_expires < ?",
+            (now,),
+        )
+
+    def renew(self, job_id: str, worker_id: str) -> bool:
+        """Extend worker_id's lease on a running job; False if the lease was lost"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ? AND status = 'running' AND worker_id = ?",
+                (time.time() + self.lease_seconds, job_id, worker_id),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, Any]) -> bool:
+        """Store the result of worker_id's job; False (nothing stored) if the lease was lost"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'done', result = ?, error = NULL, finished_at = ?, "
+                "lease_expires = NULL WHERE id = ? AND status = 'running' AND worker_id = ?",
+                (json.dumps(result), time.time(), job_id, worker_id),
+            )
+        return cursor.rowcount == 1
+
+    def fail(self, job_id: str, worker_id: str, error: str, retry: bool = False) -> bool:
+        """
+        Mark worker_id's job failed, or put it back in the queue if retry is set and
+        attempts remain. False (nothing changed) if the lease was lost.
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = CASE WHEN ? AND attempts < ? THEN 'queued' ELSE 'failed' END, "
+                "error = ?, worker_id = NULL, lease_expires = NULL, "
+                "finished_at = CASE WHEN ? AND attempts < ? THEN NULL ELSE ? END "
+                "WHERE id = ? AND status = 'running' AND worker_id = ?",
+                (retry, self.max_attempts, error, retry, self.max_attempts, time.time(), job_id, worker_id),
+            )
+        return cursor.rowcount == 1
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Public view of a job, including its result once done"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = {
+            "job_id": row["id"],
+            "type": row["kind"],
+            "status": row["status"],
+            "filename": row["filename"],
+            "attempts": row["attempts"],
+            "created_at": row["created_at"],
+            "started_at": row["started_at"],
+            "finished_at": row["finished_at"],
+        }
+        if row["result"] is not None:
+            job["result"] = json.loads(row["result"])
+        if row["error"] is not None:
+            job["error"] = row["error"]
+        return job
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth per status and the age of the oldest queued job"""
+        with self._connect() as conn:
+            counts = dict(conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+            oldest = conn.execute("SELECT MIN(created_at) FROM jobs WHERE status = 'queued'").fetchone()[0]
+        return {
+            "queued": counts.get("queued", 0),
+            "running": counts.get("running", 0),
+            "done": counts.get("done", 0),
+            "failed": counts.get("failed", 0),
+            "oldest_queued_age_seconds": round(time.time() - oldest, 3) if oldest else 0.0,
+        }
@@ -0,0 +1,80 @@
+# backend/services/json_provider.py
+"""
+JSON provider
+-------------
+
+Flask's default provider encodes every response with the stdlib `json`
+module. When orjson is installed, OrjsonProvider encodes (and decodes request
+bodies) with it instead: several times faster on the extraction payloads, and
+the response body is written as bytes without a str round trip.
+
+Output matches the default provider's: keys sorted, compact (indented in debug
+mode), dates as HTTP dates, dataclasses as dicts. Non-ASCII text is written as
+UTF-8 rather than \\u escapes. Anything orjson refuses (integers beyond 64
+bits, mixed-type keys) falls back to the stdlib encoder, so both providers
+accept the same values.
+"""
+
+from typing import Any, Type
+
+from flask.json.provider import DefaultJSONProvider
+
+from config.config import JSON_FAST_ENCODER
+
+try:
+    import orjson
+except ImportError:  # optional: the stdlib encoder is used without it
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """DefaultJSONProvider with orjson doing the encoding and decoding"""
+
+    def _options(self, indent: bool) -> int:
+        # Dates and dataclasses go through `default`, as with the stdlib provider
+        options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def _encode(self, obj: Any, indent: bool) -> bytes:
+        return orjson.dumps(obj, default=self.default, option=self._options(indent))
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        # Arguments orjson has no equivalent for (cls, a custom default...) need the stdlib encoder
+        if set(kwargs) - {"indent", "separators"}:
+            return super().dumps(obj, **kwargs)
+        try:
+            return self._encode(obj, bool(kwargs.get("indent"))).decode()
+        except orjson.JSONEncodeError:
+            return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            # The stdlib parser accepts NaN/Infinity, and raises the usual error otherwise
+            return super().loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        try:
+            body = self._encode(obj, indent) + b"\n"
+        except orjson.JSONEncodeError:
+            return super().response(obj)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def json_provider_class() -> Type[DefaultJSONProvider]:
+    """OrjsonProvider when orjson is installed and JSON_FAST_ENCODER is on, else Flask's default"""
+    if orjson is not None and JSON_FAST_ENCODER:
+        return OrjsonProvider
+    return DefaultJSONProvider
+
+
+__all__ = ["OrjsonProvider", "json_provider_class"]
@@ -0,0 +1,269 @@
+# backend/services/metrics_service.py
+"""
+Metrics service
+---------------
+
+Minimal in-process instrumentation exposed in Prometheus text format on
+/metrics: counters, gauges and histograms with labels, timers around each
+extraction stage and every endpoint, and a histogram of upload sizes.
+
+With METRICS_ENABLED off, timers and observations return immediately and
+/metrics answers 404, so instrumented code paths cost next to nothing.
+
+Metrics are per process: under gunicorn each worker keeps its own values and
+a scrape is answered by whichever worker takes the request.
+"""
+
+import threading
+import time
+from contextlib import ContextDecorator
+from typing import Dict, List, Sequence, Tuple
+
+from config.config import METRICS_ENABLED
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (16 * 1024, 64 * 1024, 256 * 1024, 1024 * 1024, 4 * 1024 * 1024, 16 * 1024 * 1024)
+
+
+def _format_labels(labelnames: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        if not METRICS_ENABLED:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        if not METRICS_ENABLED:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts..., +Inf count], sum
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        if not METRICS_ENABLED:
+            return
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            counts, total = series
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+            total[0] += value
+
+    def time(self, **labels) -> "_Timer":
+        """Context manager / decorator observing the elapsed seconds"""
+        return _Timer(self, labels)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, (counts, total) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = f'le="{_format_value(bound)}"'
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(total[0])}")
+                lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class _Timer(ContextDecorator):
+    def __init__(self, histogram: Histogram, labels: Dict[str, str]):
+        self.histogram = histogram
+        self.labels = labels
+        self._starts = threading.local()
+
+    def __enter__(self):
+        if METRICS_ENABLED:
+            # A decorator reuses one timer across threads and recursive calls
+            stack = getattr(self._starts, "stack", None)
+            if stack is None:
+                stack = self._starts.stack = []
+            stack.append(time.perf_counter())
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if METRICS_ENABLED:
+            elapsed = time.perf_counter() - self._starts.stack.pop()
+            self.histogram.observe(elapsed, **self.labels)
+        return False
+
+
+class MetricsRegistry:
+    """Holds every metric of the process and renders them for /metrics"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+EXTRACTION_STAGE_SECONDS = registry.histogram(
+    "easyx_extraction_stage_seconds",
+    "Time spent in each PDF extraction stage",
+    labelnames=("stage",),
+)
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "easyx_http_request_duration_seconds",
+    "Time to produce a response, per endpoint (streamed bodies excluded)",
+    labelnames=("endpoint", "method", "status"),
+)
+UPLOAD_SIZE_BYTES = registry.histogram(
+    "easyx_upload_size_bytes",
+    "Size of multipart upload requests (PDFs and archives)",
+    labelnames=("endpoint",),
+    buckets=SIZE_BUCKETS,
+)
+
+PREFLIGHT_REJECTIONS = registry.counter(
+    "easyx_preflight_rejections_total",
+    "Uploads rejected by the pre-flight checks, by reason",
+    labelnames=("reason",),
+)
+
+EXTRACTION_ACTIVE = registry.gauge(
+    "easyx_extraction_active",
+    "PDF parses running in this process",
+)
+EXTRACTION_QUEUED = registry.gauge(
+    "easyx_extraction_queued",
+    "Requests waiting for a free parse slot",
+)
+ADMISSION_WAIT_SECONDS = registry.histogram(
+    "easyx_admission_wait_seconds",
+    "Time requests waited for a parse slot (admitted requests only)",
+)
+ADMISSION_REJECTIONS = registry.counter(
+    "easyx_admission_rejections_total",
+    "Requests answered 429 by the admission controller, by reason",
+    labelnames=("reason",),
+)
+
+DUPLICATE_UPLOADS = registry.counter(
+    "easyx_duplicate_uploads_total",
+    "Uploads matching a stored timesheet, by strongest match (exact, layout, content)",
+    labelnames=("match",),
+)
+
+
+def stage_timer(stage: str) -> _Timer:
+    """Time an extraction stage; usable as a context manager or a decorator"""
+    return EXTRACTION_STAGE_SECONDS.time(stage=stage)
+
+
+def init_app(app) -> None:
+    """Time every request and record upload sizes"""
+    if not METRICS_ENABLED:
+        return
+
+    from flask import g, request
+
+    @app.before_request
+    def _start_request_timer():
+        g._metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _observe_request(response):
+        start = getattr(g, "_metrics_start", None)
+        if start is not None:
+            endpoint = request.endpoint or "unmatched"
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - start,
+                endpoint=endpoint, method=request.method, status=str(response.status_code),
+            )
+            if request.mimetype == "multipart/form-data" and request.content_length:
+                UPLOAD_SIZE_BYTES.observe(request.content_length, endpoint=endpoint)
+        return response
@@ -0,0 +1,148 @@
+# backend/services/normalization.py
+"""
+Time and date normalization
+---------------------------
+
+The value conversions shared by PdfExtractionService and the timesheet checks:
+H:MM -> decimal hours, H:MM -> "7.5hrs", "11-Aug-25" -> ISO date, and hour
+strings such as "7.5hrs" -> float. `employee_key` is how employee names are
+compared wherever timesheets are grouped by employee.
+
+Timesheets repeat the same few values constantly ("7:30", "0:00", "8hrs"), so
+each conversion is memoized in a bounded LRU cache, and the patterns and month
+table are built once at import. Results are exactly those of the per-call
+implementations they replace, including the fallbacks for malformed input.
+
+Microbenchmarks: python -m benchmarks.bench_normalization
+"""
+
+import re
+from datetime import date
+from functools import lru_cache
+from typing import Any, Optional
+
+# Distinct values kept per conversion; a payroll run has far fewer
+NORMALIZATION_CACHE_SIZE = 4096
+
+MONTH_NUMBERS = {
+    'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04',
+    'May': '05', 'Jun': '06', 'Jul': '07', 'Aug': '08',
+    'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12'
+}
+
+HOUR_NUMBER_RE = re.compile(r"^\s*([0-9]+(?:\.[0-9]+)?)")
+
+
+def _memoized(convert):
+    """
+    LRU-cache a conversion of hashable values; anything else is converted directly.
+    typed: 1, 1.0 and True are distinct inputs ("1hrs", "1.0hrs", "Truehrs").
+    """
+    cached = lru_cache(maxsize=NORMALIZATION_CACHE_SIZE, typed=True)(convert)
+
+    def wrapper(value):
+        try:
+            return cached(value)
+        except TypeError:
+            # Unhashable input; the conversion itself handles it (usually as malformed)
+            return convert(value)
+
+    wrapper.cache_info = cached.cache_info
+    wrapper.cache_clear = cached.cache_clear
+    wrapper.__doc__ = convert.__doc__
+    wrapper.__name__ = convert.__name__
+    return wrapper
+
+
+@_memoized
+def time_to_decimal(time_str: Any) -> float:
+    """Convert time format (7:30) to decimal hours (7.5); 0.0 if malformed"""
+    try:
+        if ':' in time_str:
+            hours, minutes = map(int, time_str.split(':'))
+            return hours + minutes / 60
+        else:
+            return float(time_str) if time_str else 0.0
+    except Exception:
+        return 0.0
+
+
+@_memoized
+def time_to_hours_label(time_str: Any) -> str:
+    """Convert time format (7:30) to hours format (7.5hrs)"""
+    try:
+        if ':' in time_str:
+            hours, minutes = map(int, time_str.split(':'))
+            decimal_hours = hours + minutes / 60
+            return f"{decimal_hours:.1f}hrs"
+        elif 'hrs' in time_str.lower():
+            return time_str
+        else:
+            return f"{time_str}hrs"
+    except Exception:
+        return f"{time_str}hrs"
+
+
+@_memoized
+def date_to_iso(date_str: Any) -> str:
+    """Convert date format (11-Aug-25) to ISO format (2025-08-11); "Unknown" if malformed"""
+    try:
+        if '-' in date_str:
+            parts = date_str.split('-')
+            if len(parts) == 3:
+                day, month, year = parts
+                month_num = MONTH_NUMBERS.get(month, '01')
+                # Handle 2-digit year
+                if len(year) == 2:
+                    year = '20' + year
+                return f"{year}-{month_num}-{day.zfill(2)}"
+    except Exception:
+        pass
+    return "Unknown"
+
+
+@lru_cache(maxsize=NORMALIZATION_CACHE_SIZE, typed=True)
+def _parse_hour_string(s: str):
+    m = HOUR_NUMBER_RE.match(s.strip().lower())
+    return float(m.group(1)) if m else None
+
+
+def to_hours(v) -> float:
+    """
+    Normalize a value to a float number of hours.
+
+    Accepts:
+      - int/float (e.g., 8, 7.5)
+      - strings like "8", "8h", "8hrs", "7.5hrs"
+    Raises:
+      ValueError if unparsable or None.
+    """
+    if v is None:
+        raise ValueError("Empty hour value")
+    if isinstance(v, (int, float)):
+        return float(v)
+
+    hours = _parse_hour_string(v if isinstance(v, str) else str(v))
+    if hours is None:
+        raise ValueError(f"Unparsable hour: {v}")
+    return hours
+
+
+def parse_iso_date(value: Any) -> Optional[date]:
+    """date from an ISO string ("2025-08-11"); None if it does not parse"""
+    try:
+        return date.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def employee_key(name: Any) -> str:
+    """How employee names are compared: case and spacing ignored, empty for a missing or "Unknown" name"""
+    text = " ".join(str(name).split()) if name is not None else ""
+    return "" if text == "Unknown" else text.casefold()
+
+
+__all__ = [
+    "employee_key", "time_to_decimal", "time_to_hours_label", "date_to_iso", "to_hours", "parse_iso_date",
+    "MONTH_NUMBERS",
+]
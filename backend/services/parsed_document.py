@@ -0,0 +1,170 @@
+import hashlib
+import io
+import mmap
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from config.config import TEMPLATE_LAYOUT_MODE
+from services.template_layout_service import find_template_tables
+from services.metrics_service import stage_timer
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class ParsedDocument:
+    """
+    A PDF upload opened once and shared by every extractor.
+    The file is only opened by pdfplumber on first use, and page text, tables
+    and chars are computed on first use and reused afterwards.
+    """
+
+    def __init__(self, pdf_file_stream):
+        self._source = pdf_file_stream
+        self._pdf = None
+        self._content_hash = None
+        self._text: Dict[int, str] = {}
+        self._found_tables: Dict[int, list] = {}
+        self._tables: Dict[int, list] = {}
+        self._timesheet_tables: Dict[int, List[Tuple[Any, list]]] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Release the underlying pdfplumber document"""
+        if self._pdf is not None:
+            self._pdf.close()
+            self._pdf = None
+
+    @property
+    def pdf(self):
+        if self._pdf is None:
+            # Imported here so the app starts without loading pdfminer
+            import pdfplumber
+            with stage_timer("pdfplumber_open"):
+                self._pdf = pdfplumber.open(self._source)
+        return self._pdf
+
+    @property
+    def content_hash(self) -> str:
+        """SHA-256 of the raw PDF bytes, without moving the stream position"""
+        if self._content_hash is None:
+            self._content_hash = _hash_source(self._source)
+        return self._content_hash
+
+    @property
+    def pages(self) -> List[Any]:
+        return self.pdf.pages
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pdf.pages)
+
+    def page(self, page_index: int = 0):
+        """A page with its content stream interpreted, so later stages time only their own work"""
+        page = self.pdf.pages[page_index]
+        if not hasattr(page, '_objects'):
+            with stage_timer("page_parse"):
+                page.objects
+        return page
+
+    def text(self, page_index: int = 0) -> str:
+        """Text of a page, laid out once"""
+        if page_index not in self._text:
+            page = self.page(page_index)
+            with stage_timer("extract_text"):
+                self._text[page_index] = page.extract_text()
+        return self._text[page_index]
+
+    def iter_text(self, max_pages: Optional[int] = None) -> Iterator[str]:
+        """
+        Yield page text one page at a time.
+        Pages not already laid out by another extractor are flushed right after
+        their text is taken, and their text is not kept, so memory stays flat
+        however long the document is.
+        """
+        page_count = self.page_count if max_pages is None else min(max_pages, self.page_count)
+        for page_index in range(page_count):
+            if page_index in self._text:
+                yield self._text[page_index]
+                continue
+            page = self.page(page_index)
+            try:
+                with stage_timer("extract_text"):
+                    text = page.extract_text()
+            finally:
+                page.flush_cache()
+            yield text
+
+    def found_tables(self, page_index: int = 0) -> list:
+        """pdfplumber Table objects of a page (with cell bboxes), detected once"""
+        if page_index not in self._found_tables:
+            page = self.page(page_index)
+            with stage_timer("find_tables"):
+                self._found_tables[page_index] = page.find_tables()
+        return self._found_tables[page_index]
+
+    def tables(self, page_index: int = 0) -> list:
+        """Tables of a page, detected once"""
+        if page_index not in self._tables:
+            found = self.found_tables(page_index)
+            with stage_timer("extract_tables"):
+                self._tables[page_index] = [table.extract() for table in found]
+        return self._tables[page_index]
+
+    def _timesheet_table_pairs(self, page_index: int) -> List[Tuple[Any, list]]:
+        """
+        The timesheet tables of a page, in template order, as (Table, rows) pairs.
+        Cropped to the known template regions when a layout validates,
+        otherwise taken from the full-page scan.
+        """
+        if page_index not in self._timesheet_tables:
+            tables = None
+            if TEMPLATE_LAYOUT_MODE:
+                page = self.page(page_index)
+                with stage_timer("extract_template_tables"):
+                    tables = find_template_tables(page)
+            if tables is None:
+                tables = list(zip(self.found_tables(page_index), self.tables(page_index)))
+            self._timesheet_tables[page_index] = tables
+        return self._timesheet_tables[page_index]
+
+    def timesheet_tables(self, page_index: int = 0) -> list:
+        """Rows of the timesheet tables of a page, in template order"""
+        return [rows for _table, rows in self._timesheet_table_pairs(page_index)]
+
+    def timesheet_table_objects(self, page_index: int = 0) -> list:
+        """pdfplumber Table objects behind `timesheet_tables`, for cell bboxes"""
+        return [table for table, _rows in self._timesheet_table_pairs(page_index)]
+
+    def release(self, page_index: int) -> None:
+        """Drop everything cached for a page once no extractor needs it any more"""
+        for cache in (self._text, self._found_tables, self._tables, self._timesheet_tables):
+            cache.pop(page_index, None)
+        if self._pdf is not None:
+            self._pdf.pages[page_index].flush_cache()
+
+    def chars(self, page_index: int = 0) -> List[Dict[str, Any]]:
+        """Char objects of a page (cached by pdfplumber itself)"""
+        return self.page(page_index).chars
+
+
+def _hash_source(source) -> str:
+    """Hash a file path, a memory map or a seekable binary stream"""
+    digest = hashlib.sha256()
+    if isinstance(source, io.BytesIO):
+        digest.update(source.getbuffer())
+    elif isinstance(source, mmap.mmap):
+        digest.update(source)
+    elif hasattr(source, 'read'):
+        position = source.tell()
+        source.seek(0)
+        for chunk in iter(lambda: source.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+        source.seek(position)
+    else:
+        with open(source, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
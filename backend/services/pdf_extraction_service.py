@@ -1,269 +1,277 @@
-import pdfplumber
 import re
 import io
-from typing import Dict, Any
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, Tuple, Union
 from datetime import datetime
-from models.pdf_extraction_types import META_JSON_EXAMPLE
+from models.pdf_extraction_types import (
+    META_JSON_EXAMPLE, BaseInfo, EmployeeInfo, PdfExtractionMeta, Task, TotalsRow, WeeklyTotal, WorkEntry,
+)
+from services.parsed_document import ParsedDocument
+from services.extraction_cache import ExtractionCache
+from services.metrics_service import stage_timer
+from services.hidden_text_detector import detect_hidden_text
+from services.template_layout_service import matches_timesheet_signature
+from services.template_registry import TEMPLATE_REGISTRY, CompiledTemplate
+from services.normalization import date_to_iso, time_to_decimal, time_to_hours_label
+from config.config import PREVIEW_MAX_PAGES, PREVIEW_MAX_CHARS
+
+# Keys of the daily hours read for the legacy timesheet data, Monday first
+DAY_SHORT_KEYS = ('mon', 'tues', 'wed', 'thu', 'fri', 'sat', 'sun')
+
+def _page_operation(operation: str, page_index: int) -> str:
+    """Cache operation name for one page; page 0 keeps the single-page name"""
+    return operation if page_index == 0 else f"{operation}-page{page_index}"
+
+def is_error(result: Any) -> bool:
+    """True for the {"error": ...} dict extractors return instead of a record"""
+    return isinstance(result, dict) and "error" in result
 
 class PdfExtractionService:
     """Service for extracting data from PDF timesheet files"""
 
-    def extract_timesheet_data(self, pdf_file_stream) -> Dict[str, Any]:
+    def __init__(self, cache: Optional[ExtractionCache] = None):
+        self.cache = cache
+
+    @contextmanager
+    def _open_document(self, pdf_file):
+        """
+        Yield a ParsedDocument for either a file stream or an already parsed document.
+        Documents passed in by the caller are left open for the next extractor.
+        """
+        if isinstance(pdf_file, ParsedDocument):
+            yield pdf_file
+        else:
+            with ParsedDocument(pdf_file) as doc:
+                yield doc
+
+    def _cached(self, doc: ParsedDocument, operation: str, extractor: Callable[[ParsedDocument], Any],
+                record_type: Optional[type] = None) -> Any:
+        """
+        Run an extractor through the result cache, keyed by the PDF content hash.
+        Records of `record_type` are cached in their JSON form and rebuilt on a hit.
+        """
+        if self.cache is None:
+            return extractor(doc)
+
+        key = self.cache.make_key(doc.content_hash, operation)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return record_type.from_dict(cached) if record_type is not None else cached
+
+        result = extractor(doc)
+        # Never cache failures, so a fixed extractor gets a fresh attempt
+        if not is_error(result):
+            self.cache.put(key, result.to_dict() if record_type is not None else result)
+        return result
+
+    def extract_timesheet_data(self, pdf_file_stream, page_index: int = 0) -> Dict[str, Any]:
         """
-        Extracts timesheet data from a PDF file stream.
+        Extracts timesheet data from a PDF file stream or ParsedDocument.
         Returns structured JSON data based on the timesheet format.
         """
         try:
-            with pdfplumber.open(pdf_file_stream) as pdf:
-                page = pdf.pages[0]  # Assuming timesheet is on first page
-                text = page.extract_text()
-                tables = page.extract_tables()
-                
-                # Extract data based on the timesheet structure
-                extracted_data = {
-                    "timesheet_info": {
-                        "employee_name": self._extract_employee_name(tables),
-                        "week_worked": self._extract_week_worked(text),
-                        "status": "Processed"
-                    },
-                    "email_particulars": {
-                        "expected_email_address": self._extract_email_address(text),
-                        "expected_email_subject": self._extract_email_subject(text),
-                        "no_additional_attachments": True,
-                        "date_received_email_link": self._extract_date_received(text)
-                    },
-                    "contract_particulars": self._extract_contract_particulars(tables),
-                    "extracted_table_data": self._extract_table_data(tables, text)
-                }
-                
-                return extracted_data
+            with self._open_document(pdf_file_stream) as doc:
+                return self._cached(
+                    doc, _page_operation("timesheet_data", page_index),
+                    lambda d: self._build_timesheet_data(d, page_index),
+                )
                 
         except Exception as e:
             print(f"Error during PDF extraction: {e}")
             return {"error": str(e)}
 
-    def extractMeta(self, pdf_file_stream) -> Dict[str, Any]:
+    def extractMeta(self, pdf_file_stream, page_index: int = 0) -> Union[PdfExtractionMeta, Dict[str, Any]]:
         """
-        Extract structured meta data from PDF file stream.
-        Returns the complete meta JSON structure.
+        Extract structured meta data from PDF file stream or ParsedDocument.
+        Returns a PdfExtractionMeta (`to_dict()` gives the meta JSON structure),
+        or {"error": ...}.
         """
         try:
-            with pdfplumber.open(pdf_file_stream) as pdf:
-                page = pdf.pages[0]
-                text = page.extract_text()
-                tables = page.extract_tables()
-                
-                if not tables or len(tables) < 4:
-                    return {"error": "Invalid PDF structure - expected 4 tables"}
-                
-                # Extract base information from table 1
-                base_info = self._extract_base_info(tables[0])
-                
-                # Extract employee information from table 2
-                employee_info = self._extract_employee_info(tables[1])
-                
-                # Extract work entries from table 3
-                work_entries = self._extract_work_entries(tables[2])
-                
-                # Extract tasks and totals from table 4
-                tasks, totals_row, weekly_total = self._extract_tasks_and_totals(tables[3])
-                
-                # Extract date from text
-                date = self._extract_date(text)
-                
-                # Build the complete meta structure
-                meta_data = {
-                    "base": base_info,
-                    "employee": employee_info,
-                    "work_entries": work_entries,
-                    "weekly_total": weekly_total,
-                    "tasks": tasks,
-                    "totals_row": totals_row,
-                    "date": date
-                }
-                
-                return meta_data
+            with self._open_document(pdf_file_stream) as doc:
+                return self._cached(
+                    doc, _page_operation("meta", page_index),
+                    lambda d: self._build_meta(d, page_index),
+                    record_type=PdfExtractionMeta,
+                )
                 
         except Exception as e:
             print(f"Error during meta extraction: {e}")
             return {"error": str(e)}
 
+    def is_timesheet_page(self, doc: ParsedDocument, page_index: int) -> bool:
+        """True if the page carries the four tables of the timesheet template"""
+        return matches_timesheet_signature(doc.timesheet_tables(page_index))
+
+    def extract_meta_pages(self, pdf_file_stream, page_indexes: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+        """
+        Extract meta data from every timesheet page of a document (or of the given pages),
+        opening it once. Pages without the template signature are skipped.
+        Returns one record per timesheet page, in page order:
+          {"page_index": 0, "success": true, "meta_data": PdfExtractionMeta}
+          {"page_index": 3, "success": false, "error": "..."}
+        """
+        records = []
+        with self._open_document(pdf_file_stream) as doc:
+            if page_indexes is None:
+                page_indexes = range(doc.page_count)
+            for page_index in page_indexes:
+                try:
+                    if not self.is_timesheet_page(doc, page_index):
+                        doc.release(page_index)
+                        continue
+                except Exception as e:
+                    records.append({"page_index": page_index, "success": False, "error": str(e)})
+                    continue
+                meta_data = self.extractMeta(doc, page_index)
+                doc.release(page_index)
+                if is_error(meta_data):
+                    records.append({"page_index": page_index, "success": False, "error": meta_data["error"]})
+                else:
+                    records.append({"page_index": page_index, "success": True, "meta_data": meta_data})
+        return records
+
     def get_pdf_text(self, pdf_file_stream) -> str:
         """Extracts all text from PDF for preview purposes"""
         try:
-            with pdfplumber.open(pdf_file_stream) as pdf:
-                text = ""
-                for page in pdf.pages:
-                    text += page.extract_text() + "\n"
-                return text
+            with self._open_document(pdf_file_stream) as doc:
+                return self._cached(doc, "pdf_text", self._build_pdf_text)
         except Exception as e:
             return f"Error extracting text: {e}"
 
-    def _extract_base_info(self, table) -> Dict[str, str]:
-        """Extract base information from table 1"""
-        base_info = {
-            "po_number": "Unknown",
-            "client": "Unknown",
-            "supervisor": "Unknown"
-        }
+    def get_pdf_text_preview(self, pdf_file_stream, max_pages: int = PREVIEW_MAX_PAGES,
+                             max_chars: int = PREVIEW_MAX_CHARS) -> Dict[str, Any]:
+        """
+        Extracts a bounded text preview: at most max_pages pages and max_chars characters.
+        Pages past the budget are never laid out.
+        """
+        try:
+            with self._open_document(pdf_file_stream) as doc:
+                return self._cached(
+                    doc, f"pdf_text_preview-{max_pages}-{max_chars}",
+                    lambda d: self._build_pdf_text_preview(d, max_pages, max_chars),
+                )
+        except Exception as e:
+            return {"error": f"Error extracting text: {e}"}
+
+    def iter_pdf_text(self, pdf_file_stream) -> Iterator[str]:
+        """Yields the text of each page in turn, for streaming the full document"""
+        with self._open_document(pdf_file_stream) as doc:
+            for page_text in doc.iter_text():
+                yield page_text + "\n"
+
+    def _build_timesheet_data(self, doc: ParsedDocument, page_index: int = 0) -> Dict[str, Any]:
+        """Build the legacy timesheet data structure from one page of a parsed document"""
+        text = doc.text(page_index)
+        tables = doc.timesheet_tables(page_index)
         
-        for row in table:
-            if row and len(row) >= 2:
-                key = str(row[0]).lower().strip()
-                value = str(row[1]).strip()
-                
-                if 'po number' in key:
-                    base_info["po_number"] = value
-                elif 'client' in key:
-                    base_info["client"] = value
-                elif 'supervisor' in key:
-                    base_info["supervisor"] = value
+        # Extract data based on the timesheet structure
+        extracted_data = {
+            "timesheet_info": {
+                "employee_name": self._extract_employee_name(tables),
+                "week_worked": self._extract_week_worked(text),
+                "status": "Processed"
+            },
+            "email_particulars": {
+                "expected_email_address": self._extract_email_address(text),
+                "expected_email_subject": self._extract_email_subject(text),
+                "no_additional_attachments": True,
+                "date_received_email_link": self._extract_date_received(text)
+            },
+            "contract_particulars": self._extract_contract_particulars(tables),
+            "extracted_table_data": self._extract_table_data(tables, text)
+        }
         
-        return base_info
+        return extracted_data
 
-    def _extract_employee_info(self, table) -> Dict[str, str]:
-        """Extract employee information from table 2"""
-        employee_info = {
-            "name": "Unknown",
-            "company": "Unknown"
-        }
+    def _build_meta(self, doc: ParsedDocument, page_index: int = 0) -> Union[PdfExtractionMeta, Dict[str, Any]]:
+        """Build the complete meta structure from one page of a parsed document"""
+        text = doc.text(page_index)
+        tables = doc.timesheet_tables(page_index)
         
-        for row in table:
-            if row and len(row) >= 2:
-                key = str(row[0]).lower().strip()
-                value = str(row[1]).strip()
-                
-                if 'name' in key:
-                    employee_info["name"] = value
-                elif 'company' in key:
-                    employee_info["company"] = value
+        if not tables or len(tables) < 4:
+            return {"error": "Invalid PDF structure - expected 4 tables"}
         
-        return employee_info
-
-    def _extract_work_entries(self, table) -> list:
-        """Extract work entries from table 3"""
-        work_entries = []
+        # Pick the template whose signature the tables carry
+        template = self._select_template(tables)
         
-        # Skip header rows
-        data_rows = []
-        for row in table:
-            if row and len(row) >= 9:
-                first_cell = str(row[0]).strip().lower()
-                if first_cell in ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']:
-                    data_rows.append(row)
+        # Extract base information from table 1
+        base_info = self._extract_base_info(tables[0], template)
         
-        for row in data_rows:
-            weekday = str(row[0]).strip()
-            date_original = str(row[1]).strip()
-            
-            # Extract morning period
-            morning = {
-                "start": str(row[2]).strip(),
-                "finish": str(row[3]).strip(),
-                "time": str(row[4]).strip()
-            }
-            
-            # Extract afternoon period
-            afternoon = {
-                "start": str(row[5]).strip(),
-                "finish": str(row[6]).strip(),
-                "time": str(row[7]).strip()
-            }
-            
-            # Extract total daily hours
-            total_daily_hours = str(row[8]).strip()
-            total_daily_decimal = self._convert_time_to_decimal(total_daily_hours)
-            
-            # Extract extra in/out (default values)
-            extra_in_out = {
-                "morning": "0:00",
-                "afternoon": "0:00"
-            }
-            
-            # Convert date to ISO format
-            date_iso = self._convert_date_to_iso(date_original)
-            
-            work_entry = {
-                "weekday": weekday,
-                "date_original": date_original,
-                "date_iso": date_iso,
-                "morning": morning,
-                "afternoon": afternoon,
-                "extra_in_out": extra_in_out,
-                "total_daily_hours": total_daily_hours,
-                "total_daily_decimal": total_daily_decimal
-            }
-            
-            work_entries.append(work_entry)
+        # Extract employee information from table 2
+        employee_info = self._extract_employee_info(tables[1], template)
         
-        return work_entries
-
-    def _extract_tasks_and_totals(self, table) -> tuple:
-        """Extract tasks and totals from table 4"""
-        tasks = []
-        totals_row = {}
-        weekly_total = {"total_hours": "0:00", "total_decimal_hours": 0.0}
+        # Extract work entries from table 3
+        work_entries = self._extract_work_entries(tables[2], template)
         
-        # Find the task row (usually row 1)
-        task_row = None
-        totals_data = {}
+        # Extract tasks and totals from table 4
+        tasks, totals_row, weekly_total = self._extract_tasks_and_totals(tables[3], template)
         
-        for i, row in enumerate(table):
-            if not row:
-                continue
-            
-            first_cell = str(row[0]).strip()
-            
-            if first_cell == "Task1":
-                task_row = row
-            elif "Total Hours" in first_cell:
-                # This is the totals row
-                totals_data = {
-                    "Mon": str(row[1]).strip() if len(row) > 1 else "0:00",
-                    "Tues": str(row[2]).strip() if len(row) > 2 else "0:00",
-                    "Wed": str(row[3]).strip() if len(row) > 3 else "0:00",
-                    "Thur": str(row[4]).strip() if len(row) > 4 else "0:00",
-                    "Fri": str(row[5]).strip() if len(row) > 5 else "0:00",
-                    "Sat": str(row[6]).strip() if len(row) > 6 else "0:00",
-                    "Sun": str(row[6]).strip() if len(row) > 6 else "0:00"  # Same as Sat/Sun
-                }
-                
-                # Extract total hours
-                if len(row) > 7:
-                    total_hours = str(row[7]).strip()
-                    total_decimal = self._convert_time_to_decimal(total_hours)
-                    weekly_total = {
-                        "total_hours": total_hours,
-                        "total_decimal_hours": total_decimal
-                    }
+        # Extract date from text
+        date = self._extract_date(text)
         
-        # Build task information
-        if task_row:
-            task = {
-                "task_name": "Task1",
-                "per_day": {
-                    "Mon": str(task_row[1]).strip() if len(task_row) > 1 else "0:00",
-                    "Tues": str(task_row[2]).strip() if len(task_row) > 2 else "0:00",
-                    "Wed": str(task_row[3]).strip() if len(task_row) > 3 else "0:00",
-                    "Thur": str(task_row[4]).strip() if len(task_row) > 4 else "0:00",
-                    "Fri": str(task_row[5]).strip() if len(task_row) > 5 else "0:00",
-                    "Sat/Sun": str(task_row[6]).strip() if len(task_row) > 6 else "0:00"
-                },
-                "total_hours": weekly_total["total_hours"],
-                "decimal_hours": weekly_total["total_decimal_hours"]
-            }
-            tasks.append(task)
+        # Flag glyphs read from the page that a reader cannot see
+        with stage_timer("detect_hidden_text"):
+            text_visibility = detect_hidden_text(doc.page(page_index), doc.timesheet_table_objects(page_index)[:4])
         
-        # Build totals row
-        totals_row = {
-            "label": "Total Hours",
-            "by_day": totals_data,
-            "total_hours": weekly_total["total_hours"],
-            "total_decimal_hours": weekly_total["total_decimal_hours"]
+        # Build the complete meta structure
+        return PdfExtractionMeta(
+            base=base_info,
+            employee=employee_info,
+            work_entries=work_entries,
+            weekly_total=weekly_total,
+            tasks=tasks,
+            totals_row=totals_row,
+            date=date,
+            text_visibility=text_visibility,
+        )
+
+    def _build_pdf_text(self, doc: ParsedDocument) -> str:
+        """Concatenate the text of every page"""
+        return "".join(page_text + "\n" for page_text in doc.iter_text())
+
+    def _build_pdf_text_preview(self, doc: ParsedDocument, max_pages: int, max_chars: int) -> Dict[str, Any]:
+        """Concatenate page text until the page or character budget runs out"""
+        parts = []
+        length = 0
+        pages_read = 0
+        for page_text in doc.iter_text(max_pages=max_pages):
+            parts.append(page_text + "\n")
+            length += len(parts[-1])
+            pages_read += 1
+            if length >= max_chars:
+                break
+        return {
+            "text": "".join(parts)[:max_chars],
+            "truncated": length > max_chars or pages_read < doc.page_count,
+            "page_count": doc.page_count,
         }
-        
-        return tasks, totals_row, weekly_total
 
+    def _select_template(self, tables) -> CompiledTemplate:
+        """Template whose signature the tables carry; the default one if none does"""
+        return TEMPLATE_REGISTRY.select(tables) or TEMPLATE_REGISTRY.default
+
+    @stage_timer("extract_base_info")
+    def _extract_base_info(self, table, template: Optional[CompiledTemplate] = None) -> BaseInfo:
+        """Extract base information from table 1"""
+        return (template or TEMPLATE_REGISTRY.default).extract_base(table)
+
+    @stage_timer("extract_employee_info")
+    def _extract_employee_info(self, table, template: Optional[CompiledTemplate] = None) -> EmployeeInfo:
+        """Extract employee information from table 2"""
+        return (template or TEMPLATE_REGISTRY.default).extract_employee(table)
+
+    @stage_timer("extract_work_entries")
+    def _extract_work_entries(self, table, template: Optional[CompiledTemplate] = None) -> Tuple[WorkEntry, ...]:
+        """Extract work entries from table 3"""
+        return (template or TEMPLATE_REGISTRY.default).extract_work_entries(table)
+
+    @stage_timer("extract_tasks_and_totals")
+    def _extract_tasks_and_totals(self, table, template: Optional[CompiledTemplate] = None
+                                  ) -> Tuple[Tuple[Task, ...], TotalsRow, WeeklyTotal]:
+        """Extract tasks and totals from table 4"""
+        return (template or TEMPLATE_REGISTRY.default).extract_tasks_and_totals(table)
+
+    @stage_timer("extract_date")
     def _extract_date(self, text: str) -> str:
         """Extract date from text"""
         # Look for date patterns like "8/15/2025"
@@ -282,37 +290,11 @@ class PdfExtractionService:
 
     def _convert_time_to_decimal(self, time_str: str) -> float:
         """Convert time format (7:30) to decimal hours (7.5)"""
-        try:
-            if ':' in time_str:
-                hours, minutes = map(int, time_str.split(':'))
-                return hours + minutes / 60
-            else:
-                return float(time_str) if time_str else 0.0
-        except:
-            return 0.0
+        return time_to_decimal(time_str)
 
     def _convert_date_to_iso(self, date_str: str) -> str:
         """Convert date format (11-Aug-25) to ISO format (2025-08-11)"""
-        try:
-            # Handle format like "11-Aug-25"
-            if '-' in date_str:
-                parts = date_str.split('-')
-                if len(parts) == 3:
-                    day, month, year = parts
-                    # Convert month name to number
-                    month_map = {
-                        'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04',
-                        'May': '05', 'Jun': '06', 'Jul': '07', 'Aug': '08',
-                        'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12'
-                    }
-                    month_num = month_map.get(month, '01')
-                    # Handle 2-digit year
-                    if len(year) == 2:
-                        year = '20' + year
-                    return f"{year}-{month_num}-{day.zfill(2)}"
-        except:
-            pass
-        return "Unknown"
+        return date_to_iso(date_str)
 
     # Legacy methods for backward compatibility
     def _extract_employee_name(self, tables) -> str:
@@ -365,6 +347,7 @@ class PdfExtractionService:
             return f"{match.group(1)}, link_to_email_here"
         return "Unknown, link_to_email_here"
 
+    @stage_timer("extract_contract_particulars")
     def _extract_contract_particulars(self, tables) -> Dict[str, str]:
         """Extract contract particulars from tables"""
         contract_info = {
@@ -400,14 +383,16 @@ class PdfExtractionService:
         
         return contract_info
 
+    @stage_timer("extract_table_data")
     def _extract_table_data(self, tables, text: str) -> list:
         """Extract table data from PDF using pdfplumber's table extraction"""
         table_data = []
         
         try:
             if tables and len(tables) >= 4:
-                daily_hours = self._extract_daily_hours_from_work_periods_table(tables[2])
-                total_hours = self._extract_total_hours_from_task_summary_table(tables[3])
+                template = self._select_template(tables)
+                daily_hours = self._extract_daily_hours_from_work_periods_table(tables[2], template)
+                total_hours = self._extract_total_hours_from_task_summary_table(tables[3], template)
                 
                 if daily_hours:
                     week_info = self._extract_week_worked(text)
@@ -454,28 +439,22 @@ class PdfExtractionService:
         
         return table_data
 
-    def _extract_daily_hours_from_work_periods_table(self, table) -> dict:
+    def _extract_daily_hours_from_work_periods_table(self, table, template: Optional[CompiledTemplate] = None) -> dict:
         """Extract daily hours from the work periods table (table 3)"""
         daily_hours = {}
+        work_periods = (template or TEMPLATE_REGISTRY.default).template.work_periods
+        columns = work_periods.columns
+        # The template's day labels, Monday first, by position
+        day_mapping = dict(zip((weekday.strip().lower() for weekday in work_periods.weekdays), DAY_SHORT_KEYS))
         
         try:
-            total_daily_col_index = 8
+            total_daily_col_index = columns.total_daily
             
             for row in table:
-                if not row or len(row) <= total_daily_col_index:
+                if not row or len(row) <= max(total_daily_col_index, columns.weekday):
                     continue
                 
-                first_cell = str(row[0]).strip().lower()
-                
-                day_mapping = {
-                    'monday': 'mon',
-                    'tuesday': 'tues', 
-                    'wednesday': 'wed',
-                    'thursday': 'thu',
-                    'friday': 'fri',
-                    'saturday': 'sat',
-                    'sunday': 'sun'
-                }
+                first_cell = str(row[columns.weekday]).strip().lower()
                 
                 if first_cell in day_mapping:
                     day_short = day_mapping[first_cell]
@@ -492,19 +471,21 @@ class PdfExtractionService:
         
         return daily_hours
 
-    def _extract_total_hours_from_task_summary_table(self, table) -> str:
+    def _extract_total_hours_from_task_summary_table(self, table, template: Optional[CompiledTemplate] = None) -> str:
         """Extract total hours from the task summary table (table 4)"""
         total_hours = None
+        summary = (template or TEMPLATE_REGISTRY.default).template.task_summary
+        totals_label = summary.totals_label.lower()
         
         try:
             for row in table:
-                if not row:
+                if not row or len(row) <= summary.label_column:
                     continue
                 
-                first_cell = str(row[0]).strip().lower()
-                if 'total hours' in first_cell:
-                    if len(row) > 7:
-                        total_cell = row[7]
+                first_cell = str(row[summary.label_column]).strip().lower()
+                if totals_label in first_cell:
+                    if len(row) > summary.total_column:
+                        total_cell = row[summary.total_column]
                         if total_cell:
                             time_value = str(total_cell).strip()
                             if re.search(r'\d+:\d+', time_value):
@@ -518,17 +499,7 @@ class PdfExtractionService:
 
     def _convert_time_to_hours(self, time_str: str) -> str:
         """Convert time format (7:30) to hours format (7.5hrs)"""
-        try:
-            if ':' in time_str:
-                hours, minutes = map(int, time_str.split(':'))
-                decimal_hours = hours + minutes / 60
-                return f"{decimal_hours:.1f}hrs"
-            elif 'hrs' in time_str.lower():
-                return time_str
-            else:
-                return f"{time_str}hrs"
-        except:
-            return f"{time_str}hrs"
+        return time_to_hours_label(time_str)
 
     def _extract_from_text(self, text: str) -> list:
         """Fallback method to extract data from text when tables are not available"""
@@ -0,0 +1,216 @@
+# backend/services/preflight_service.py
+"""
+PDF pre-flight checks
+---------------------
+
+Rejects uploads that cannot be a timesheet before any pdfplumber work is done.
+Checks, cheapest first: the %PDF- header, that the file opens, the page count,
+the page size, and a text probe for the template keywords ("PO Number",
+"Total Hours" for the built-in template).
+
+Keywords and page sizes come from the template registry, so a format added
+through TEMPLATE_DEFINITIONS_FILE passes with its own labels (its base table's
+first label and its totals label) on its own layouts' page sizes.
+
+The probe reads page text with PDFium (already installed with pdfplumber),
+which takes a few milliseconds per page, where pdfminer's page interpretation
+alone takes over a hundred.
+"""
+
+import mmap
+import os
+import re
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+from config.config import PREFLIGHT_ENABLED, PREFLIGHT_MAX_PAGES
+from services.metrics_service import PREFLIGHT_REJECTIONS, stage_timer
+from services.template_registry import TEMPLATE_REGISTRY
+
+# The header may follow some junk bytes, but must appear within the first KB
+HEADER_WINDOW = 1024
+
+# Portrait page sizes (pt) a timesheet can be printed on, plus those of the template layouts
+PAGE_SIZES = {
+    "A4": (595.28, 841.89),
+    "Letter": (612.0, 792.0),
+    **{
+        f"{template.name}/{layout.name}": (layout.page_width, layout.page_height)
+        for template in TEMPLATE_REGISTRY for layout in template.layouts
+    },
+}
+PAGE_SIZE_TOLERANCE = 0.03
+
+# Keywords of each registered template; a page passes with every keyword of one template.
+# Compared with whitespace removed and case folded
+TEMPLATE_KEYWORDS: Tuple[Tuple[str, ...], ...] = tuple(dict.fromkeys(
+    template.keywords for template in TEMPLATE_REGISTRY
+))
+
+REASON_NOT_PDF = "not_pdf"
+REASON_UNREADABLE = "unreadable"
+REASON_NO_PAGES = "no_pages"
+REASON_TOO_MANY_PAGES = "too_many_pages"
+REASON_PAGE_SIZE = "page_size"
+REASON_MISSING_KEYWORDS = "missing_keywords"
+
+# PDFium is not thread-safe, and gunicorn runs threaded workers
+_pdfium_lock = threading.Lock()
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class _MappedReader:
+    """File interface over a memory map, as PDFium's stream reader expects it"""
+
+    def __init__(self, mapped: mmap.mmap):
+        self._mapped = mapped
+        self._position = 0
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        base = {os.SEEK_SET: 0, os.SEEK_CUR: self._position, os.SEEK_END: len(self._mapped)}[whence]
+        self._position = base + offset
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._mapped) if size < 0 else self._position + size
+        data = self._mapped[self._position:end]
+        self._position += len(data)
+        return data
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def _read_head(source, size: int) -> bytes:
+    """First bytes of a path, bytes or seekable stream, without moving the stream"""
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source[:size])
+    if isinstance(source, mmap.mmap):
+        return source[:size]
+    if hasattr(source, 'read'):
+        position = source.tell()
+        source.seek(0)
+        head = source.read(size)
+        source.seek(position)
+        return head
+    with open(source, 'rb') as f:
+        return f.read(size)
+
+
+def _normalize(text: str) -> str:
+    return _WHITESPACE.sub("", text).casefold()
+
+
+def _normalized_keywords() -> Tuple[Tuple[str, ...], ...]:
+    return tuple(tuple(_normalize(keyword) for keyword in keywords) for keywords in TEMPLATE_KEYWORDS)
+
+
+def _page_size_ok(width: float, height: float) -> bool:
+    return any(
+        abs(width - w) <= w * PAGE_SIZE_TOLERANCE and abs(height - h) <= h * PAGE_SIZE_TOLERANCE
+        for w, h in PAGE_SIZES.values()
+    )
+
+
+def _rejection(reason: str, message: str) -> Dict[str, str]:
+    PREFLIGHT_REJECTIONS.inc(reason=reason)
+    return {"error": f"Not a timesheet PDF: {message}", "reason": reason}
+
+
+_NORMALIZED_KEYWORDS = _normalized_keywords()
+
+
+@contextmanager
+def pdfium_source(source):
+    """
+    A path, bytes, memory map or seekable stream in a form PDFium opens, with
+    the PDFium lock held for the block
+    """
+    # PDFium reads streams through their own position; put it back afterwards
+    position = None
+    if isinstance(source, mmap.mmap):
+        pdfium_input = _MappedReader(source)
+    elif hasattr(source, 'read'):
+        pdfium_input, position = source, source.tell()
+    else:
+        pdfium_input = source
+
+    with _pdfium_lock:
+        try:
+            yield pdfium_input
+        finally:
+            if position is not None:
+                source.seek(position)
+
+
+def _check(source, probe_pages: int) -> Optional[Dict[str, str]]:
+    if b"%PDF-" not in _read_head(source, HEADER_WINDOW):
+        return _rejection(REASON_NOT_PDF, "the file has no PDF header")
+
+    with pdfium_source(source) as pdfium_input:
+        return _probe(pdfium_input, probe_pages)
+
+
+def _probe(pdfium_input, probe_pages: int) -> Optional[Dict[str, str]]:
+    # Imported on the first upload rather than at app start
+    import pypdfium2 as pdfium
+    try:
+        pdf = pdfium.PdfDocument(pdfium_input)
+    except pdfium.PdfiumError as e:
+        return _rejection(REASON_UNREADABLE, f"the PDF cannot be opened ({e})")
+    try:
+        page_count = len(pdf)
+        if page_count == 0:
+            return _rejection(REASON_NO_PAGES, "the PDF has no pages")
+        if page_count > PREFLIGHT_MAX_PAGES:
+            return _rejection(REASON_TOO_MANY_PAGES,
+                              f"{page_count} pages, more than the limit of {PREFLIGHT_MAX_PAGES}")
+
+        size_ok = False
+        keyword_sets = _NORMALIZED_KEYWORDS
+        for page_index in range(min(probe_pages, page_count)):
+            page = pdf[page_index]
+            try:
+                if not _page_size_ok(*page.get_size()):
+                    continue
+                size_ok = True
+                textpage = page.get_textpage()
+                try:
+                    text = _normalize(textpage.get_text_range())
+                finally:
+                    textpage.close()
+            finally:
+                page.close()
+            if any(all(keyword in text for keyword in keywords) for keywords in keyword_sets):
+                return None
+
+        if not size_ok:
+            return _rejection(REASON_PAGE_SIZE, "the page size is not A4 or Letter portrait, nor that of a template layout")
+        return _rejection(REASON_MISSING_KEYWORDS, "no probed page mentions " + " or ".join(
+            " and ".join(keywords) for keywords in TEMPLATE_KEYWORDS
+        ))
+    finally:
+        pdf.close()
+
+
+def preflight_pdf(source, probe_pages: int = 1) -> Optional[Dict[str, str]]:
+    """
+    Cheap checks that a PDF (path, bytes or seekable stream) can be a timesheet.
+    Returns None if it passes, or {"error": message, "reason": code}.
+    The keyword probe passes if any of the first `probe_pages` pages carries
+    every keyword on an accepted page size.
+    """
+    if not PREFLIGHT_ENABLED:
+        return None
+    with stage_timer("preflight"):
+        return _check(source, probe_pages)
+
+
+__all__ = ["pdfium_source", "preflight_pdf"]
@@ -0,0 +1,321 @@
+# backend/services/reconciliation_service.py
+"""
+Pay-period reconciliation
+-------------------------
+
+`check_timesheet_rows` compares one week with one expected record. This
+reconciles a whole pay period at once. Every extracted timesheet
+(an extractMeta result) and every expected schedule is reduced to a key
+(employee, PO number, ISO year, ISO week). Both sides are sorted by that key
+and walked in a single merge pass, which reports:
+
+- for each submitted week: the schedule it matches, if any, with the total
+  and per-day hour deltas against it, and the change from the same
+  employee/PO's previous submitted week;
+- scheduled weeks nobody submitted (`missing`);
+- several timesheets, or schedules, for one employee, PO and week (`duplicates`);
+- timesheets of the same employee and PO whose date ranges overlap across
+  weeks (`overlaps`), e.g. a Wednesday-to-Tuesday sheet after a
+  Monday-to-Sunday one;
+- timesheets or schedules without an employee, PO or dates (`invalid`).
+
+Employee names match regardless of case and spacing. Sorting is the only
+non-linear step and there are no per-item lookups, so 10k timesheets
+reconcile well within a second (python -m benchmarks.bench_reconciliation).
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from services.normalization import date_to_iso, parse_iso_date, time_to_decimal, to_hours
+from services.timesheet_check_service import DAY_LABELS
+
+DAY_KEYS = [short_key for short_key, _label in DAY_LABELS]
+
+# What extractMeta reports for a field it could not read
+_UNKNOWN = "Unknown"
+
+
+@dataclass(frozen=True, slots=True)
+class _Week:
+    """A timesheet or schedule reduced to what reconciliation compares"""
+    key: Tuple[str, str, int, int]  # (employee casefolded, PO, ISO year, ISO week)
+    ref: Any                        # timesheet id, or index of the schedule
+    employee: str
+    po_number: str
+    start: date
+    end: date
+    days: Tuple[float, ...]         # hours Mon..Sun
+    total: float
+
+
+_ORDER = attrgetter("key", "start", "end")
+
+
+def _text(value: Any) -> str:
+    text = " ".join(str(value).split()) if value is not None else ""
+    return "" if text == _UNKNOWN else text
+
+
+def _object(record: Dict[str, Any], name: str) -> Optional[Dict[str, Any]]:
+    """record[name] if it is an object ({} when missing), else None"""
+    value = record.get(name)
+    if value is None:
+        return {}
+    return value if isinstance(value, dict) else None
+
+
+def _is_value(value: Any) -> bool:
+    return not isinstance(value, (dict, list, tuple))
+
+
+def _key(employee: str, po_number: str, start: date) -> Tuple[str, str, int, int]:
+    year, week, _weekday = start.isocalendar()
+    return employee.casefold(), po_number, year, week
+
+
+def _entry_hours(entry: Dict[str, Any]) -> float:
+    hours = entry.get("total_daily_decimal")
+    if isinstance(hours, (int, float)) and not isinstance(hours, bool):
+        return float(hours)
+    return time_to_decimal(entry.get("total_daily_hours") or "")
+
+
+def _extracted_week(ref: Any, meta: Any) -> Union[_Week, str]:
+    """The _Week of an extractMeta result, or why it has none"""
+    if not isinstance(meta, dict):
+        return "not an extraction result"
+    sections = {name: _object(meta, name) for name in ("employee", "base", "weekly_total")}
+    for name, section in sections.items():
+        if section is None:
+            return f"{name} is not an object"
+    entries = meta.get("work_entries") or ()
+    if not isinstance(entries, (list, tuple)):
+        return "work_entries is not a list"
+    name, po_number = sections["employee"].get("name"), sections["base"].get("po_number")
+    if not _is_value(name) or not _is_value(po_number):
+        return "employee name or PO number is not a value"
+    employee, po_number = _text(name), _text(po_number)
+    if not employee:
+        return "no employee name"
+    if not po_number:
+        return "no PO number"
+
+    days = [0.0] * 7
+    dates = []
+    for entry in entries:
+        day = parse_iso_date(entry.get("date_iso")) if isinstance(entry, dict) else None
+        if day is not None:
+            dates.append(day)
+            days[day.weekday()] += _entry_hours(entry)
+    if not dates:
+        return "no dated work entries"
+
+    total = sections["weekly_total"].get("total_decimal_hours")
+    if not isinstance(total, (int, float)) or isinstance(total, bool):
+        total = sum(days)
+    start = min(dates)
+    return _Week(_key(employee, po_number, start), ref, employee, po_number,
+                 start, max(dates), tuple(days), float(total))
+
+
+def _schedule_start(schedule: Dict[str, Any]) -> Optional[date]:
+    """week_start (ISO), else the first date of week_worked ("11-Aug-25 to 17-Aug-25")"""
+    if schedule.get("week_start"):
+        return parse_iso_date(schedule["week_start"])
+    week_worked = schedule.get("week_worked")
+    if isinstance(week_worked, str) and week_worked.strip():
+        return parse_iso_date(date_to_iso(week_worked.split(" to ")[0].strip()))
+    return None
+
+
+def _expected_week(ref: Any, schedule: Any) -> Union[_Week, str]:
+    """The _Week of an expected schedule (TimesheetExpected fields), or why it has none"""
+    if not isinstance(schedule, dict):
+        return "not a schedule"
+    if not all(_is_value(schedule.get(name)) for name in ("employee_name", "po_number", "week_start", "week_worked")):
+        return "employee_name, po_number, week_start or week_worked is not a value"
+    employee = _text(schedule.get("employee_name"))
+    po_number = _text(schedule.get("po_number"))
+    if not employee:
+        return "no employee name"
+    if not po_number:
+        return "no PO number"
+    start = _schedule_start(schedule)
+    if start is None:
+        return "no week_start or week_worked date"
+
+    hours = _object(schedule, "hours")
+    if hours is None:
+        return "hours is not an object"
+    try:
+        days = tuple(to_hours(hours[short_key]) if short_key in hours else 0.0 for short_key in DAY_KEYS)
+        total = to_hours(schedule["total_hours"]) if schedule.get("total_hours") is not None else sum(days)
+    except ValueError as e:
+        return str(e)
+    return _Week(_key(employee, po_number, start), ref, employee, po_number,
+                 start, start + timedelta(days=6), days, total)
+
+
+def _summarize(items: Iterable[Tuple[Any, Any]], reduce, side: str,
+               invalid: List[Dict[str, Any]]) -> List[_Week]:
+    weeks = []
+    for ref, item in items:
+        week = reduce(ref, item)
+        if isinstance(week, str):
+            invalid.append({"side": side, "ref": ref, "reason": week})
+        else:
+            weeks.append(week)
+    weeks.sort(key=_ORDER)
+    return weeks
+
+
+def _hours(value: float) -> float:
+    return round(value, 2)
+
+
+def _label(week: _Week) -> Dict[str, Any]:
+    return {
+        "employee_name": week.employee,
+        "po_number": week.po_number,
+        "week": f"{week.key[2]}-W{week.key[3]:02d}",
+    }
+
+
+def _runs(weeks: Sequence[_Week]) -> Iterable[Sequence[_Week]]:
+    """Consecutive runs of equal keys in a sorted list"""
+    start = 0
+    for index in range(1, len(weeks) + 1):
+        if index == len(weeks) or weeks[index].key != weeks[start].key:
+            yield weeks[start:index]
+            start = index
+
+
+def _duplicate(side: str, run: Sequence[_Week]) -> Dict[str, Any]:
+    first = run[0]
+    return dict(
+        _label(first),
+        side=side,
+        refs=[week.ref for week in run],
+        identical=all(week.days == first.days and week.total == first.total for week in run),
+    )
+
+
+def _week_result(submitted: _Week, count: int, schedule: Optional[_Week],
+                 previous: Optional[_Week]) -> Dict[str, Any]:
+    result = dict(
+        _label(submitted),
+        timesheet_id=submitted.ref,
+        week_start=submitted.start.isoformat(),
+        week_end=submitted.end.isoformat(),
+        submissions=count,
+        total_hours=_hours(submitted.total),
+        status="matched" if schedule else "unexpected",
+        expected_total_hours=None,
+        total_delta=None,
+        day_deltas=None,
+        previous=None,
+        week_over_week_delta=None,
+    )
+    if schedule:
+        result["expected_total_hours"] = _hours(schedule.total)
+        result["total_delta"] = _hours(submitted.total - schedule.total)
+        result["day_deltas"] = {
+            short_key: _hours(hours - expected)
+            for short_key, hours, expected in zip(DAY_KEYS, submitted.days, schedule.days)
+        }
+    if previous:
+        result["previous"] = dict(_label(previous), timesheet_id=previous.ref,
+                                  total_hours=_hours(previous.total))
+        result["week_over_week_delta"] = _hours(submitted.total - previous.total)
+    return result
+
+
+def _missing(schedule: _Week) -> Dict[str, Any]:
+    return dict(_label(schedule), schedule=schedule.ref, expected_total_hours=_hours(schedule.total))
+
+
+def reconcile(extracted: Iterable[Tuple[Any, Dict[str, Any]]],
+              expected: Iterable[Tuple[Any, Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Reconcile a pay period of (timesheet id, extractMeta result) pairs with
+    (schedule ref, expected schedule) pairs. A schedule has the TimesheetExpected
+    fields: employee_name, po_number, week_start (ISO date) or week_worked,
+    hours ({"Mon": "8hrs", ...}) and total_hours.
+    Returns {"summary", "weeks", "missing", "duplicates", "overlaps", "invalid"};
+    weeks and missing are ordered by employee, PO and week.
+    """
+    invalid: List[Dict[str, Any]] = []
+    submitted = _summarize(extracted, _extracted_week, "extracted", invalid)
+    scheduled = list(_runs(_summarize(expected, _expected_week, "expected", invalid)))
+
+    weeks: List[Dict[str, Any]] = []
+    missing: List[Dict[str, Any]] = []
+    duplicates: List[Dict[str, Any]] = []
+    overlaps: List[Dict[str, Any]] = []
+
+    position = 0
+    previous: Optional[_Week] = None  # last week of the current employee/PO
+    reach: Optional[_Week] = None     # its week ending latest so far
+
+    def take_schedule() -> Sequence[_Week]:
+        nonlocal position
+        run = scheduled[position]
+        position += 1
+        if len(run) > 1:
+            duplicates.append(_duplicate("expected", run))
+        return run
+
+    for run in _runs(submitted):
+        first = run[0]
+        while position < len(scheduled) and scheduled[position][0].key < first.key:
+            missing.append(_missing(take_schedule()[0]))
+        schedule = None
+        if position < len(scheduled) and scheduled[position][0].key == first.key:
+            schedule = take_schedule()[0]
+
+        if previous is None or previous.key[:2] != first.key[:2]:
+            previous = reach = None
+        for week in run:
+            if reach is not None and week.start <= reach.end:
+                overlaps.append(dict(
+                    _label(week),
+                    timesheet_ids=[reach.ref, week.ref],
+                    overlap_start=week.start.isoformat(),
+                    overlap_end=min(week.end, reach.end).isoformat(),
+                ))
+        latest = max(run, key=attrgetter("end"))
+        if reach is None or latest.end > reach.end:
+            reach = latest
+
+        if len(run) > 1:
+            duplicates.append(_duplicate("extracted", run))
+        weeks.append(_week_result(first, len(run), schedule, previous))
+        previous = first
+
+    while position < len(scheduled):
+        missing.append(_missing(take_schedule()[0]))
+
+    return {
+        "summary": {
+            "timesheets": len(submitted),
+            "schedules": sum(len(run) for run in scheduled),
+            "weeks": len(weeks),
+            "matched": sum(1 for week in weeks if week["status"] == "matched"),
+            "unexpected": sum(1 for week in weeks if week["status"] == "unexpected"),
+            "missing": len(missing),
+            "duplicates": len(duplicates),
+            "overlaps": len(overlaps),
+            "invalid": len(invalid),
+        },
+        "weeks": weeks,
+        "missing": missing,
+        "duplicates": duplicates,
+        "overlaps": overlaps,
+        "invalid": invalid,
+    }
+
+
+__all__ = ["reconcile"]
@@ -0,0 +1,69 @@
+# backend/services/template_layout_service.py
+"""
+Template layout table extraction
+--------------------------------
+
+Crops a page to each known table region of a template layout and extracts only
+those four tables, instead of running table detection over the whole page.
+The crop result is validated before use, against the signature of the
+template the layout belongs to (services/template_registry.py); callers fall
+back to a full-page scan when no layout validates, so unknown or shifted
+documents still extract.
+"""
+
+from typing import Any, List, Optional, Sequence, Tuple
+
+from models.template_layouts import TemplateLayout
+from services.template_registry import TEMPLATE_REGISTRY, TemplateRegistry, Validator
+
+# A detected table closer than this to the crop edge was probably cut by the crop
+CLIP_MARGIN = 0.5
+
+
+def matches_timesheet_signature(tables: Sequence[list], registry: TemplateRegistry = TEMPLATE_REGISTRY) -> bool:
+    """True if the first four tables carry the signature of a registered template"""
+    return registry.select(tables) is not None
+
+
+def _inside(table_bbox, crop_bbox) -> bool:
+    x0, top, x1, bottom = table_bbox
+    cx0, ctop, cx1, cbottom = crop_bbox
+    return (x0 - cx0 > CLIP_MARGIN and top - ctop > CLIP_MARGIN
+            and cx1 - x1 > CLIP_MARGIN and cbottom - bottom > CLIP_MARGIN)
+
+
+def find_layout_tables(page, layout: TemplateLayout,
+                       validators: Sequence[Validator] = None) -> Optional[List[Tuple[Any, list]]]:
+    """
+    Find the layout's tables in their regions of the page, as
+    (pdfplumber Table, extracted rows) pairs; the Table keeps the cell bboxes.
+    Returns None unless every region holds exactly one unclipped table that
+    passes its content check (`validators`, by default the default template's).
+    """
+    if validators is None:
+        validators = TEMPLATE_REGISTRY.default.validators
+    if not layout.matches_page(page.width, page.height):
+        return None
+
+    tables = []
+    for region, validator in zip(layout.regions, validators):
+        crop_bbox = region.padded_bbox(page.width, page.height)
+        found = page.crop(crop_bbox).find_tables()
+        if len(found) != 1 or not _inside(found[0].bbox, crop_bbox):
+            return None
+        table = found[0].extract()
+        if not validator(table):
+            return None
+        tables.append((found[0], table))
+    return tables
+
+
+def find_template_tables(page, registry: TemplateRegistry = TEMPLATE_REGISTRY) -> Optional[List[Tuple[Any, list]]]:
+    """(Table, rows) pairs from the first template layout that validates on this page, or None"""
+    for template in registry:
+        for layout in template.layouts:
+            tables = find_layout_tables(page, layout, template.validators)
+            if tables is not None:
+                return tables
+    return None
+
@@ -0,0 +1,382 @@
+# backend/services/template_registry.py
+"""
+Timesheet template registry
+---------------------------
+
+Each TimesheetTemplate (models/template_layouts.py) declares its four tables:
+label -> field maps for the base and employee tables, column roles for the
+work periods and task summary tables. The registry compiles every template
+once, at import, into a CompiledTemplate: closures that read a table straight
+into the extractMeta records, with the column indexes bound, day rows
+recognised by a frozenset lookup, and each distinct label cell resolved to its
+field once and remembered, so repeated rows and documents never scan the
+label list again.
+
+A page's tables select their template by signature: the first label of the
+base and employee tables, a day row of the work periods table and the totals
+label of the task summary table. That reads only the first cells, so it costs
+nothing next to table detection. Pages no template matches are read with the
+default (Techlauncher) template, as before there were several.
+
+New client formats are added as data: TEMPLATE_DEFINITIONS_FILE is a JSON list
+of templates, matched before the built-in ones. Any key left out takes the
+Techlauncher value, except "layouts": a template without any is read from the
+full-page table scan. Day labels ("work_periods": {"weekdays": [...]}) are
+listed Monday first.
+
+    [{"name": "acme",
+      "base": {"fields": {"purchase order": "po_number", "customer": "client",
+                          "manager": "supervisor"}},
+      "employee": {"fields": {"contractor": "name", "agency": "company"}},
+      "work_periods": {"columns": {"total_daily": 9}},
+      "task_summary": {"task_label": "Hours", "totals_label": "Week Total", "total_column": 8},
+      "layouts": [{"name": "acme-a4", "page_width": 595, "page_height": 842,
+                   "regions": {"base": [341, 150, 543, 187], "employee": [...],
+                               "work_periods": [...], "task_summary": [...]}}]}]
+"""
+
+import dataclasses
+import json
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from config.config import TEMPLATE_DEFINITIONS_FILE
+from models.pdf_extraction_types import (
+    BaseInfo, EmployeeInfo, ExtraInOut, Task, TaskPerDay, TimePeriod, TotalsRow, WeeklyTotal, WorkEntry,
+)
+from models.template_layouts import (
+    KeyValueTable, LabelField, TableRegion, TaskSummaryTable, TemplateLayout, TimesheetTemplate,
+    TIMESHEET_TEMPLATES, WorkPeriodTable,
+)
+from services.normalization import date_to_iso, time_to_decimal
+
+# Table names, in extractMeta order; also the region names of a layout
+TABLE_NAMES = ("base", "employee", "work_periods", "task_summary")
+
+# Distinct label cells remembered per table; a template has a handful
+_MAX_RESOLVED_LABELS = 1024
+_UNRESOLVED = object()
+
+# The template has no extra in/out columns
+_NO_EXTRA_IN_OUT = ExtraInOut(morning="0:00", afternoon="0:00")
+
+Validator = Callable[[list], bool]
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledTemplate:
+    """A TimesheetTemplate compiled into table readers"""
+    template: TimesheetTemplate
+    validators: Tuple[Validator, ...]  # signature check per table, in TABLE_NAMES order
+    extract_base: Callable[[list], BaseInfo]
+    extract_employee: Callable[[list], EmployeeInfo]
+    extract_work_entries: Callable[[list], Tuple[WorkEntry, ...]]
+    extract_tasks_and_totals: Callable[[list], Tuple[Tuple[Task, ...], TotalsRow, WeeklyTotal]]
+
+    @property
+    def name(self) -> str:
+        return self.template.name
+
+    @property
+    def layouts(self) -> Tuple[TemplateLayout, ...]:
+        return self.template.layouts
+
+    @property
+    def keywords(self) -> Tuple[str, ...]:
+        """Labels every page of this template prints: the base table's first label and the totals label"""
+        return self.template.base.fields[0].label, self.template.task_summary.totals_label
+
+    def matches(self, tables: Sequence[list]) -> bool:
+        """True if the first four tables carry this template's signature"""
+        return len(tables) >= len(self.validators) and all(
+            validator(table) for validator, table in zip(self.validators, tables)
+        )
+
+
+def _check_columns(name: str, *columns: int) -> None:
+    if any(isinstance(column, bool) or not isinstance(column, int) or column < 0 for column in columns):
+        raise ValueError(f"{name}: columns must be non-negative integers")
+
+
+def _compile_key_value(name: str, table: KeyValueTable, record_type: type) -> Tuple[Validator, Callable]:
+    record_fields = [field.name for field in dataclasses.fields(record_type)]
+    unknown = [label.field for label in table.fields if label.field not in record_fields]
+    if unknown or not table.fields:
+        raise ValueError(f"{name}: fields must map labels to {', '.join(record_fields)}")
+    _check_columns(name, table.key_column, table.value_column)
+
+    labels = tuple((label.label.lower(), label.field) for label in table.fields)
+    signature = labels[0][0]
+    key_column, value_column = table.key_column, table.value_column
+    min_length = max(key_column, value_column) + 1
+    missing = {field: table.missing for field in record_fields}
+    resolved: Dict[str, Optional[str]] = {}
+
+    def field_for(cell) -> Optional[str]:
+        key = str(cell)
+        field = resolved.get(key, _UNRESOLVED)
+        if field is _UNRESOLVED:
+            lowered = key.lower().strip()
+            field = next((field for label, field in labels if label in lowered), None)
+            if len(resolved) >= _MAX_RESOLVED_LABELS:
+                resolved.clear()
+            resolved[key] = field
+        return field
+
+    def validate(rows) -> bool:
+        return any(row and len(row) > key_column and signature in str(row[key_column]).strip().lower()
+                   for row in rows)
+
+    def extract(rows):
+        values = dict(missing)
+        for row in rows:
+            if row and len(row) >= min_length:
+                field = field_for(row[key_column])
+                if field is not None:
+                    values[field] = str(row[value_column]).strip()
+        return record_type(**values)
+
+    return validate, extract
+
+
+def _compile_work_periods(name: str, table: WorkPeriodTable) -> Tuple[Validator, Callable]:
+    columns = dataclasses.astuple(table.columns)
+    _check_columns(name, *columns)
+    weekday_column = table.columns.weekday
+    min_length = max(columns) + 1
+    weekdays = frozenset(weekday.lower() for weekday in table.weekdays)
+    cells = itemgetter(*columns)
+
+    def is_day_row(row) -> bool:
+        return bool(row) and len(row) >= min_length and str(row[weekday_column]).strip().lower() in weekdays
+
+    def validate(rows) -> bool:
+        return any(is_day_row(row) for row in rows)
+
+    def extract(rows) -> Tuple[WorkEntry, ...]:
+        entries = []
+        for row in rows:
+            if not is_day_row(row):
+                continue
+            (weekday, date_original, morning_start, morning_finish, morning_time,
+             afternoon_start, afternoon_finish, afternoon_time, total_daily_hours) = (
+                [str(cell).strip() for cell in cells(row)]
+            )
+            entries.append(WorkEntry(
+                weekday=weekday,
+                date_original=date_original,
+                date_iso=date_to_iso(date_original),
+                morning=TimePeriod(start=morning_start, finish=morning_finish, time=morning_time),
+                afternoon=TimePeriod(start=afternoon_start, finish=afternoon_finish, time=afternoon_time),
+                extra_in_out=_NO_EXTRA_IN_OUT,
+                total_daily_hours=total_daily_hours,
+                total_daily_decimal=time_to_decimal(total_daily_hours),
+            ))
+        return tuple(entries)
+
+    return validate, extract
+
+
+def _compile_task_summary(name: str, table: TaskSummaryTable) -> Tuple[Validator, Callable]:
+    task_fields = {field.name for field in dataclasses.fields(TaskPerDay)}
+    if {key for key, _column in table.task_day_columns} != task_fields:
+        raise ValueError(f"{name}: task_day_columns must give a column for each of {', '.join(sorted(task_fields))}")
+    _check_columns(name, table.label_column, table.total_column,
+                   *(column for _key, column in table.totals_day_columns + table.task_day_columns))
+
+    label_column, total_column = table.label_column, table.total_column
+    task_label, totals_label, empty_time = table.task_label, table.totals_label, table.empty_time
+    signature = totals_label.lower()
+    totals_day_columns, task_day_columns = table.totals_day_columns, table.task_day_columns
+
+    def cell(row, column: int) -> str:
+        return str(row[column]).strip() if len(row) > column else empty_time
+
+    def validate(rows) -> bool:
+        return any(row and len(row) > label_column and signature in str(row[label_column]).strip().lower()
+                   for row in rows)
+
+    def extract(rows):
+        weekly_total = WeeklyTotal(total_hours=empty_time, total_decimal_hours=0.0)
+        task_row = None
+        totals_data = {}
+        for row in rows:
+            if not row or len(row) <= label_column:
+                continue
+            label = str(row[label_column]).strip()
+            if label == task_label:
+                task_row = row
+            elif totals_label in label:
+                totals_data = {key: cell(row, column) for key, column in totals_day_columns}
+                if len(row) > total_column:
+                    total_hours = str(row[total_column]).strip()
+                    weekly_total = WeeklyTotal(total_hours=total_hours,
+                                               total_decimal_hours=time_to_decimal(total_hours))
+
+        tasks = ()
+        if task_row:
+            tasks = (Task(
+                task_name=task_label,
+                per_day=TaskPerDay(**{key: cell(task_row, column) for key, column in task_day_columns}),
+                total_hours=weekly_total.total_hours,
+                decimal_hours=weekly_total.total_decimal_hours,
+            ),)
+        totals_row = TotalsRow(
+            label=totals_label,
+            by_day=totals_data,
+            total_hours=weekly_total.total_hours,
+            total_decimal_hours=weekly_total.total_decimal_hours,
+        )
+        return tasks, totals_row, weekly_total
+
+    return validate, extract
+
+
+def compile_template(template: TimesheetTemplate) -> CompiledTemplate:
+    """Compile a template's table declarations; ValueError if they are inconsistent"""
+    name = template.name
+    for layout in template.layouts:
+        if tuple(region.name for region in layout.regions) != TABLE_NAMES:
+            raise ValueError(f"{name}: layout {layout.name} needs the regions {', '.join(TABLE_NAMES)}, in order")
+    base_validator, extract_base = _compile_key_value(f"{name}.base", template.base, BaseInfo)
+    employee_validator, extract_employee = _compile_key_value(f"{name}.employee", template.employee, EmployeeInfo)
+    work_validator, extract_work_entries = _compile_work_periods(f"{name}.work_periods", template.work_periods)
+    task_validator, extract_tasks_and_totals = _compile_task_summary(f"{name}.task_summary", template.task_summary)
+    return CompiledTemplate(
+        template=template,
+        validators=(base_validator, employee_validator, work_validator, task_validator),
+        extract_base=extract_base,
+        extract_employee=extract_employee,
+        extract_work_entries=extract_work_entries,
+        extract_tasks_and_totals=extract_tasks_and_totals,
+    )
+
+
+class TemplateRegistry:
+    """Compiled templates in match order, and the default for unmatched pages"""
+
+    def __init__(self, templates: Sequence[TimesheetTemplate] = TIMESHEET_TEMPLATES,
+                 default: Optional[TimesheetTemplate] = None):
+        self._compiled: List[CompiledTemplate] = []
+        for template in templates:
+            self.register(template)
+        if not self._compiled:
+            raise ValueError("A template registry needs at least one template")
+        self._default = self._compiled[0] if default is None else next(
+            (compiled for compiled in self._compiled if compiled.template is default), None,
+        )
+        if self._default is None:
+            raise ValueError(f"Default template {default.name} is not registered")
+
+    def register(self, template: TimesheetTemplate) -> CompiledTemplate:
+        """Compile a template and match it after the ones already registered"""
+        if any(compiled.name == template.name for compiled in self._compiled):
+            raise ValueError(f"Template {template.name} is already registered")
+        compiled = compile_template(template)
+        self._compiled.append(compiled)
+        return compiled
+
+    def __iter__(self) -> Iterator[CompiledTemplate]:
+        return iter(self._compiled)
+
+    @property
+    def default(self) -> CompiledTemplate:
+        return self._default
+
+    def select(self, tables: Sequence[list]) -> Optional[CompiledTemplate]:
+        """The first template whose signature the tables carry, or None"""
+        return next((compiled for compiled in self._compiled if compiled.matches(tables)), None)
+
+
+def _replaced(name: str, fallback: Any, data: Any, convert: Dict[str, Callable] = None) -> Any:
+    """`fallback` with the keys of `data` replaced, each through its `convert` function"""
+    if data is None:
+        return fallback
+    if not isinstance(data, dict):
+        raise ValueError(f"{name} must be an object")
+    known = {field.name for field in dataclasses.fields(fallback)}
+    if set(data) - known:
+        raise ValueError(f"{name}: unknown keys {', '.join(sorted(set(data) - known))}")
+    convert = convert or {}
+    return dataclasses.replace(fallback, **{
+        key: convert[key](value) if key in convert else value for key, value in data.items()
+    })
+
+
+def _label_fields(fields: Dict[str, str]) -> Tuple[LabelField, ...]:
+    return tuple(LabelField(label, field) for label, field in fields.items())
+
+
+def _day_columns(columns: Dict[str, int]) -> Tuple[Tuple[str, int], ...]:
+    return tuple(columns.items())
+
+
+def _layout(name: str, data: Dict[str, Any]) -> TemplateLayout:
+    regions = data.get("regions") or {}
+    try:
+        return TemplateLayout(
+            name=data.get("name") or name,
+            page_width=float(data["page_width"]),
+            page_height=float(data["page_height"]),
+            regions=tuple(TableRegion(table_name, tuple(float(value) for value in regions[table_name]))
+                          for table_name in TABLE_NAMES),
+        )
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"{name}: a layout needs page_width, page_height and a bbox for each of "
+                         f"{', '.join(TABLE_NAMES)} ({e})") from e
+
+
+def template_from_dict(data: Dict[str, Any], fallback: TimesheetTemplate = TIMESHEET_TEMPLATES[0]) -> TimesheetTemplate:
+    """A TimesheetTemplate from its JSON form; keys left out take `fallback`'s value"""
+    if not isinstance(data, dict) or not data.get("name"):
+        raise ValueError("A template must be an object with a name")
+    name = data["name"]
+    try:
+        return TimesheetTemplate(
+            name=name,
+            base=_replaced(f"{name}.base", fallback.base, data.get("base"), {"fields": _label_fields}),
+            employee=_replaced(f"{name}.employee", fallback.employee, data.get("employee"), {"fields": _label_fields}),
+            work_periods=_replaced(f"{name}.work_periods", fallback.work_periods, data.get("work_periods"), {
+                "columns": lambda columns: _replaced(f"{name}.work_periods.columns",
+                                                     fallback.work_periods.columns, columns),
+                "weekdays": tuple,
+            }),
+            task_summary=_replaced(f"{name}.task_summary", fallback.task_summary, data.get("task_summary"), {
+                "totals_day_columns": _day_columns,
+                "task_day_columns": _day_columns,
+            }),
+            layouts=tuple(_layout(f"{name}-{index}", layout) for index, layout in enumerate(data.get("layouts") or ())),
+        )
+    except (AttributeError, TypeError) as e:
+        raise ValueError(f"{name}: {e}") from e
+
+
+def load_templates(path: str) -> Tuple[TimesheetTemplate, ...]:
+    """Templates of a TEMPLATE_DEFINITIONS_FILE; () without a path"""
+    if not path:
+        return ()
+    with open(path, encoding="utf-8") as f:
+        definitions = json.load(f)
+    if not isinstance(definitions, list):
+        raise ValueError(f"{path} is not a JSON list of templates")
+    return tuple(template_from_dict(definition) for definition in definitions)
+
+
+def _build_registry(path: str) -> TemplateRegistry:
+    try:
+        return TemplateRegistry(load_templates(path) + TIMESHEET_TEMPLATES, default=TIMESHEET_TEMPLATES[0])
+    except (OSError, ValueError) as e:
+        # A broken definitions file must not stop the built-in template from extracting
+        print(f"Error loading timesheet templates from {path}: {e}")
+        return TemplateRegistry(TIMESHEET_TEMPLATES)
+
+
+# Compiled once per process, at import
+TEMPLATE_REGISTRY = _build_registry(TEMPLATE_DEFINITIONS_FILE)
+
+
+__all__ = [
+    "CompiledTemplate", "TABLE_NAMES", "TEMPLATE_REGISTRY", "TemplateRegistry", "Validator",
+    "compile_template", "load_templates", "template_from_dict",
+]
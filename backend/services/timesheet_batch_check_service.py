@@ -0,0 +1,167 @@
+# backend/services/timesheet_batch_check_service.py
+# -*- coding: utf-8 -*-
+"""
+Columnar timesheet checking
+---------------------------
+
+Batch counterpart of `check_timesheet_rows` for reconciling a whole payroll
+run in one call. Every hour value of the batch is parsed once into NumPy
+arrays (repeated strings such as "8hrs" are parsed a single time), then the
+MAX_DAILY_HOURS_DEFAULT bounds, the HOUR_TOLERANCE sum check and the expected
+total check run as array operations over all rows at once.
+
+The result for each payload is exactly what `check_timesheet_rows` returns for
+it: values are parsed with the same `_to_hours`, sums are accumulated in the
+same day order, and payloads whose shape the scalar path handles through its
+exception branches (non-dict `hours`, etc.) are delegated to it.
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, List, Sequence, Tuple
+
+from config.config import MAX_DAILY_HOURS_DEFAULT, HOUR_TOLERANCE
+from services.timesheet_check_service import DAY_LABELS, _to_hours, check_timesheet_rows
+
+if TYPE_CHECKING:
+    import numpy as np
+
+_MISSING = object()
+
+
+def _parse_values(values: List[Any]) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Parse hour values into (hours, ok) arrays; each distinct value is parsed once.
+    ok is False where `_to_hours` raises; hours is 0.0 there.
+    """
+    import numpy as np
+
+    hours = np.zeros(len(values), dtype=np.float64)
+    ok = np.zeros(len(values), dtype=bool)
+    memo: Dict[Any, Tuple[float, bool]] = {}
+
+    for i, v in enumerate(values):
+        try:
+            key = (type(v), v)
+            parsed = memo.get(key)
+        except TypeError:  # unhashable value
+            key, parsed = None, None
+        if parsed is None:
+            try:
+                parsed = (_to_hours(v), True)
+            except Exception:
+                parsed = (0.0, False)
+            if key is not None:
+                memo[key] = parsed
+        hours[i], ok[i] = parsed
+    return hours, ok
+
+
+def _is_columnar(payload: Any) -> bool:
+    """True if the payload has the plain dict shape the columnar path handles"""
+    if not isinstance(payload, dict):
+        return False
+    extracted = payload.get("extracted", {}) or {}
+    expected = payload.get("expected", {}) or {}
+    if not isinstance(extracted, dict) or not isinstance(expected, dict):
+        return False
+    return (isinstance(extracted.get("hours", {}) or {}, dict)
+            and isinstance(expected.get("hours", {}) or {}, dict))
+
+
+def _check_columnar(payloads: Sequence[Dict[str, Any]]) -> List[Dict[str, bool]]:
+    # NumPy is loaded by the first batch check, not at app start
+    import numpy as np
+
+    n = len(payloads)
+    n_days = len(DAY_LABELS)
+    extracted = [p.get("extracted", {}) or {} for p in payloads]
+    expected = [p.get("expected", {}) or {} for p in payloads]
+    ext_hours = [e.get("hours", {}) or {} for e in extracted]
+    exp_hours = [e.get("hours", {}) or {} for e in expected]
+
+    # One flat list of every value to parse, laid out as:
+    # [ext days (n x 7) | exp days (n x 7) | ext totals (n) | exp totals (n)]
+    ext_day_values = [h.get(short_key, _MISSING) for h in ext_hours for short_key, _label in DAY_LABELS]
+    exp_day_values = [h.get(short_key, _MISSING) for h in exp_hours for short_key, _label in DAY_LABELS]
+    values = (
+        ext_day_values
+        + exp_day_values
+        + [e.get("total_hours") for e in extracted]
+        + [e.get("total_hours") for e in expected]
+    )
+    hours, ok = _parse_values(values)
+
+    day_end = n * n_days
+    ext_day_hours = hours[:day_end].reshape(n, n_days)
+    ext_day_ok = ok[:day_end].reshape(n, n_days)
+    exp_day_hours = hours[day_end:2 * day_end].reshape(n, n_days)
+    exp_day_ok = ok[day_end:2 * day_end].reshape(n, n_days)
+    ext_total_hours, ext_total_ok = hours[2 * day_end:2 * day_end + n], ok[2 * day_end:2 * day_end + n]
+    exp_total_hours, exp_total_ok = hours[2 * day_end + n:], ok[2 * day_end + n:]
+
+    # Missing days: fail the day check, count as 0 in sums (the scalar path reads "0")
+    ext_present = np.array([v is not _MISSING for v in ext_day_values], dtype=bool).reshape(n, n_days)
+    exp_present = np.array([v is not _MISSING for v in exp_day_values], dtype=bool).reshape(n, n_days)
+    ext_day_ok_for_sum = ext_day_ok | ~ext_present
+    exp_day_ok_for_sum = exp_day_ok | ~exp_present
+
+    with np.errstate(invalid='ignore', over='ignore'):
+        # --- Daily Hours: parsable and within bounds
+        day_checks = (ext_present & ext_day_ok
+                      & (ext_day_hours >= 0.0) & (ext_day_hours <= MAX_DAILY_HOURS_DEFAULT))
+
+        # Sums accumulate column by column in DAY_LABELS order, like the scalar loop
+        ext_sum = np.zeros(n, dtype=np.float64)
+        exp_sum = np.zeros(n, dtype=np.float64)
+        for j in range(n_days):
+            ext_sum = ext_sum + np.where(ext_present[:, j], ext_day_hours[:, j], 0.0)
+            exp_sum = exp_sum + np.where(exp_present[:, j], exp_day_hours[:, j], 0.0)
+
+        # Any unparsable day makes the extracted sum NaN and the expected sum 0
+        daily_sum = np.where(ext_day_ok_for_sum.all(axis=1), ext_sum, np.nan)
+        exp_fallback = np.where(exp_day_ok_for_sum.all(axis=1), exp_sum, 0.0)
+
+        ext_total = np.where(ext_total_ok, ext_total_hours, -1.0)
+        exp_total = np.where(exp_total_ok, exp_total_hours, exp_fallback)
+
+        # --- Total Hours: consistent with daily sum, within expected, positive
+        total_consistent = np.abs(daily_sum - ext_total) < HOUR_TOLERANCE
+        total_pass = total_consistent & (ext_total <= exp_total) & (ext_total > 0)
+
+    results = []
+    for i in range(n):
+        week_pass = (str(extracted[i].get("week_worked", "")).strip()
+                     == str(expected[i].get("week_worked", "")).strip())
+        require_sig = bool(expected[i].get("require_signature", False))
+        signatures_pass = bool(extracted[i].get("signatures", False)) if require_sig else True
+
+        row = {"Week Worked": week_pass}
+        for j, (_short_key, label) in enumerate(DAY_LABELS):
+            row[label] = bool(day_checks[i, j])
+        row["Total Hours"] = bool(total_pass[i])
+        row["Signatures"] = signatures_pass
+        row["Additional Text"] = True
+        results.append(row)
+    return results
+
+
+def check_timesheet_rows_batch(payloads: Sequence[Dict[str, Any]]) -> List[Dict[str, bool]]:
+    """
+    Validate many extracted/expected pairs at once.
+    Returns one dict per payload, in input order, identical to `check_timesheet_rows`.
+    """
+    results: List[Dict[str, bool]] = [None] * len(payloads)
+    columnar_index = []
+    for i, payload in enumerate(payloads):
+        if _is_columnar(payload):
+            columnar_index.append(i)
+        else:
+            results[i] = check_timesheet_rows(payload)
+
+    if columnar_index:
+        columnar_results = _check_columnar([payloads[i] for i in columnar_index])
+        for i, row in zip(columnar_index, columnar_results):
+            results[i] = row
+    return results
+
+
+__all__ = ["check_timesheet_rows_batch"]
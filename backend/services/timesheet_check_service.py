@@ -20,9 +20,12 @@ Notes:
 - Additional Text always passes (by current spec).
 """
 
-from typing import Dict, Any
+import hashlib
+import json
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
 from config.config import MAX_DAILY_HOURS_DEFAULT, HOUR_TOLERANCE
-import re
+from services.normalization import to_hours as _to_hours
 
 # Map short keys in extracted/expected.hours to full UI labels
 DAY_LABELS = [
@@ -36,28 +39,6 @@ DAY_LABELS = [
 ]
 
 
-def _to_hours(v) -> float:
-    """
-    Normalize a value to a float number of hours.
-
-    Accepts:
-      - int/float (e.g., 8, 7.5)
-      - strings like "8", "8h", "8hrs", "7.5hrs"
-    Raises:
-      ValueError if unparsable or None.
-    """
-    if v is None:
-        raise ValueError("Empty hour value")
-    if isinstance(v, (int, float)):
-        return float(v)
-
-    s = str(v).strip().lower()
-    m = re.match(r"^\s*([0-9]+(?:\.[0-9]+)?)", s)
-    if not m:
-        raise ValueError(f"Unparsable hour: {v}")
-    return float(m.group(1))
-
-
 def _sum_hours(hours_map: Dict[str, Any]) -> float:
     """Sum hours for the full Mon–Sun set; missing day counts as 0."""
     total = 0.0
@@ -66,59 +47,44 @@ def _sum_hours(hours_map: Dict[str, Any]) -> float:
     return total
 
 
-def check_timesheet_rows(payload: Dict[str, Any]) -> Dict[str, bool]:
-    """
-    Validate timesheet data row by row.
-
-    Input shape (dicts are fine; dataclasses optional):
-      {
-        "extracted": {
-          "week_worked": "2025-08-11..2025-08-17",
-          "hours": {"Mon":"8hrs","Tue":"7.5hrs",...},
-          "total_hours": "40hrs",
-          "signatures": true/false (optional),
-          "additional_text": ".../optional",
-          "employee_name": "...",
-          "po_number": "..."
-        },
-        "expected": {
-          "week_worked": "2025-08-11..2025-08-17",
-          "hours": {"Mon":"8hrs",...},   # reference schedule only
-          "total_hours": "40hrs",
-          "employee_name": "...",
-          "po_number": "..."
-          # "require_signature": true  # optional flag, if ever used
-        }
-      }
-
-    Returns: booleans per table row (keys match UI labels exactly).
-    """
+def _payload_parts(payload: Dict[str, Any]) -> Tuple[Any, Any, Any, Any]:
+    """(extracted, expected, extracted hours, expected hours) of a check payload"""
     extracted = payload.get("extracted", {}) or {}
     expected = payload.get("expected", {}) or {}
+    return extracted, expected, extracted.get("hours", {}) or {}, expected.get("hours", {}) or {}
 
-    ext_hours = extracted.get("hours", {}) or {}
-    exp_hours = expected.get("hours", {}) or {}
 
-    # --- Week Worked: must match exactly
-    week_pass = (str(extracted.get("week_worked", "")).strip()
-                 == str(expected.get("week_worked", "")).strip())
+# --- Row checks: each takes the payload parts and returns the row's pass/fail
 
-    # --- Daily Hours: validate presence/parsability and numeric bounds
-    # We do not require equality with expected day-by-day.
-    day_checks: Dict[str, bool] = {}
-    for short_key, label in DAY_LABELS:
+def _check_week(extracted, expected, ext_hours, exp_hours) -> bool:
+    """Week Worked: must match exactly"""
+    return (str(extracted.get("week_worked", "")).strip()
+            == str(expected.get("week_worked", "")).strip())
+
+
+def _check_day(short_key: str):
+    """
+    Daily Hours: validate presence/parsability and numeric bounds.
+    We do not require equality with expected day-by-day.
+    """
+    def check(extracted, expected, ext_hours, exp_hours) -> bool:
         try:
             h = _to_hours(ext_hours[short_key])  # KeyError -> except
-            day_checks[label] = (0.0 <= h <= MAX_DAILY_HOURS_DEFAULT)
+            return 0.0 <= h <= MAX_DAILY_HOURS_DEFAULT
         except Exception:
             # Any issue (missing, negative, unparsable, > cap) => False,
             # but we still emit the label to avoid KeyError in callers.
-            day_checks[label] = False
+            return False
+    return check
+
 
-    # --- Total Hours:
-    # 1) equals sum of daily (± tolerance)
-    # 2) <= expected total
-    # 3) > 0
+def _check_total(extracted, expected, ext_hours, exp_hours) -> bool:
+    """
+    Total Hours:
+    1) equals sum of daily (± tolerance)
+    2) <= expected total
+    3) > 0
+    """
     try:
         ext_total = _to_hours(extracted.get("total_hours"))
     except Exception:
@@ -142,26 +108,125 @@ def check_timesheet_rows(payload: Dict[str, Any]) -> Dict[str, bool]:
     total_consistent = abs(daily_sum - ext_total) < HOUR_TOLERANCE
     total_not_exceed = (ext_total <= exp_total)
     total_gt_zero = (ext_total > 0)
-    total_pass = bool(total_consistent and total_not_exceed and total_gt_zero)
+    return bool(total_consistent and total_not_exceed and total_gt_zero)
+
 
-    # --- Signatures:
-    # default: not required => always true
+def _check_signatures(extracted, expected, ext_hours, exp_hours) -> bool:
+    """Signatures: default not required => always true"""
     require_sig = bool(expected.get("require_signature", False))
-    signatures_pass = bool(extracted.get("signatures", False)) if require_sig else True
+    return bool(extracted.get("signatures", False)) if require_sig else True
 
-    # --- Additional Text: always true (per current spec)
-    additional_text_pass = True
 
-    # --- Final dictionary: keys match the UI
-    return {
-        "Week Worked": week_pass,
-        **day_checks,               # Monday … Sunday
-        "Total Hours": total_pass,
-        "Signatures": signatures_pass,
-        "Additional Text": additional_text_pass,
-    }
+def _check_additional_text(extracted, expected, ext_hours, exp_hours) -> bool:
+    """Additional Text: always true (per current spec)"""
+    return True
+
+
+# --- Row inputs: exactly the values (and config) each row check reads, for fingerprints
+
+_MISSING = "<missing>"
+
+
+def _day_value(hours_map: Any, short_key: str) -> Any:
+    try:
+        return hours_map[short_key]
+    except Exception:
+        return _MISSING
+
 
+def _week_inputs(extracted, expected, ext_hours, exp_hours) -> Any:
+    return [extracted.get("week_worked", ""), expected.get("week_worked", "")]
 
-__all__ = ["check_timesheet_rows"]
+
+def _day_inputs(short_key: str):
+    def inputs(extracted, expected, ext_hours, exp_hours) -> Any:
+        return [_day_value(ext_hours, short_key), MAX_DAILY_HOURS_DEFAULT]
+    return inputs
+
+
+def _total_inputs(extracted, expected, ext_hours, exp_hours) -> Any:
+    exp_total = expected.get("total_hours")
+    try:
+        _to_hours(exp_total)
+    except Exception:
+        # Only then does the expected schedule count, through its sum
+        exp_total = ["sum", exp_hours]
+    return [extracted.get("total_hours"), exp_total, ext_hours, HOUR_TOLERANCE]
+
+
+def _signatures_inputs(extracted, expected, ext_hours, exp_hours) -> Any:
+    require_sig = bool(expected.get("require_signature", False))
+    return [require_sig, bool(extracted.get("signatures", False)) if require_sig else None]
+
+
+def _no_inputs(extracted, expected, ext_hours, exp_hours) -> Any:
+    return []
+
+
+# (UI label, check, inputs), in the order rows are returned; keys match the UI
+ROW_CHECKS: List[Tuple[str, Callable[..., bool], Callable[..., Any]]] = [
+    ("Week Worked", _check_week, _week_inputs),
+    *[(label, _check_day(short_key), _day_inputs(short_key)) for short_key, label in DAY_LABELS],  # Monday … Sunday
+    ("Total Hours", _check_total, _total_inputs),
+    ("Signatures", _check_signatures, _signatures_inputs),
+    ("Additional Text", _check_additional_text, _no_inputs),
+]
+ROW_LABELS = [label for label, _check, _inputs in ROW_CHECKS]
+
+
+def _fingerprint(label: str, inputs: Any) -> str:
+    try:
+        encoded = json.dumps([label, inputs], sort_keys=True, default=repr, separators=(",", ":"))
+    except (TypeError, ValueError):
+        encoded = repr([label, inputs])
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:32]
+
+
+def row_fingerprints(payload: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Fingerprint of the inputs of every row: the payload values the row check
+    reads and the limits it applies. A row whose fingerprint is unchanged has
+    an unchanged result.
+    """
+    parts = _payload_parts(payload)
+    return {label: _fingerprint(label, inputs(*parts)) for label, _check, inputs in ROW_CHECKS}
+
+
+def check_timesheet_rows(payload: Dict[str, Any], labels: Optional[Iterable[str]] = None) -> Dict[str, bool]:
+    """
+    Validate timesheet data row by row.
+
+    Input shape (dicts are fine; dataclasses optional):
+      {
+        "extracted": {
+          "week_worked": "2025-08-11..2025-08-17",
+          "hours": {"Mon":"8hrs","Tue":"7.5hrs",...},
+          "total_hours": "40hrs",
+          "signatures": true/false (optional),
+          "additional_text": ".../optional",
+          "employee_name": "...",
+          "po_number": "..."
+        },
+        "expected": {
+          "week_worked": "2025-08-11..2025-08-17",
+          "hours": {"Mon":"8hrs",...},   # reference schedule only
+          "total_hours": "40hrs",
+          "employee_name": "...",
+          "po_number": "..."
+          # "require_signature": true  # optional flag, if ever used
+        }
+      }
+
+    `labels` restricts the check to those rows (all rows by default).
+    Returns: booleans per table row (keys match UI labels exactly).
+    """
+    parts = _payload_parts(payload)
+    wanted = None if labels is None else set(labels)
+    return {
+        label: check(*parts)
+        for label, check, _inputs in ROW_CHECKS
+        if wanted is None or label in wanted
+    }
 
 
+__all__ = ["check_timesheet_rows", "row_fingerprints", "ROW_LABELS"]
@@ -0,0 +1,128 @@
+# backend/services/timesheet_repository.py
+"""
+Timesheet repository
+--------------------
+
+Persists extractMeta results in the `timesheet` table and looks them up by the
+indexed columns (PO number, employee name, week start, PDF content hash), so
+finding a stored timesheet never means re-extracting the PDF or scanning the
+JSON column.
+"""
+
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from models.database import session_scope
+from models.timesheet import Timesheet
+from services.normalization import employee_key, parse_iso_date
+
+
+def week_start_from_meta(meta_data: Dict[str, Any]) -> Optional[date]:
+    """
+    Earliest ISO date among the work entries, or None if none parse. Stored as
+    Timesheet.week_start: the first worked date, not the Monday of its week.
+    """
+    dates = [parse_iso_date(entry.get("date_iso")) for entry in meta_data.get("work_entries", [])]
+    dates = [d for d in dates if d is not None]
+    return min(dates) if dates else None
+
+
+def lookup_columns(meta_data: Dict[str, Any]) -> Dict[str, Any]:
+    """The Timesheet lookup and grouping column values for an extractMeta result"""
+    name = meta_data.get("employee", {}).get("name")
+    week_start = week_start_from_meta(meta_data)
+    return {
+        "po_number": meta_data.get("base", {}).get("po_number"),
+        "employee_name": name,
+        "employee_key": employee_key(name),
+        "week_start": week_start,
+        "week_monday": week_start - timedelta(days=week_start.weekday()) if week_start else None,
+    }
+
+
+class TimesheetRepository:
+    """Stores and finds extracted timesheets"""
+
+    def save_meta(self, content_hash: str, meta_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Insert or update the timesheet extracted from the PDF with this content hash.
+        Returns the stored row as a dict.
+        """
+        try:
+            return self._upsert(content_hash, meta_data)
+        except IntegrityError:
+            # Another worker stored the same PDF concurrently; update its row instead
+            return self._upsert(content_hash, meta_data)
+
+    def _upsert(self, content_hash: str, meta_data: Dict[str, Any]) -> Dict[str, Any]:
+        with session_scope() as session:
+            timesheet = session.scalars(
+                select(Timesheet).where(Timesheet.content_hash == content_hash)
+            ).first()
+            if timesheet is None:
+                timesheet = Timesheet(content_hash=content_hash, status="in-progress")
+                session.add(timesheet)
+
+            timesheet.meta_data = meta_data
+            for column, value in lookup_columns(meta_data).items():
+                setattr(timesheet, column, value)
+            session.flush()
+            return timesheet.to_dict()
+
+    def get(self, tid: int) -> Optional[Dict[str, Any]]:
+        with session_scope() as session:
+            timesheet = session.get(Timesheet, tid)
+            return timesheet.to_dict() if timesheet else None
+
+    def find_by_hash(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        with session_scope() as session:
+            timesheet = session.scalars(
+                select(Timesheet).where(Timesheet.content_hash == content_hash)
+            ).first()
+            return timesheet.to_dict() if timesheet else None
+
+    def find(self, employee_name: Optional[str] = None, po_number: Optional[str] = None,
+             week_start: Optional[date] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Timesheets matching every given filter, newest first"""
+        query = select(Timesheet)
+        if employee_name is not None:
+            query = query.where(Timesheet.employee_name == employee_name)
+        if po_number is not None:
+            query = query.where(Timesheet.po_number == po_number)
+        if week_start is not None:
+            query = query.where(Timesheet.week_start == week_start)
+        query = query.order_by(Timesheet.tid.desc()).limit(limit)
+
+        with session_scope() as session:
+            return [timesheet.to_dict() for timesheet in session.scalars(query)]
+
+    def meta_in_period(self, start: date, end: date) -> List[Tuple[int, Dict[str, Any]]]:
+        """(tid, meta_data) of every timesheet whose week starts within [start, end]"""
+        query = (
+            select(Timesheet.tid, Timesheet.meta_data)
+            .where(Timesheet.week_start >= start, Timesheet.week_start <= end)
+            .order_by(Timesheet.week_start, Timesheet.tid)
+        )
+        with session_scope() as session:
+            return [(tid, meta_data) for tid, meta_data in session.execute(query)]
+
+    def iter_meta_in_period(self, start: date, end: date,
+                            batch_size: int = 500) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        (tid, meta_data) of every timesheet whose week starts within [start, end],
+        fetched `batch_size` rows at a time. Ordered by employee_key and ISO
+        week, newest first within a week, so an employee's week is adjacent
+        however their name was cased or spaced.
+        """
+        query = (
+            select(Timesheet.tid, Timesheet.meta_data)
+            .where(Timesheet.week_start >= start, Timesheet.week_start <= end)
+            .order_by(Timesheet.employee_key, Timesheet.week_monday, Timesheet.tid.desc())
+            .execution_options(yield_per=batch_size)
+        )
+        with session_scope() as session:
+            for tid, meta_data in session.execute(query):
+                yield tid, meta_data
@@ -0,0 +1,156 @@
+# backend/services/timesheet_revalidation_service.py
+"""
+Incremental timesheet re-validation
+-----------------------------------
+
+When a supervisor edits the expected schedule, every extracted/expected pair
+is posted again, but most rows of most timesheets read none of the edited
+values. Each timesheet's last check is stored (`timesheet_check` table) with a
+fingerprint per row of the inputs that row used: the payload values it reads
+and the MAX_DAILY_HOURS_DEFAULT / HOUR_TOLERANCE limits it applies.
+
+A re-posted pair is fingerprinted again, and
+- an unchanged timesheet (same overall fingerprint) is answered from the store;
+- otherwise only rows whose fingerprint changed are re-evaluated with
+  `check_timesheet_rows`, the others keep their stored result;
+and each result reports the rows whose pass/fail changed.
+
+Storage is best effort: if the database is unavailable, every row is
+evaluated and reported as changed, so callers still get correct results.
+"""
+
+import hashlib
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from models.database import session_scope
+from models.timesheet_check import TimesheetCheck
+from services.timesheet_check_service import ROW_LABELS, check_timesheet_rows, row_fingerprints
+
+# Keys per IN (...) query; well under SQLite's bound-parameter limit
+_QUERY_CHUNK = 500
+
+
+def _combine(fingerprints: Dict[str, str]) -> str:
+    digest = hashlib.sha256()
+    for label in ROW_LABELS:
+        digest.update(fingerprints[label].encode("ascii"))
+    return digest.hexdigest()
+
+
+def _chunks(keys: Sequence[str]) -> Iterable[Sequence[str]]:
+    for start in range(0, len(keys), _QUERY_CHUNK):
+        yield keys[start:start + _QUERY_CHUNK]
+
+
+class TimesheetCheckRepository:
+    """Stores the last check of each timesheet"""
+
+    def load(self, keys: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Stored checks by timesheet key; keys never checked are absent"""
+        stored = {}
+        with session_scope() as session:
+            for chunk in _chunks(list(dict.fromkeys(keys))):
+                query = select(TimesheetCheck).where(TimesheetCheck.timesheet_key.in_(chunk))
+                stored.update((check.timesheet_key, check.to_dict()) for check in session.scalars(query))
+        return stored
+
+    def save(self, checks: Dict[str, Dict[str, Any]]) -> None:
+        """Insert or replace the checks of these timesheet keys"""
+        try:
+            self._upsert(checks)
+        except IntegrityError:
+            # Another request stored one of these keys concurrently; update its row instead
+            self._upsert(checks)
+
+    def _upsert(self, checks: Dict[str, Dict[str, Any]]) -> None:
+        with session_scope() as session:
+            existing = {}
+            for chunk in _chunks(list(checks)):
+                query = select(TimesheetCheck).where(TimesheetCheck.timesheet_key.in_(chunk))
+                existing.update((check.timesheet_key, check) for check in session.scalars(query))
+            for key, state in checks.items():
+                check = existing.get(key)
+                if check is None:
+                    check = TimesheetCheck(timesheet_key=key)
+                    session.add(check)
+                check.fingerprint = state["fingerprint"]
+                check.rows = state["rows"]
+
+
+class TimesheetRevalidationService:
+    """Re-checks timesheets, re-evaluating only rows whose inputs changed"""
+
+    def __init__(self, repository: TimesheetCheckRepository = None):
+        self.repository = repository or TimesheetCheckRepository()
+
+    def revalidate(self, items: Sequence[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Check (timesheet key, check payload) pairs against their stored checks.
+        Returns one result per item, in input order:
+          {"timesheet_id": "42",
+           "rows": {"Week Worked": true, ...},          # as check_timesheet_rows returns
+           "changed": {"Total Hours": {"before": true, "after": false}},
+           "reevaluated": ["Total Hours"]}
+        A timesheet never checked before has every row in `changed`, with before null.
+        Raises what check_timesheet_rows raises for a malformed payload; nothing is stored then.
+        """
+        stored = self._load([key for key, _payload in items])
+        updates: Dict[str, Dict[str, Any]] = {}
+        results = []
+
+        for key, payload in items:
+            fingerprints = row_fingerprints(payload)
+            fingerprint = _combine(fingerprints)
+            # A key repeated within the batch is compared with its earlier item
+            previous = updates.get(key) or stored.get(key)
+            previous_rows = previous["rows"] if previous else {}
+
+            if previous and previous["fingerprint"] == fingerprint:
+                rows = {label: previous_rows[label]["pass"] for label in ROW_LABELS}
+                reevaluated = []
+            else:
+                reevaluated = [
+                    label for label in ROW_LABELS
+                    if previous_rows.get(label, {}).get("fingerprint") != fingerprints[label]
+                ]
+                fresh = check_timesheet_rows(payload, reevaluated)
+                rows = {
+                    label: fresh[label] if label in fresh else previous_rows[label]["pass"]
+                    for label in ROW_LABELS
+                }
+                updates[key] = {
+                    "fingerprint": fingerprint,
+                    "rows": {label: {"fingerprint": fingerprints[label], "pass": rows[label]}
+                             for label in ROW_LABELS},
+                }
+
+            changed = {}
+            for label in ROW_LABELS:
+                before = previous_rows[label]["pass"] if label in previous_rows else None
+                if before is None or before != rows[label]:
+                    changed[label] = {"before": before, "after": rows[label]}
+            results.append({"timesheet_id": key, "rows": rows, "changed": changed, "reevaluated": reevaluated})
+
+        if updates:
+            self._save(updates)
+        return results
+
+    def _load(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        try:
+            return self.repository.load(keys)
+        except Exception as e:
+            # Without stored checks every row is simply evaluated
+            print(f"Error loading stored timesheet checks: {e}")
+            return {}
+
+    def _save(self, updates: Dict[str, Dict[str, Any]]) -> None:
+        try:
+            self.repository.save(updates)
+        except Exception as e:
+            print(f"Error storing timesheet checks: {e}")
+
+
+__all__ = ["TimesheetCheckRepository", "TimesheetRevalidationService"]
@@ -0,0 +1,88 @@
+# backend/services/upload_service.py
+"""
+Upload handling
+---------------
+
+Keeps large PDF uploads out of process memory. File parts above
+UPLOAD_SPOOL_THRESHOLD_KB are spooled by the request to an anonymous temp
+file, and `open_upload` hands extraction that file memory-mapped, so pdfminer
+reads the PDF from the page cache instead of from a private copy of it.
+Small uploads stay in memory, where they already are.
+
+Requests are capped at MAX_UPLOAD_MB (Flask's MAX_CONTENT_LENGTH); a view
+decorated with `upload_limit` gets its own cap instead, e.g. the batch
+endpoint, whose archives are larger than any single timesheet.
+"""
+
+import io
+import mmap
+from contextlib import contextmanager
+from tempfile import SpooledTemporaryFile
+from typing import IO, Callable, Iterator, Optional
+
+from flask import Request, current_app
+
+from config.config import UPLOAD_SPOOL_THRESHOLD_KB
+
+
+def upload_limit(megabytes: int) -> Callable:
+    """Decorator: requests to this view may carry up to `megabytes` instead of MAX_UPLOAD_MB"""
+    def decorate(view):
+        view.max_upload_bytes = megabytes * 1024 * 1024
+        return view
+    return decorate
+
+
+class SpooledUploadRequest(Request):
+    """
+    Request whose file parts spool to disk above UPLOAD_SPOOL_THRESHOLD_KB,
+    capped by the matched view's `upload_limit` or MAX_CONTENT_LENGTH
+    """
+
+    @property
+    def max_content_length(self) -> Optional[int]:
+        view = current_app.view_functions.get(self.endpoint) if current_app and self.endpoint else None
+        limit = getattr(view, "max_upload_bytes", None)
+        return limit if limit is not None else super().max_content_length
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None) -> IO[bytes]:
+        return SpooledTemporaryFile(max_size=UPLOAD_SPOOL_THRESHOLD_KB * 1024, mode='rb+')
+
+
+def _disk_fileno(stream) -> Optional[int]:
+    """File descriptor behind an upload stream, or None while it is held in memory"""
+    if isinstance(stream, SpooledTemporaryFile):
+        # fileno() would force an in-memory spool out to disk
+        return stream.fileno() if stream._rolled else None
+    try:
+        return stream.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+
+@contextmanager
+def open_upload(file_storage) -> Iterator[IO[bytes]]:
+    """
+    Yield a seekable binary stream over an uploaded file, without reading it into memory.
+    Disk-spooled uploads are memory-mapped read-only; the map is closed on exit.
+    """
+    stream = file_storage.stream
+    stream.seek(0)
+    fileno = _disk_fileno(stream)
+    if fileno is None:
+        yield stream
+        return
+
+    try:
+        mapped = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+    except (ValueError, OSError):
+        # Empty file, or a file system without mmap support
+        yield stream
+        return
+    try:
+        yield mapped
+    finally:
+        mapped.close()
+
+
+__all__ = ["SpooledUploadRequest", "open_upload", "upload_limit"]
@@ -0,0 +1,90 @@
+# backend/services/warmup_service.py
+"""
+Start-up warm-up
+----------------
+
+The app imports without pdfplumber/pdfminer, pypdfium2, NumPy or SQLAlchemy:
+each is loaded by the first request that needs it, so /health answers as soon
+as a worker is up. Warm-up takes that cost off the first real request. Once
+the worker is serving, a daemon thread imports the heavy modules, runs the
+bundled template PDF through preflight and extractMeta (filling pdfminer's
+font and CMap caches), and opens the database engine.
+
+WARMUP_ENABLED starts the thread in each gunicorn worker (post_worker_init)
+and in the development server. WARMUP_PRELOAD instead imports the modules in
+the gunicorn master before forking, so workers share those pages, at the
+price of binding only once they are loaded. Warm-up is best effort: a failure
+is printed, and the first request that needs the module simply tries again.
+
+Import-time profile: python -m benchmarks.bench_startup
+"""
+
+import importlib
+import os
+import threading
+import time
+
+from config.config import WARMUP_ENABLED
+
+# Loaded lazily by the services; the bulk of a cold start
+HEAVY_MODULES = (
+    "pdfplumber",
+    "pypdfium2",
+    "numpy",
+    "services.timesheet_repository",
+    "services.timesheet_revalidation_service",
+)
+
+TEMPLATE_PDF = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Techlauncher timesheet template 1.pdf")
+
+_started = False
+_lock = threading.Lock()
+
+
+def import_heavy_modules() -> None:
+    """Import what the extraction, batch check and persistence paths load on first use"""
+    for name in HEAVY_MODULES:
+        importlib.import_module(name)
+
+
+def _parse_template() -> None:
+    from services.pdf_extraction_service import PdfExtractionService
+    from services.preflight_service import preflight_pdf
+
+    with open(TEMPLATE_PDF, 'rb') as pdf_stream:
+        preflight_pdf(pdf_stream)
+        pdf_stream.seek(0)
+        PdfExtractionService().extractMeta(pdf_stream)
+
+
+def _open_database() -> None:
+    from models.database import get_engine
+
+    get_engine()
+
+
+def warm_up() -> float:
+    """Run every warm-up step; returns the seconds taken"""
+    start = time.perf_counter()
+    for step in (import_heavy_modules, _parse_template, _open_database):
+        try:
+            step()
+        except Exception as e:
+            print(f"Warm-up step {step.__name__} failed: {e}")
+    return time.perf_counter() - start
+
+
+def start_background_warmup() -> bool:
+    """Start warm_up() in a daemon thread, once per process; False if disabled or already started"""
+    global _started
+    if not WARMUP_ENABLED:
+        return False
+    with _lock:
+        if _started:
+            return False
+        _started = True
+    threading.Thread(target=warm_up, name="easyx-warmup", daemon=True).start()
+    return True
+
+
+__all__ = ["HEAVY_MODULES", "import_heavy_modules", "start_background_warmup", "warm_up"]
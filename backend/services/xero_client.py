@@ -0,0 +1,126 @@
+# backend/services/xero_client.py
+"""
+Xero Payroll client
+-------------------
+
+Posts timesheets to the Xero Payroll (AU) Timesheets endpoint,
+{XERO_API_URL}/payroll.xro/1.0/Timesheets, XERO_BATCH_SIZE at a time. Each
+request carries the bearer token and the Xero-tenant-id header; a 429 or 503
+is retried after its Retry-After seconds, at most XERO_MAX_RETRIES times.
+
+Uses only urllib, so no HTTP client dependency. The endpoint is configurable
+so benchmarks/xero_stub_server.py can stand in for Xero during development.
+"""
+
+import json
+import time
+import urllib.error
+import urllib.request
+from itertools import count, islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from config.config import (
+    XERO_ACCESS_TOKEN, XERO_API_URL, XERO_BATCH_SIZE, XERO_MAX_RETRIES, XERO_TENANT_ID, XERO_TIMEOUT,
+)
+
+TIMESHEETS_PATH = "/payroll.xro/1.0/Timesheets"
+_RETRY_STATUSES = (429, 503)
+# Longest Retry-After honoured; Xero's daily limit answers with hours
+_MAX_RETRY_AFTER = 60
+
+
+class XeroError(Exception):
+    """A request Xero refused or that could not be sent"""
+
+    def __init__(self, message: str, status: Optional[int] = None, body: Any = None):
+        super().__init__(message)
+        self.status = status
+        self.body = body
+
+
+class XeroClient:
+    """Sends timesheets to Xero Payroll"""
+
+    def __init__(self, api_url: str = XERO_API_URL, access_token: str = XERO_ACCESS_TOKEN,
+                 tenant_id: str = XERO_TENANT_ID, timeout: float = XERO_TIMEOUT,
+                 max_retries: int = XERO_MAX_RETRIES):
+        self.url = api_url.rstrip("/") + TIMESHEETS_PATH
+        self.access_token = access_token
+        self.tenant_id = tenant_id
+        self.timeout = timeout
+        self.max_retries = max_retries
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.access_token and self.tenant_id)
+
+    def post_timesheets(self, timesheets: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """POST one batch; returns Xero's response body ({"Timesheets": [...]})"""
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(timesheets).encode(),
+            method="POST",
+            headers={
+                "Authorization": f"Bearer {self.access_token}",
+                "Xero-tenant-id": self.tenant_id,
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+            },
+        )
+        for attempt in range(self.max_retries + 1):
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    return json.loads(response.read() or b"{}")
+            except urllib.error.HTTPError as e:
+                body = _error_body(e)
+                if e.code in _RETRY_STATUSES and attempt < self.max_retries:
+                    time.sleep(_retry_after(e.headers.get("Retry-After")))
+                    continue
+                raise XeroError(f"Xero answered {e.code}", status=e.code, body=body) from e
+            except (urllib.error.URLError, OSError) as e:
+                raise XeroError(f"Could not reach Xero: {e}") from e
+        raise XeroError("Xero rate limit retries exhausted", status=429)
+
+    def push(self, timesheets: Iterable[Dict[str, Any]],
+             batch_size: int = XERO_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        Post `timesheets` in batches, yielding a result per batch:
+          {"batch": 0, "sent": 50, "timesheet_ids": [...]}  or
+          {"batch": 1, "sent": 50, "error": "...", "status": 400, "details": {...}}
+        A refused batch does not stop the following ones.
+        """
+        timesheets = iter(timesheets)
+        for index in count():
+            batch = list(islice(timesheets, batch_size))
+            if not batch:
+                return
+            result = {"batch": index, "sent": len(batch)}
+            try:
+                body = self.post_timesheets(batch)
+                result["timesheet_ids"] = [
+                    timesheet.get("TimesheetID") for timesheet in body.get("Timesheets") or ()
+                ]
+            except XeroError as e:
+                result.update(error=str(e), status=e.status, details=e.body)
+            yield result
+
+
+def _retry_after(value: Optional[str]) -> float:
+    try:
+        return min(max(float(value), 0.0), _MAX_RETRY_AFTER)
+    except (TypeError, ValueError):
+        return 1.0
+
+
+def _error_body(error: urllib.error.HTTPError) -> Any:
+    try:
+        raw = error.read()
+    except OSError:
+        return None
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return raw.decode(errors="replace")[:1000]
+
+
+__all__ = ["TIMESHEETS_PATH", "XeroClient", "XeroError"]
@@ -0,0 +1,302 @@
+# backend/services/xero_export_service.py
+"""
+Xero timesheet export
+---------------------
+
+Turns stored extractMeta results into Xero Payroll (AU) timesheets:
+
+    {"EmployeeID": "...", "StartDate": "/Date(1754870400000+0000)/",
+     "EndDate": "/Date(1755388800000+0000)/", "Status": "DRAFT",
+     "TimesheetLines": [{"EarningsRateID": "...", "NumberOfUnits": [7.5, 8.5, ...]}]}
+
+A Xero timesheet covers whole weeks: StartDate is the Monday of the first
+worked day's ISO week, EndDate the Sunday of the last one's, and NumberOfUnits
+has one entry per day in between (0 for days without work), summed from the
+work entries' daily totals. Xero identifies employees by EmployeeID, so
+employee names are mapped through `employee_ids` (compared case- and
+whitespace-insensitively).
+
+Xero takes one timesheet per employee and period, so the stored timesheets of
+an employee's week are merged: one per PO number (the newest, when a PO was
+re-submitted) is kept, and their hours are summed into one TimesheetLine. The
+CSV keeps every kept timesheet apart, with its own PO number and hours, over
+the merged period.
+
+Everything is a generator: `iter_export_items` reads (tid, meta) pairs as the
+repository streams them, and `iter_json` / `iter_csv` write the export in
+EXPORT_CHUNK_BYTES pieces. With the records ordered by employee_key and week
+(TimesheetRepository.iter_meta_in_period), an employee's week is adjacent, so
+only that week is held while merging: a pay period of any size is exported in
+constant memory, apart from the list of skipped timesheets. Timesheets are
+skipped when Xero would refuse them: no EmployeeID for the employee (CSV keeps
+them, with an empty EmployeeID column, for import by name), no dated work
+entries, or an older timesheet of the same employee, PO and week.
+
+Pushing to the Xero API, in batches: services/xero_client.py.
+"""
+
+import calendar
+import csv
+import io
+import json
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from config.config import EXPORT_CHUNK_BYTES, JSON_FAST_ENCODER
+from services.json_provider import orjson
+from services.normalization import employee_key, parse_iso_date, time_to_decimal
+
+XERO_STATUS_DRAFT = "DRAFT"
+
+CSV_COLUMNS = (
+    "EmployeeID", "EmployeeName", "PONumber", "StartDate", "EndDate",
+    "Date", "EarningsRateID", "NumberOfUnits", "TimesheetID",
+)
+
+SKIP_NO_EMPLOYEE_ID = "no Xero EmployeeID for this employee"
+SKIP_NO_DATES = "no dated work entries"
+SKIP_DUPLICATE = "a newer timesheet of this employee, PO number and week was exported"
+
+# What extractMeta reports for a field it could not read
+_UNKNOWN = "Unknown"
+
+
+@dataclass(frozen=True, slots=True)
+class ExportPart:
+    """One stored timesheet within an ExportItem"""
+    timesheet_id: Any
+    po_number: str
+    units: Tuple[float, ...]      # hours per day of the item's period
+
+
+@dataclass(frozen=True, slots=True)
+class ExportItem:
+    """An employee's week, merged from their stored timesheets, ready to be written out"""
+    employee_name: str
+    employee_id: Optional[str]
+    start: Optional[date]         # a Monday
+    parts: Tuple[ExportPart, ...]
+    skip_reason: Optional[str] = None
+
+    @property
+    def days(self) -> int:
+        return len(self.parts[0].units) if self.parts else 0
+
+    @property
+    def end(self) -> Optional[date]:
+        return self.start + timedelta(days=self.days - 1) if self.start else None
+
+    @property
+    def units(self) -> Tuple[float, ...]:
+        """Hours per day from start to end, summed over the parts"""
+        return tuple(round(sum(day), 2) for day in zip(*(part.units for part in self.parts)))
+
+    def skipped(self) -> Dict[str, Any]:
+        return {"timesheet_ids": [part.timesheet_id for part in self.parts],
+                "employee_name": self.employee_name, "reason": self.skip_reason}
+
+
+def _text(value: Any) -> str:
+    text = " ".join(str(value).split()) if value is not None else ""
+    return "" if text == _UNKNOWN else text
+
+
+def normalize_employee_ids(employee_ids: Mapping[str, str]) -> Dict[str, str]:
+    """{employee name: Xero EmployeeID} keyed by `employee_key`"""
+    return {employee_key(name): str(employee_id) for name, employee_id in employee_ids.items() if employee_id}
+
+
+def load_employee_ids(path: str) -> Dict[str, str]:
+    """The {employee name: EmployeeID} JSON file at `path`, keyed by `employee_key`; {} without a path"""
+    if not path:
+        return {}
+    with open(path, encoding="utf-8") as f:
+        employee_ids = json.load(f)
+    if not isinstance(employee_ids, dict):
+        raise ValueError(f"{path} is not a JSON object of employee name to EmployeeID")
+    return normalize_employee_ids(employee_ids)
+
+
+def _entry_hours(entry: Dict[str, Any]) -> float:
+    hours = entry.get("total_daily_decimal")
+    if isinstance(hours, (int, float)) and not isinstance(hours, bool):
+        return float(hours)
+    return time_to_decimal(entry.get("total_daily_hours") or "")
+
+
+def _daily_hours(meta_data: Dict[str, Any]) -> Dict[date, float]:
+    """{date: hours} of the work entries"""
+    hours: Dict[date, float] = {}
+    for entry in meta_data.get("work_entries") or ():
+        day = parse_iso_date(entry.get("date_iso")) if isinstance(entry, dict) else None
+        if day is not None:
+            hours[day] = hours.get(day, 0.0) + _entry_hours(entry)
+    return hours
+
+
+def _monday(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+@dataclass(frozen=True, slots=True)
+class _Stored:
+    timesheet_id: Any
+    employee_name: str
+    po_number: str
+    hours: Dict[date, float]
+
+
+def _merged_week(key: str, week: List[_Stored], employee_ids: Mapping[str, str]) -> Iterator[ExportItem]:
+    """The ExportItem of an employee's week, after the re-submissions it replaces"""
+    newest: Dict[str, _Stored] = {}
+    for stored in week:
+        older = newest.get(stored.po_number)
+        if older is not None:
+            if older.timesheet_id > stored.timesheet_id:
+                older, stored = stored, older
+            yield ExportItem(employee_name=older.employee_name, employee_id=employee_ids.get(key), start=None,
+                             parts=(ExportPart(older.timesheet_id, older.po_number, ()),),
+                             skip_reason=SKIP_DUPLICATE)
+        newest[stored.po_number] = stored
+
+    kept = sorted(newest.values(), key=lambda stored: stored.po_number)
+    start = _monday(min(min(stored.hours) for stored in kept))
+    days = (_monday(max(max(stored.hours) for stored in kept)) - start).days + 7
+    yield ExportItem(
+        employee_name=kept[0].employee_name,
+        employee_id=employee_ids.get(key),
+        start=start,
+        parts=tuple(
+            ExportPart(stored.timesheet_id, stored.po_number, tuple(
+                round(stored.hours.get(start + timedelta(days=offset), 0.0), 2) for offset in range(days)
+            ))
+            for stored in kept
+        ),
+    )
+
+
+def iter_export_items(records: Iterable[Tuple[Any, Dict[str, Any]]],
+                      employee_ids: Mapping[str, str]) -> Iterator[ExportItem]:
+    """
+    ExportItems for (timesheet id, extractMeta result) pairs, ordered by
+    employee and week. `employee_ids` is keyed by `employee_key`. Adjacent
+    timesheets of the same employee whose first worked day falls in the same
+    ISO week are merged into one item; of those sharing a PO number, the one
+    with the highest timesheet id is kept and the others are marked as
+    duplicates.
+    """
+    current, week = None, []
+    for timesheet_id, meta_data in records:
+        meta_data = meta_data or {}
+        name = _text((meta_data.get("employee") or {}).get("name"))
+        stored = _Stored(timesheet_id, name, _text((meta_data.get("base") or {}).get("po_number")),
+                         _daily_hours(meta_data))
+        if not stored.hours:
+            yield ExportItem(employee_name=name, employee_id=employee_ids.get(employee_key(name)), start=None,
+                             parts=(ExportPart(timesheet_id, stored.po_number, ()),), skip_reason=SKIP_NO_DATES)
+            continue
+        key = (employee_key(name), _monday(min(stored.hours)))
+        if key != current and week:
+            yield from _merged_week(current[0], week, employee_ids)
+            week = []
+        current = key
+        week.append(stored)
+    if week:
+        yield from _merged_week(current[0], week, employee_ids)
+
+
+def xero_date(day: date) -> str:
+    """Xero's JSON date format, /Date(<ms since epoch>+0000)/"""
+    return f"/Date({calendar.timegm(day.timetuple()) * 1000}+0000)/"
+
+
+def to_xero_timesheet(item: ExportItem, earnings_rate_id: str, status: str = XERO_STATUS_DRAFT) -> Dict[str, Any]:
+    return {
+        "EmployeeID": item.employee_id,
+        "StartDate": xero_date(item.start),
+        "EndDate": xero_date(item.end),
+        "Status": status,
+        "TimesheetLines": [{"EarningsRateID": earnings_rate_id, "NumberOfUnits": list(item.units)}],
+    }
+
+
+def _dumps(value: Any) -> bytes:
+    if orjson is not None and JSON_FAST_ENCODER:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+def iter_xero_timesheets(items: Iterable[ExportItem], earnings_rate_id: str,
+                         skipped: List[Dict[str, Any]], status: str = XERO_STATUS_DRAFT
+                         ) -> Iterator[Tuple[ExportItem, Dict[str, Any]]]:
+    """(item, Xero timesheet) for every exportable item; the others are appended to `skipped`"""
+    for item in items:
+        reason = item.skip_reason or (None if item.employee_id else SKIP_NO_EMPLOYEE_ID)
+        if reason:
+            skipped.append(dict(item.skipped(), reason=reason))
+        else:
+            yield item, to_xero_timesheet(item, earnings_rate_id, status)
+
+
+def _chunked(pieces: Iterable[bytes], chunk_bytes: int) -> Iterator[bytes]:
+    """Join small pieces into chunks of about `chunk_bytes`"""
+    buffer, size = [], 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_bytes:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def iter_json(items: Iterable[ExportItem], earnings_rate_id: str, status: str = XERO_STATUS_DRAFT,
+              chunk_bytes: int = EXPORT_CHUNK_BYTES) -> Iterator[bytes]:
+    """
+    The export as JSON, {"Timesheets": [...], "Skipped": [...]}, in chunks.
+    "Timesheets" is the body the Xero Timesheets endpoint accepts.
+    """
+    def pieces():
+        skipped: List[Dict[str, Any]] = []
+        yield b'{"Timesheets":['
+        separator = b""
+        for _item, timesheet in iter_xero_timesheets(items, earnings_rate_id, skipped, status):
+            yield separator + _dumps(timesheet)
+            separator = b","
+        yield b'],"Skipped":' + _dumps(skipped) + b"}\n"
+    return _chunked(pieces(), chunk_bytes)
+
+
+def iter_csv(items: Iterable[ExportItem], earnings_rate_id: str,
+             chunk_bytes: int = EXPORT_CHUNK_BYTES) -> Iterator[bytes]:
+    """
+    The export as CSV (CSV_COLUMNS), one row per day of each stored timesheet,
+    in chunks. Merged timesheets keep their own rows, over the merged period;
+    timesheets without an EmployeeID are kept with that column empty.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    for item in items:
+        if item.skip_reason:
+            continue
+        start, end = item.start.isoformat(), item.end.isoformat()
+        for part in item.parts:
+            for offset, units in enumerate(part.units):
+                writer.writerow((
+                    item.employee_id or "", item.employee_name, part.po_number, start, end,
+                    (item.start + timedelta(days=offset)).isoformat(), earnings_rate_id, units, part.timesheet_id,
+                ))
+        if buffer.tell() >= chunk_bytes:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+__all__ = [
+    "CSV_COLUMNS", "ExportItem", "ExportPart", "employee_key", "iter_csv", "iter_export_items", "iter_json",
+    "iter_xero_timesheets", "load_employee_ids", "normalize_employee_ids", "to_xero_timesheet", "xero_date",
+]
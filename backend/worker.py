@@ -0,0 +1,130 @@
+"""
+Extraction worker
+Drains the SQLite job queue filled by POST /api/jobs.
+
+    python worker.py
+"""
+
+import os
+import signal
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict
+
+from config.config import JOB_HEARTBEAT_SECONDS, JOB_POLL_INTERVAL, PERSIST_EXTRACTIONS
+from services.extraction_cache import ExtractionCache
+from services.job_queue_service import JobQueue
+from services.parsed_document import ParsedDocument
+from services.pdf_extraction_service import PdfExtractionService, is_error
+from services.timesheet_repository import TimesheetRepository
+
+
+class ExtractionWorker:
+    """Claims queued jobs one at a time and runs PdfExtractionService on them"""
+
+    def __init__(self, queue: JobQueue, service: PdfExtractionService,
+                 repository: TimesheetRepository = None):
+        self.queue = queue
+        self.service = service
+        self.repository = repository
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}"
+        self._stopping = False
+
+    def stop(self, *_args):
+        """Finish the current job, then exit"""
+        self._stopping = True
+
+    def run(self):
+        print(f"Extraction worker {self.worker_id} started")
+        while not self._stopping:
+            job = self.queue.claim(self.worker_id)
+            if job is None:
+                time.sleep(JOB_POLL_INTERVAL)
+                continue
+            self.process(job)
+        print(f"Extraction worker {self.worker_id} stopped")
+
+    @contextmanager
+    def _heartbeat(self, job: Dict[str, Any]):
+        """Renew the job's lease every JOB_HEARTBEAT_SECONDS (at most a third of the lease) until the block exits"""
+        done = threading.Event()
+        interval = min(JOB_HEARTBEAT_SECONDS, self.queue.lease_seconds / 3)
+
+        def beat():
+            while not done.wait(interval):
+                try:
+                    if not self.queue.renew(job["id"], self.worker_id):
+                        print(f"Lost the lease on job {job['id']}; its result will be discarded")
+                        return
+                except Exception as e:
+                    print(f"Error renewing the lease on job {job['id']}: {e}")
+
+        thread = threading.Thread(target=beat, name=f"heartbeat-{job['id']}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            done.set()
+            thread.join()
+
+    def process(self, job: Dict[str, Any]):
+        try:
+            with self._heartbeat(job):
+                result = self._extract(job)
+        except Exception as e:
+            # Unexpected failure (e.g. unreadable upload): retry while attempts remain
+            print(f"Error processing job {job['id']}: {e}")
+            owned = self.queue.fail(job["id"], self.worker_id, f"Error processing PDF: {str(e)}", retry=True)
+            if owned and job["attempts"] >= self.queue.max_attempts:
+                self._remove_upload(job["file_path"])
+            return
+
+        if "error" in result:
+            # Extraction errors are deterministic, retrying would give the same answer
+            owned = self.queue.fail(job["id"], self.worker_id, result["error"])
+        else:
+            owned = self.queue.complete(job["id"], self.worker_id, result)
+        if owned:
+            self._remove_upload(job["file_path"])
+        else:
+            # The lease expired and the job went to another worker, which still needs the upload
+            print(f"Lost the lease on job {job['id']}; result discarded")
+
+    def _extract(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        with ParsedDocument(job["file_path"]) as doc:
+            if job["kind"] == "meta":
+                meta_data = self.service.extractMeta(doc)
+                if is_error(meta_data):
+                    return meta_data
+                meta_data = meta_data.to_dict()
+                return {"meta_data": meta_data, "timesheet_id": self._persist(doc.content_hash, meta_data)}
+
+            extracted_data = self.service.extract_timesheet_data(doc)
+            if "error" in extracted_data:
+                return extracted_data
+            return {"data": extracted_data, "pdf_text": self.service.get_pdf_text(doc)}
+
+    def _persist(self, content_hash: str, meta_data: Dict[str, Any]):
+        if self.repository is None:
+            return None
+        try:
+            return self.repository.save_meta(content_hash, meta_data)["tid"]
+        except Exception as e:
+            print(f"Error persisting timesheet: {e}")
+            return None
+
+    def _remove_upload(self, file_path: str):
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
+
+
+if __name__ == '__main__':
+    repository = TimesheetRepository() if PERSIST_EXTRACTIONS else None
+    worker = ExtractionWorker(JobQueue(), PdfExtractionService(cache=ExtractionCache()), repository)
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.run()
@@ -0,0 +1,21 @@
+"""
+WSGI entry point for production servers.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+gunicorn.conf.py preloads this module in the master process and forks the
+workers from it. The app itself imports without the pdfplumber/pdfminer,
+NumPy and SQLAlchemy stack, so workers bind and answer /health quickly; each
+worker then warms that stack up in the background (WARMUP_ENABLED). With
+WARMUP_PRELOAD the stack is imported here instead, once, and shared by the
+forked workers, at the cost of a slower start.
+"""
+
+from config.config import WARMUP_PRELOAD
+from app import create_app
+
+if WARMUP_PRELOAD:
+    from services.warmup_service import import_heavy_modules
+    import_heavy_modules()
+
+app = create_app()
@@ -6,7 +6,33 @@ CREATE TABLE IF NOT EXISTS timesheet (
   status     TEXT
 );
 
--- ---------- 2) insert 10 default data if table is empty ----------
+-- ---------- 2) indexed lookup columns (copied out of meta_data on insert) ----------
+-- po_number and employee_name are read from uploaded PDFs: TEXT, so no value is too long
+-- week_start is the earliest worked date on the timesheet, not necessarily a Monday
+ALTER TABLE timesheet ADD COLUMN IF NOT EXISTS po_number     TEXT;
+ALTER TABLE timesheet ADD COLUMN IF NOT EXISTS employee_name TEXT;
+ALTER TABLE timesheet ALTER COLUMN po_number     TYPE TEXT;
+ALTER TABLE timesheet ALTER COLUMN employee_name TYPE TEXT;
+ALTER TABLE timesheet ADD COLUMN IF NOT EXISTS week_start    DATE;
+ALTER TABLE timesheet ADD COLUMN IF NOT EXISTS content_hash  VARCHAR(64);
+ALTER TABLE timesheet ADD COLUMN IF NOT EXISTS employee_key  TEXT;
+ALTER TABLE timesheet ADD COLUMN IF NOT EXISTS week_monday   DATE;
+
+-- Backfill the Xero export's grouping columns for rows stored before they existed
+-- (lower() stands in for Python's casefold(); rows saved again get the exact key)
+UPDATE timesheet
+   SET employee_key = CASE WHEN btrim(regexp_replace(employee_name, '\s+', ' ', 'g')) = 'Unknown' THEN ''
+                           ELSE lower(btrim(regexp_replace(coalesce(employee_name, ''), '\s+', ' ', 'g'))) END,
+       week_monday  = date_trunc('week', week_start)::date
+ WHERE employee_key IS NULL;
+
+CREATE INDEX IF NOT EXISTS ix_timesheet_po_number ON timesheet (po_number);
+CREATE INDEX IF NOT EXISTS ix_timesheet_week_start ON timesheet (week_start);
+CREATE INDEX IF NOT EXISTS idx_timesheet_employee_week ON timesheet (employee_name, week_start);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_timesheet_content_hash ON timesheet (content_hash);
+CREATE INDEX IF NOT EXISTS idx_timesheet_employee_key_week ON timesheet (employee_key, week_monday);
+
+-- ---------- 3) insert 10 default data if table is empty ----------
 --INSERT INTO timesheet (meta_data, created_at, status)
 --SELECT
 --  jsonb_build_object('note', format('seed row %s', gs))            AS meta_data,
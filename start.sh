@@ -109,7 +109,7 @@ echo "📦 Installing backend dependencies..."
 pip install -r requirements.txt
 # Start backend service
 echo "🔧 Starting Flask backend on port 5001..."
-python3 app.py &
+FLASK_DEBUG=1 python3 app.py &
 BACKEND_PID=$!
 # Wait for backend to start
 sleep 3